@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import F
+from . import search
 from .models import Contacts, Subtask, Task
 
 # 1. Inline-Klasse für Subtasks
@@ -13,10 +15,24 @@ class TaskAdmin(admin.ModelAdmin):
     list_display = ('title', 'category', 'status', 'prio', 'due_date')
     list_filter = ('status', 'prio', 'category')
     search_fields = ('title', 'description')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Über den Suchindex statt icontains auf title und description
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return search.get_backend().filter(queryset, 'tasks', search_term), False
     
     # Nur die SubtaskInline wird hier hinzugefügt
     inlines = [SubtaskInline] 
 
+    def save_model(self, request, obj, form, change):
+        # Der Admin überschreibt ohne Prüfung, zählt aber die Version hoch, damit
+        # API-Clients mit If-Match die Änderung bemerken (siehe backend/concurrency.py)
+        if change:
+            Task.objects.filter(pk=obj.pk).update(version=F('version') + 1)
+            obj.version = Task.objects.values_list('version', flat=True).get(pk=obj.pk)
+        super().save_model(request, obj, form, change)
+
 # Registriere jetzt deinen angepassten TaskAdmin für das Task-Model
 admin.site.register(Task, TaskAdmin)
 
@@ -0,0 +1,59 @@
+# backend/api/async_views.py
+
+from types import SimpleNamespace
+
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import ValidationError
+
+from . import fast
+from .filters import TaskFilterBackend
+from .renderers import dumps
+from .serializers import ContactsSerializer, TaskSerializer
+from backend.models import Contacts, Task
+
+# Async-Varianten der meistgenutzten Leseendpunkte. Sie laufen unter ASGI direkt in der
+# Event-Loop: Die Daten werden über die async ORM-API (async for, aget) geladen, die
+# Serialisierung greift danach nicht mehr auf die Datenbank zu. Die Task-Liste nutzt
+# den schnellen Lesepfad (fast.aserialize_tasks). Ausgegeben wird mit demselben
+# JSON-Encoder wie bei den DRF-Views, die Antworten sind byte-gleich.
+#
+# Anders als die DRF-Views laufen sie bewusst ohne ConditionalGetMixin und
+# CachedResponseMixin: kein ETag/304, kein Response-Cache, außerdem ohne Pagination
+# und Content Negotiation. Jeder Request liest und serialisiert die Daten vollständig; im
+# Benchmark (backend/benchmarks/asgi.py) ist der Response-Cache deshalb für beide
+# Seiten abgeschaltet.
+
+
+def json_response(data, status=200):
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def task_queryset():
+    return Task.objects.with_relations().board_order()
+
+
+@require_GET
+async def task_list(request):
+    try:
+        queryset = TaskFilterBackend().filter_queryset(
+            SimpleNamespace(query_params=request.GET), task_queryset(), None
+        )
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+    return json_response(await fast.aserialize_tasks(queryset))
+
+
+@require_GET
+async def task_detail(request, pk):
+    try:
+        task = await task_queryset().aget(pk=pk)
+    except Task.DoesNotExist:
+        raise Http404('Task nicht gefunden.')
+    return json_response(TaskSerializer(task).data)
+
+
+@require_GET
+async def contacts_list(request):
+    contacts = [contact async for contact in Contacts.objects.select_related('user')]
+    return json_response(ContactsSerializer(contacts, many=True).data)
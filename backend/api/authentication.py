@@ -0,0 +1,30 @@
+# backend/api/authentication.py
+
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from backend import tokens
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    `Authorization: Bearer <access-token>` aus backend/tokens.py. Prüft nur Signatur,
+    Alter und Widerrufsliste im Speicher, ohne Session- oder User-Query. request.auth
+    ist der Payload des Tokens.
+    """
+    keyword = b'bearer'
+
+    def authenticate(self, request):
+        header = get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword:
+            return None
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed('Ungültiger Authorization-Header.')
+        try:
+            payload = tokens.verify(header[1].decode('ascii'))
+        except (UnicodeDecodeError, tokens.InvalidToken) as exc:
+            raise exceptions.AuthenticationFailed(str(exc) or 'Ungültiges Token.')
+        return tokens.TokenUser(payload), payload
+
+    def authenticate_header(self, request):
+        return 'Bearer'
@@ -0,0 +1,113 @@
+# backend/api/fast.py
+
+from collections import defaultdict
+
+from backend.models import Subtask, Task
+
+# Schneller Lesepfad für Tasks: baut exakt dieselbe JSON-Struktur wie
+# TaskSerializer.to_representation, aber direkt aus values_list-Zeilen statt über die
+# Feld-Objekte von DRF. Subtasks und Assignees werden pro Block mit je einer Query
+# geladen und in Python über die Task-id zugeordnet.
+#
+# Ändern sich die Felder von Task oder TaskSerializer, muss diese Datei mitgezogen
+# werden; der Golden-Test in backend/tests.py vergleicht beide Pfade byteweise.
+#
+# aserialize_tasks ist dieselbe Zusammenstellung über die async ORM-API (aiterator) für
+# die Views in backend.api.async_views.
+
+TASK_FIELDS = ('id', 'category', 'description', 'prio', 'status', 'position', 'version', 'title', 'task_id', 'due_date')
+CHUNK_SIZE = 2000
+
+
+def serialize_tasks(queryset, chunk_size=CHUNK_SIZE):
+    return list(iter_tasks(queryset, chunk_size))
+
+
+def serialize_task_ids(task_ids):
+    """Wie serialize_tasks, aber für eine bereits ausgewählte, sortierte Liste von ids."""
+    tasks = {task['id']: task for task in iter_tasks(Task.objects.filter(id__in=task_ids))}
+    return [tasks[task_id] for task_id in task_ids if task_id in tasks]
+
+
+def iter_tasks(queryset, chunk_size=CHUNK_SIZE):
+    """Liefert die Tasks des Querysets in dessen Reihenfolge als fertige Dictionaries."""
+    rows = queryset.prefetch_related(None).values_list(*TASK_FIELDS)
+    chunk = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield from build_tasks(chunk)
+            chunk = []
+    if chunk:
+        yield from build_tasks(chunk)
+
+
+async def aserialize_tasks(queryset, chunk_size=CHUNK_SIZE):
+    # values() statt values_list(): ValuesListIterable.__iter__ ist in Django 5.2 kein
+    # Generator und führt die Query schon beim Anlegen im Event-Loop aus
+    # (SynchronousOnlyOperation). Der Iterator von values() startet erst in aiterators Thread.
+    rows = queryset.prefetch_related(None).values(*TASK_FIELDS)
+    tasks = []
+    chunk = []
+    async for row in rows.aiterator(chunk_size=chunk_size):
+        chunk.append(tuple(row.values()))
+        if len(chunk) == chunk_size:
+            tasks.extend(await abuild_tasks(chunk))
+            chunk = []
+    if chunk:
+        tasks.extend(await abuild_tasks(chunk))
+    return tasks
+
+
+def subtask_rows(task_ids):
+    return (
+        Subtask.objects.filter(task_id__in=task_ids)
+        .order_by('task_id', 'id')
+        .values_list('id', 'subtasktext', 'done', 'task_id')
+    )
+
+
+def assignee_rows(task_ids):
+    return (
+        Task.assignee_infos.through.objects.filter(task_id__in=task_ids)
+        .order_by('task_id', 'contacts_id')
+        .values_list('task_id', 'contacts_id', 'contacts__name', 'contacts__color')
+    )
+
+
+def build_tasks(rows):
+    task_ids = [row[0] for row in rows]
+    yield from assemble(rows, subtask_rows(task_ids), assignee_rows(task_ids))
+
+
+async def abuild_tasks(rows):
+    task_ids = [row[0] for row in rows]
+    subtasks = [row async for row in subtask_rows(task_ids)]
+    assignees = [row async for row in assignee_rows(task_ids)]
+    return list(assemble(rows, subtasks, assignees))
+
+
+def assemble(rows, subtask_rows, assignee_rows):
+    subtasks = defaultdict(list)
+    for subtask_id, text, done, task_id in subtask_rows:
+        subtasks[task_id].append({'id': subtask_id, 'subtasktext': text, 'done': done, 'task_id': task_id})
+
+    assignees = defaultdict(list)
+    for task_id, contact_id, name, color in assignee_rows:
+        assignees[task_id].append({'id': contact_id, 'name': name, 'color': color})
+
+    for task_id, category, description, prio, status, position, version, title, number, due_date in rows:
+        yield {
+            'id': task_id,
+            'subtasks': subtasks.get(task_id, []),
+            'category': category,
+            'description': description,
+            'prio': prio,
+            'status': status,
+            'position': position,
+            'version': version,
+            'title': title,
+            'task-id': number,
+            'due-date': due_date.isoformat(),
+            'assignee-infos': assignees.get(task_id, []),
+        }
@@ -0,0 +1,66 @@
+# backend/api/filters.py
+
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from backend.models import Task
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Serverseitige Filter für die Task-Liste.
+
+    `status`, `prio` und `category` akzeptieren mehrere Werte kommagetrennt
+    (`?status=toDos,inProgress`), `due_date_from`/`due_date_to` grenzen das
+    Fälligkeitsdatum inklusive ein.
+    """
+    choice_filters = {
+        'status': dict(Task.STATUS_CHOICES),
+        'prio': dict(Task.PRIO_CHOICES),
+    }
+    date_filters = {
+        'due_date_from': 'due_date__gte',
+        'due_date_to': 'due_date__lte',
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        for param, choices in self.choice_filters.items():
+            values = self.split(params.get(param))
+            if not values:
+                continue
+            invalid = [value for value in values if value not in choices]
+            if invalid:
+                errors[param] = f"Ungültiger Wert: {', '.join(invalid)}."
+            else:
+                queryset = queryset.filter(**{f'{param}__in': values})
+
+        categories = self.split(params.get('category'))
+        if categories:
+            queryset = queryset.filter(category__in=categories)
+
+        for param, lookup in self.date_filters.items():
+            value = params.get(param)
+            if not value:
+                continue
+            try:
+                date = parse_date(value)
+            except ValueError:
+                date = None
+            if date is None:
+                errors[param] = 'Ungültiges Datum, erwartet wird JJJJ-MM-TT.'
+            else:
+                queryset = queryset.filter(**{lookup: date})
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+    @staticmethod
+    def split(value):
+        if not value:
+            return []
+        return [item.strip() for item in value.split(',') if item.strip()]
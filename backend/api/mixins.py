@@ -0,0 +1,156 @@
+# backend/api/mixins.py
+
+import hashlib
+
+from itertools import islice
+
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from backend import cache as api_cache
+from backend.models import ChangeMarker
+from backend.routers import reads_from_primary
+
+from . import fast
+from .renderers import stream_json_array
+
+
+class ConditionalGetMixin:
+    """
+    Beantwortet list und retrieve mit ETag und Last-Modified aus den Änderungsmarkern
+    der Tabellen in `change_tables`. Passt If-None-Match bzw. If-Modified-Since, wird
+    mit 304 geantwortet, ohne dass eine Zeile gelesen oder serialisiert wird.
+    """
+    change_tables = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_validators(self, request):
+        markers = list(
+            ChangeMarker.objects.filter(table__in=self.change_tables)
+            .order_by('table')
+            .values_list('table', 'revision', 'modified_at')
+        )
+        fingerprint = '|'.join([
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            *(f'{table}:{revision}' for table, revision, _ in markers),
+        ])
+        etag = quote_etag(hashlib.md5(fingerprint.encode('utf-8')).hexdigest())
+        last_modified = max((modified_at for _, _, modified_at in markers), default=None)
+        return etag, last_modified and int(last_modified.timestamp())
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class CachedResponseMixin:
+    """
+    Cacht die Antworten von list und retrieve unter der aktuellen Datenversion.
+
+    Schreibzugriffe erhöhen die Version (siehe backend.signals), dadurch werden alle
+    älteren Einträge nicht mehr gefunden und laufen einfach aus.
+
+    Requests, die von einem Replikat lesen (backend/routers.py), umgehen den Cache: Das
+    Replikat kann hinter der Version zurückliegen, sein Stand landete sonst unter der
+    neuen Version und würde auch Clients ausgeliefert, die ihre eigene Änderung sehen müssen.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not reads_from_primary():
+            response = handler(request, *args, **kwargs)
+            response['X-Cache'] = 'BYPASS'
+            return response
+
+        key = api_cache.response_cache_key(request, api_cache.get_version())
+        data = cache.get(key)
+        if data is not None:
+            api_cache.record_hit()
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        api_cache.record_miss()
+        response = handler(request, *args, **kwargs)
+        # Gestreamte Antworten werden nicht gecacht
+        if response.status_code == 200 and isinstance(response, Response):
+            cache.set(key, response.data, api_cache.get_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class FastTaskListMixin:
+    """
+    Liefert die Task-Liste über den schnellen Lesepfad in backend.api.fast statt über
+    TaskSerializer. Filter und Pagination bleiben unverändert, die Pagination wählt
+    nur die Task-ids aus.
+
+    Muss in der MRO vor StreamingListMixin stehen: Gestreamte Listen reicht list an
+    StreamingListMixin weiter, das dann die Blöcke aus iter_stream_batches hier holt.
+    """
+
+    def iter_stream_batches(self, queryset):
+        tasks = fast.iter_tasks(queryset, self.stream_chunk_size)
+        while batch := list(islice(tasks, self.stream_chunk_size)):
+            yield batch
+
+    def list(self, request, *args, **kwargs):
+        if self.stream_requested(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize_task_ids([task.id for task in page]))
+
+        return Response(fast.serialize_tasks(queryset))
+
+
+class StreamingListMixin:
+    """
+    `?stream=1` liefert die Liste als StreamingHttpResponse: Die Zeilen werden über einen
+    serverseitigen Cursor (iterator mit chunk_size) gelesen und blockweise serialisiert und
+    geschrieben, der Speicherbedarf bleibt unabhängig von der Größe der Liste.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def stream_requested(self, request):
+        return request.query_params.get(self.stream_query_param) in ('1', 'true')
+
+    def list(self, request, *args, **kwargs):
+        if not self.stream_requested(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            stream_json_array(self.iter_stream_batches(queryset)),
+            content_type='application/json',
+        )
+
+    def iter_stream_batches(self, queryset):
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while batch := list(islice(rows, self.stream_chunk_size)):
+            yield self.get_serializer(batch, many=True).data
@@ -0,0 +1,158 @@
+# backend/api/pagination.py
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor-Pagination über einen eindeutigen, zusammengesetzten Sortierschlüssel.
+
+    Der Cursor enthält die Werte des letzten Eintrags der Seite, die nächste Seite
+    wird per `(a > x) OR (a = x AND b > y)` gefiltert. Dadurch bleibt jede Seite
+    ein Index-Scan, egal wie weit geblättert wurde.
+    """
+    ordering = ('id',)
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Ungültiger Cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        results = list(queryset.order_by(*self.ordering)[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_position_filter(self, position):
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            exact = dict(zip(self.ordering[:index], position[:index]))
+            condition |= Q(**exact, **{f'{field}__gt': position[index]})
+        return condition
+
+    def get_position(self, instance):
+        return [str(getattr(instance, field)) for field in self.ordering]
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return [self.parse_value(model, field, value) for field, value in zip(self.ordering, position)]
+
+    def parse_value(self, model, field, value):
+        # Der Cursor kommt vom Client: jeder Wert muss zum Feld passen (auch im Wertebereich),
+        # sonst scheitert erst die Query mit einem Fehler 500
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            raise NotFound(self.invalid_cursor_message)
+        model_field = model._meta.get_field(field)
+        try:
+            value = model_field.to_python(value)
+            model_field.run_validators(value)
+        except DjangoValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        return value
+
+    def encode_cursor(self, position):
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class BoundedLimitOffsetPagination(LimitOffsetPagination):
+    max_limit = 500
+
+
+class OptInPagination(BasePagination):
+    """
+    Paginiert nur auf Anfrage, damit bestehende Clients weiterhin die volle Liste bekommen.
+
+    `?limit=&offset=` schaltet Limit/Offset-Pagination ein, `?cursor=` bzw.
+    `?page_size=` die Keyset-Pagination.
+    """
+    keyset_class = KeysetPagination
+    limit_offset_class = BoundedLimitOffsetPagination
+
+    def __init__(self):
+        self.paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.limit_offset_class.limit_query_param in params:
+            self.paginator = self.limit_offset_class()
+        elif self.keyset_class.cursor_query_param in params or self.keyset_class.page_size_query_param in params:
+            self.paginator = self.keyset_class()
+        else:
+            return None
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+
+class TaskKeysetPagination(KeysetPagination):
+    ordering = ('due_date', 'id')
+
+
+class TaskPagination(OptInPagination):
+    keyset_class = TaskKeysetPagination
+
+
+class ContactsKeysetPagination(KeysetPagination):
+    ordering = ('name', 'id')
+
+
+class ContactsPagination(OptInPagination):
+    keyset_class = ContactsKeysetPagination
@@ -0,0 +1,79 @@
+# backend/api/renderers.py
+
+import json
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional, siehe JOIN_JSON_ENCODER in den Settings
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def stdlib_dumps(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def orjson_dumps(data):
+    # Alles, was orjson nicht selbst kennt (Decimal, lazy Strings, ...), übernimmt der DRF-Encoder.
+    # OPT_NON_STR_KEYS: Fehler von ListField & Co. sind nach int-Indizes geschlüsselt
+    return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def escape_line_separators(content):
+    # Wie DRF: \u2028 und \u2029 escapen, damit das Ergebnis gültiges JavaScript bleibt
+    return content.replace('\u2028'.encode('utf-8'), b'\\u2028').replace('\u2029'.encode('utf-8'), b'\\u2029')
+
+
+_dumps = None
+
+
+def get_dumps():
+    """
+    Liefert die konfigurierte JSON-Funktion (Objekt -> UTF-8-Bytes). JOIN_JSON_ENCODER
+    kann einen eigenen Pfad eintragen, ohne Angabe wird orjson genommen, falls installiert.
+    """
+    global _dumps
+    if _dumps is None:
+        path = getattr(settings, 'JOIN_JSON_ENCODER', None)
+        if path:
+            _dumps = import_string(path)
+        else:
+            _dumps = orjson_dumps if orjson is not None else stdlib_dumps
+    return _dumps
+
+
+def dumps(data):
+    return escape_line_separators(get_dumps()(data))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer mit austauschbarem Encoder. Die Ausgabe ist kompakt und byte-gleich mit
+    der des DRF-JSONRenderer; eingerückte Ausgabe (z. B. für die Browsable API) übernimmt DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+def stream_json_array(batches):
+    """Schreibt Blöcke von Objekten als ein einziges JSON-Array, Block für Block."""
+    yield b'['
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        content = dumps(batch)[1:-1]
+        yield content if first else b',' + content
+        first = False
+    yield b']'
@@ -1,9 +1,16 @@
 # backend/serializers.py (oder backend/serializers/tasks_serializers.py, je nach deiner Struktur)
 
 from rest_framework import serializers
+from backend.changes import record_change
+from backend.concurrency import claim_version
 from backend.models import Contacts, Subtask, Task
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.db import transaction
+from django.db.models.functions import Lower
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Contacts Serializer
 class ContactsSerializer(serializers.ModelSerializer):
@@ -23,8 +30,14 @@ class SubTaskSerializer(serializers.ModelSerializer):
         fields = ['id', 'subtasktext', 'done', 'task_id']
 
 
+# Innerhalb eines Tasks darf die id mitgeschickt werden, damit bestehende Subtasks
+# beim Update wiedererkannt und nicht gelöscht und neu angelegt werden.
+class NestedSubTaskSerializer(SubTaskSerializer):
+    id = serializers.IntegerField(required=False)
+
+
 class TaskSerializer(serializers.ModelSerializer):
-    subtasks = SubTaskSerializer(many=True, required=False)
+    subtasks = NestedSubTaskSerializer(many=True, required=False)
 
     assignee_infos = serializers.PrimaryKeyRelatedField(
         queryset=Contacts.objects.all(),
@@ -45,8 +58,11 @@ class TaskSerializer(serializers.ModelSerializer):
 
         task = super().create(validated_data)
 
-        for subtask_data in subtasks_data:
-            Subtask.objects.create(task=task, **subtask_data)
+        if subtasks_data:
+            subtasks = Subtask.objects.bulk_create([
+                Subtask(task=task, **self._without_id(subtask_data)) for subtask_data in subtasks_data
+            ])
+            record_change('subtask', [subtask.id for subtask in subtasks])
 
         task.assignee_infos.set(assignee_ids)
 
@@ -59,36 +75,54 @@ class TaskSerializer(serializers.ModelSerializer):
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
 
-        if subtasks_data is not None:
-            existing_subtasks = {subtask.id: subtask for subtask in instance.subtasks.all()}
-            subtasks_to_keep_ids = []
+        # Erst die Version per bedingtem UPDATE beanspruchen (sonst VersionConflict), dann
+        # Task, Subtasks und Assignees in derselben Transaktion schreiben
+        with transaction.atomic():
+            claim_version(instance)
+            instance.save()
 
-            for subtask_data in subtasks_data:
-                subtask_id = subtask_data.get('id')
+            if subtasks_data is not None:
+                self.reconcile_subtasks(instance, subtasks_data)
 
-                if subtask_id:
-                    subtask = existing_subtasks.get(subtask_id)
-                    if subtask:
+            if assignee_ids is not None: 
+                instance.assignee_infos.set(assignee_ids)
 
-                        for attr, value in subtask_data.items():
-                            setattr(subtask, attr, value)
-                        subtask.save()
-                        subtasks_to_keep_ids.append(subtask_id)
-                    else:
-                        Subtask.objects.create(task=instance, **subtask_data)
-                else:
-                    Subtask.objects.create(task=instance, **subtask_data)
-
-            for subtask_id, subtask_instance in existing_subtasks.items():
-                if subtask_id not in subtasks_to_keep_ids:
-                    subtask_instance.delete()
+        return instance
 
-        if assignee_ids is not None: 
-            instance.assignee_infos.set(assignee_ids)
+    def reconcile_subtasks(self, instance, subtasks_data):
+        """
+        Gleicht die Subtasks eines Tasks mengenbasiert ab: ein bulk_update für bestehende,
+        ein bulk_create für neue und ein gefiltertes DELETE für entfernte Subtasks,
+        unabhängig davon wie viele Subtasks der Task hat.
+        """
+        existing_subtasks = {subtask.id: subtask for subtask in instance.subtasks.all()}
+        subtasks_to_update = []
+        subtasks_to_create = []
 
-        return instance
+        for subtask_data in subtasks_data:
+            subtask = existing_subtasks.get(subtask_data.get('id'))
+            if subtask:
+                for attr, value in subtask_data.items():
+                    setattr(subtask, attr, value)
+                subtasks_to_update.append(subtask)
+            else:
+                subtasks_to_create.append(Subtask(task=instance, **self._without_id(subtask_data)))
+
+        keep_ids = [subtask.id for subtask in subtasks_to_update]
+        if len(keep_ids) < len(existing_subtasks):
+            instance.subtasks.exclude(id__in=keep_ids).delete()
+        if subtasks_to_update:
+            Subtask.objects.bulk_update(subtasks_to_update, ['subtasktext', 'done'])
+        if subtasks_to_create:
+            Subtask.objects.bulk_create(subtasks_to_create)
+        # bulk_update und bulk_create lösen keine Signale aus
+        if subtasks_to_update or subtasks_to_create:
+            record_change('subtask', [subtask.id for subtask in subtasks_to_update + subtasks_to_create])
+
+    @staticmethod
+    def _without_id(subtask_data):
+        return {attr: value for attr, value in subtask_data.items() if attr != 'id'}
 
     def to_representation(self, instance):
 
@@ -114,6 +148,62 @@ class TaskSerializer(serializers.ModelSerializer):
         return ret
 
 
+# Bulk Serializer: mehrere Task-Änderungen in einem Request
+class TaskBulkSerializer(serializers.Serializer):
+    create = serializers.ListField(child=serializers.DictField(), required=False, default=list, max_length=500)
+    update = serializers.ListField(child=serializers.DictField(), required=False, default=list, max_length=500)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False, default=list, max_length=500)
+
+    def validate_update(self, value):
+        ids = [item.get('id') for item in value]
+        if not all(isinstance(task_id, int) for task_id in ids):
+            raise serializers.ValidationError('Jeder Eintrag braucht eine numerische id.')
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError('Jede id darf nur einmal vorkommen.')
+        return value
+
+
+# Move Serializer: Drag & Drop zwischen den Status-Spalten
+class TaskMoveSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=500)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES)
+    # Nachbarn in der Zielspalte (Task-ids); ohne beide geht es ans Ende der Spalte
+    after = serializers.IntegerField(required=False, allow_null=True)
+    before = serializers.IntegerField(required=False, allow_null=True)
+
+
+# Import Serializer: eine Zeile einer NDJSON- oder CSV-Datei (siehe backend/transfer.py).
+# Kontakte werden über ihre E-Mail-Adresse referenziert, die Eindeutigkeit prüft der
+# Import blockweise statt mit einer Query pro Zeile.
+class ContactImportSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    email = serializers.EmailField(max_length=255)
+    color = serializers.CharField(max_length=255, default='blue')
+    phone = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+
+    def validate_email(self, value):
+        return value.lower()
+
+
+class SubtaskImportSerializer(serializers.Serializer):
+    subtasktext = serializers.CharField(max_length=255)
+    done = serializers.BooleanField(default=False)
+
+
+class TaskImportSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, default='')
+    category = serializers.CharField(max_length=100)
+    due_date = serializers.DateField()
+    prio = serializers.ChoiceField(choices=Task.PRIO_CHOICES, default='medium')
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, default='toDos')
+    subtasks = SubtaskImportSerializer(many=True, default=list)
+    assignees = serializers.ListField(child=serializers.EmailField(), default=list)
+
+    def validate_assignees(self, value):
+        return [email.lower() for email in value]
+
+
 # Login Serializer
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField(required=True)
@@ -137,6 +227,10 @@ class LoginSerializer(serializers.Serializer):
         return data
     
 
+class TokenSerializer(serializers.Serializer):
+    token = serializers.CharField(required=True)
+
+
 # Register Serializer
 class RegisterSerializer(serializers.Serializer):
     email = serializers.EmailField(required=True)
@@ -157,12 +251,13 @@ class RegisterSerializer(serializers.Serializer):
         user_instance = None
         contact_instance = None
 
-        potential_contacts = Contacts.objects.filter(email__iexact=email).first()
+        # LOWER(email) = ... nutzt den Index contacts_email_lower_idx, email__iexact (LIKE) nicht
+        potential_contacts = Contacts.objects.alias(email_lower=Lower('email')).filter(email_lower=email).first()
 
         if potential_contacts:
             if potential_contacts.user is None or not potential_contacts.user.has_usable_password():
                 contact_instance = potential_contacts
-                print(f"DEBUG: Bestehender UNREGISTRIERTER Kontakt mit E-Mail '{email}' gefunden.")
+                logger.debug("Bestehender unregistrierter Kontakt mit E-Mail '%s' gefunden.", email)
             else:
                 raise serializers.ValidationError("Ein Benutzer mit dieser E-Mail-Adresse ist bereits registriert.")
         
@@ -171,21 +266,21 @@ class RegisterSerializer(serializers.Serializer):
                 user_instance = User.objects.create_user(username=email, email=email, password=password)
                 contact_instance.user = user_instance
                 contact_instance.save()
-                print(f"DEBUG: Neuer Benutzer für bestehenden Kontakt '{email}' erstellt und verknüpft.")
+                logger.debug("Neuer Benutzer für bestehenden Kontakt '%s' erstellt und verknüpft.", email)
             else:
                 user_instance = contact_instance.user
                 user_instance.set_password(password)
                 user_instance.save()
-                print(f"DEBUG: Passwort für bestehenden Benutzer '{email}' gesetzt.")
+                logger.debug("Passwort für bestehenden Benutzer '%s' gesetzt.", email)
         else:
-            print(f"DEBUG: Kein unregistrierter Kontakt mit E-Mail '{email}' gefunden. Erstelle neuen Benutzer und Kontakt.")
+            logger.debug("Kein unregistrierter Kontakt mit E-Mail '%s' gefunden. Erstelle neuen Benutzer und Kontakt.", email)
             user_instance = User.objects.create_user(username=email, email=email, password=password)
             contact_instance = Contacts.objects.create(
                 name=name,
                 email=email,
                 user=user_instance
             )
-            print(f"DEBUG: Neuer Benutzer und Kontakt für '{email}' erstellt und verknüpft.")
+            logger.debug("Neuer Benutzer und Kontakt für '%s' erstellt und verknüpft.", email)
 
         self._user_instance_for_view = user_instance
         return contact_instance
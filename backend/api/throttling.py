@@ -0,0 +1,51 @@
+# backend/api/throttling.py
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+
+class FailedLoginThrottle(BaseThrottle):
+    """
+    Lehnt Logins nach zu vielen Fehlversuchen mit 429 ab, bevor ein Passwort gehasht
+    wird. Gezählt werden nur Fehlversuche, die der View über `record_failure` meldet,
+    je IP-Adresse und je IP-Adresse mit E-Mail, in festen Zeitfenstern im Django-Cache.
+    Ein erfolgreicher Login setzt den Zähler für IP-Adresse und E-Mail zurück.
+    """
+    cache_format = 'join:login-failures:%s:%s'
+
+    @staticmethod
+    def limits():
+        return settings.JOIN_LOGIN_FAILURE_LIMITS, settings.JOIN_LOGIN_FAILURE_WINDOW
+
+    def keys(self, request):
+        ident = self.get_ident(request)
+        email = str(request.data.get('email') or '').strip().lower()
+        account = hashlib.sha256(f'{ident}|{email}'.encode()).hexdigest()
+        return {'ip': self.cache_format % ('ip', ident), 'account': self.cache_format % ('account', account)}
+
+    def allow_request(self, request, view):
+        limits, self.window = self.limits()
+        keys = self.keys(request)
+        counts = cache.get_many(keys.values())
+        return all(counts.get(key, 0) < limits[scope] for scope, key in keys.items())
+
+    def wait(self):
+        return self.window
+
+    @classmethod
+    def record_failure(cls, request):
+        _, window = cls.limits()
+        for key in cls().keys(request).values():
+            # add legt den Zähler mit dem Zeitfenster an, incr verlängert es nicht
+            cache.add(key, 0, window)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, window)
+
+    @classmethod
+    def reset(cls, request):
+        cache.delete(cls().keys(request)['account'])
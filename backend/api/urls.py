@@ -1,6 +1,7 @@
-from django.urls import path, include
-from .views import ContactsView, TaskView, SubTaskView, LoginView, LogoutView, RegisterView, DeleteMyAccountView
+from django.urls import path, re_path, include
+from .views import ContactsView, TaskView, SubTaskView, LoginView, LogoutView, RegisterView, DeleteMyAccountView, CacheStatsView, MetricsView, SearchView, SummaryView, SyncView, ExportView, ImportView, TokenView, TokenRefreshView, TokenRevokeView
 from rest_framework.routers import DefaultRouter
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'contacts', ContactsView, basename='contact')
@@ -12,5 +13,18 @@ urlpatterns = [
      path('login/', LoginView.as_view(), name='login'),
      path('logout/', LogoutView.as_view(), name='logout'),
      path('register/', RegisterView.as_view(), name='register'),
+     path('token/', TokenView.as_view(), name='token'),
+     path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+     path('token/revoke/', TokenRevokeView.as_view(), name='token-revoke'),
      path('delete-my-account/', DeleteMyAccountView.as_view(), name='delete-my-account'),
+     path('search/', SearchView.as_view(), name='search'),
+     path('summary/', SummaryView.as_view(), name='summary'),
+     path('sync/', SyncView.as_view(), name='sync'),
+     path('async/tasks/', async_views.task_list, name='async-task-list'),
+     path('async/tasks/<int:pk>/', async_views.task_detail, name='async-task-detail'),
+     path('async/contacts/', async_views.contacts_list, name='async-contacts-list'),
+     re_path(r'^export/(?P<kind>contacts|tasks)/(?P<file_format>ndjson|csv)/$', ExportView.as_view(), name='export'),
+     re_path(r'^import/(?P<kind>contacts|tasks)/(?P<file_format>ndjson|csv)/$', ImportView.as_view(), name='import'),
+     path('cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
+     path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
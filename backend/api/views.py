@@ -1,22 +1,42 @@
 # views.py
 
-from .serializers import ContactsSerializer, TaskSerializer, SubTaskSerializer, LoginSerializer, RegisterSerializer
+from .serializers import ContactsSerializer, TaskSerializer, SubTaskSerializer, LoginSerializer, RegisterSerializer, TokenSerializer, TaskBulkSerializer, TaskMoveSerializer
+from .filters import TaskFilterBackend
+from .pagination import ContactsPagination, TaskPagination
+from .throttling import FailedLoginThrottle
+from .mixins import CachedResponseMixin, ConditionalGetMixin, FastTaskListMixin, StreamingListMixin
+from . import fast
+from backend import cache
+from backend import changes, counters, metrics, positions, search, tokens, transfer
+from backend.concurrency import VersionConflict, if_match_versions, versioned_etag
+from backend.changes import record_change
 from backend.models import Contacts, Task, Subtask
 
-from django.contrib.auth import login, logout 
+from django.conf import settings
+from django.contrib.auth import login, logout, user_logged_in
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.http import HttpResponse, StreamingHttpResponse
 
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.generics import CreateAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+import logging
 
+logger = logging.getLogger(__name__)
 
 
-class ContactsView(viewsets.ModelViewSet):
-    queryset = Contacts.objects.all()
+class ContactsView(ConditionalGetMixin, CachedResponseMixin, StreamingListMixin, viewsets.ModelViewSet):
+    # has_password_set liest den Benutzer jedes Kontakts
+    queryset = Contacts.objects.select_related('user')
     serializer_class = ContactsSerializer
+    pagination_class = ContactsPagination
+    change_tables = ('contacts',)
 
 
     def create(self, request):
@@ -26,13 +46,13 @@ class ContactsView(viewsets.ModelViewSet):
         self.perform_create(serializer)
 
         response_data = serializer.data
-        print("DEBUG: Response Data from ContactsSerializer (DURING POST):", response_data)
+        logger.debug('Kontakt angelegt: %s', response_data)
 
         headers = self.get_success_headers(serializer.data)
         return Response(response_data, status=status.HTTP_201_CREATED, headers=headers)
 
     
-    def destroy(self):
+    def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
 
         if instance.user and instance.user.has_usable_password():
@@ -42,16 +62,28 @@ class ContactsView(viewsets.ModelViewSet):
             )
         else:
             if instance.user:
-                print(f"DEBUG: Lösche zugehörigen Benutzer '{instance.user.email}' (hat kein Passwort) über Contact-Löschung.")
+                logger.debug("Lösche zugehörigen Benutzer '%s' (hat kein Passwort) über Contact-Löschung.", instance.user.email)
                 instance.user.delete()
 
             else:
-                print(f"DEBUG: Lösche Kontakt '{instance.email}' (hat keinen verknüpften Benutzer).")
+                logger.debug("Lösche Kontakt '%s' (hat keinen verknüpften Benutzer).", instance.email)
                 self.perform_destroy(instance)
 
             return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+def sign_in(request, user):
+    """
+    Meldet den Benutzer an. Mit JOIN_AUTH_MODE = 'token' gibt es statt der Session ein
+    Token-Paar, das der Aufrufer in die Antwort übernimmt.
+    """
+    if settings.JOIN_AUTH_MODE == 'token':
+        user_logged_in.send(sender=user.__class__, request=request, user=user)
+        return tokens.issue(user)
+    login(request, user)
+    return {}
+
+
 class DeleteMyAccountView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -59,42 +91,350 @@ class DeleteMyAccountView(APIView):
         user = request.user
         if user.is_authenticated:
             user.delete()
+            if isinstance(request.auth, dict):
+                tokens.revoke_payload(request.auth, tokens.lifetimes()[0])
             return Response({'message': 'Dein Konto und alle zugehörigen Daten wurden erfolgreich gelöscht.'}, status=status.HTTP_204_NO_CONTENT)
         else:
             return Response({'detail': 'Nicht authentifiziert.'}, status=status.HTTP_401_UNAUTHORIZED)
 
 
-class TaskView (viewsets.ModelViewSet):
-    queryset = Task.objects.all()
+class TaskView (ConditionalGetMixin, CachedResponseMixin, FastTaskListMixin, StreamingListMixin, viewsets.ModelViewSet):
+    # Subtasks und Assignees werden gesammelt nachgeladen, damit List und Retrieve
+    # unabhängig von der Anzahl der Tasks eine feste Anzahl an Queries brauchen.
+    queryset = Task.objects.with_relations().board_order()
     serializer_class = TaskSerializer
-
-
-class SubTaskView (viewsets.ModelViewSet):
+    pagination_class = TaskPagination
+    filter_backends = [TaskFilterBackend]
+    # Tasks liefern ihre Subtasks und Assignees mit aus
+    change_tables = ('task', 'subtask', 'contacts')
+
+    def get_validators(self, request):
+        # Einzelne Tasks tragen ihre Version im ETag, damit er für If-Match taugt
+        etag, last_modified = super().get_validators(request)
+        if str(self.kwargs.get('pk', '')).isdigit():
+            version = Task.objects.filter(pk=self.kwargs['pk']).values_list('version', flat=True).first()
+            if version is not None:
+                etag = versioned_etag(version, etag)
+        return etag, last_modified
+
+    def update(self, request, *args, **kwargs):
+        """PUT und PATCH. Mit If-Match nur, solange der Task noch diese Version hat, sonst 412."""
+        response = super().update(request, *args, **kwargs)
+        response['ETag'] = self.get_validators(request)[0]
+        return response
+
+    def perform_update(self, serializer):
+        versions = if_match_versions(self.request.headers.get('If-Match'))
+        if versions is not None and serializer.instance.version not in versions:
+            raise VersionConflict()
+        serializer.save()
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Legt Tasks an, ändert und löscht sie in einer einzigen Transaktion.
+
+        Body: {"create": [task, ...], "update": [{"id": 1, ...}, ...], "delete": [id, ...]}.
+        Updates sind partiell. Schlägt ein Eintrag fehl, wird nichts gespeichert.
+        """
+        bulk_serializer = TaskBulkSerializer(data=request.data)
+        bulk_serializer.is_valid(raise_exception=True)
+        changes = bulk_serializer.validated_data
+
+        create_serializer = self.get_serializer(data=changes['create'], many=True)
+        update_serializers = self.get_bulk_update_serializers(changes['update'])
+
+        errors = {}
+        if not create_serializer.is_valid():
+            errors['create'] = create_serializer.errors
+        update_errors = [serializer.errors if not serializer.is_valid() else {} for serializer in update_serializers]
+        if any(update_errors):
+            errors['update'] = update_errors
+        if errors:
+            raise ValidationError(errors)
+
+        with transaction.atomic():
+            created = create_serializer.save()
+            updated = [serializer.save() for serializer in update_serializers]
+            to_delete = Task.objects.filter(id__in=changes['delete'])
+            deleted_ids = list(to_delete.values_list('id', flat=True))
+            to_delete.delete()
+
+        tasks = self.get_queryset().in_bulk([task.id for task in created + updated])
+        return Response({
+            'created': self.get_serializer([tasks[task.id] for task in created], many=True).data,
+            'updated': self.get_serializer([tasks[task.id] for task in updated], many=True).data,
+            'deleted': deleted_ids,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def move(self, request):
+        """
+        Verschiebt einen oder mehrere Tasks in eine Status-Spalte oder innerhalb einer Spalte.
+
+        Body: {"ids": [1, 2], "status": "inProgress", "after": 7, "before": 9}. Die Tasks
+        landen in der Reihenfolge von `ids` direkt hinter `after` bzw. vor `before`, ohne
+        beide am Ende der Spalte. Geschrieben werden nur die verschobenen Zeilen mit einem
+        einzigen UPDATE, zurück kommt eine knappe Bestätigung.
+        """
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        new_status = serializer.validated_data['status']
+
+        with transaction.atomic():
+            try:
+                placed = positions.place(
+                    ids, new_status, serializer.validated_data.get('after'), serializer.validated_data.get('before'),
+                )
+            except ValueError as exc:
+                raise ValidationError({'ids': str(exc)})
+            tasks = Task.objects.filter(id__in=ids)
+            deltas = counters.moved(tasks, new_status)
+            moved = tasks.update(status=new_status, version=F('version') + 1, position=Case(
+                *(When(id=task_id, then=Value(position)) for task_id, position in placed.items()),
+            ))
+            if moved:
+                record_change('task', ids)
+                counters.apply(deltas)
+
+        return Response({'moved': moved, 'status': new_status}, status=status.HTTP_200_OK)
+
+    def get_bulk_update_serializers(self, items):
+        instances = self.get_queryset().in_bulk([item['id'] for item in items])
+        missing = [item['id'] for item in items if item['id'] not in instances]
+        if missing:
+            raise ValidationError({'update': f"Unbekannte Task-ids: {', '.join(map(str, missing))}."})
+        return [
+            self.get_serializer(instances[item['id']], data=item, partial=True)
+            for item in items
+        ]
+
+
+class SubTaskView (ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Subtask.objects.all()
     serializer_class = SubTaskSerializer
+    change_tables = ('subtask',)
+
+
+class SyncView(APIView):
+    """
+    Delta-Synchronisation: `GET /api/sync/?since=<revision>` liefert nur die seit dieser
+    Revision angelegten oder geänderten Tasks, Subtasks und Kontakte sowie die ids der
+    gelöschten (Tombstones). Ohne `since` kommt der vollständige Stand. Die Antwort
+    enthält die neue Revision; bei `has_more` sofort mit dieser weiter synchronisieren.
+    """
+    max_changes = 1000
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since is None:
+            revision = changes.current_revision()
+            data = self.serialize(
+                Task.objects.all(), Subtask.objects.all(), Contacts.objects.all()
+            )
+            data.update({'revision': revision, 'has_more': False, 'deleted': {'tasks': [], 'subtasks': [], 'contacts': []}})
+            return Response(data, status=status.HTTP_200_OK)
+
+        try:
+            since = int(since)
+        except ValueError:
+            raise ValidationError({'since': 'Die Revision muss eine Zahl sein.'})
+
+        delta = changes.changes_since(since, self.max_changes)
+        changed, removed = delta['changed'], delta['removed']
+        data = self.serialize(
+            Task.objects.filter(id__in=changed['task']),
+            Subtask.objects.filter(id__in=changed['subtask']),
+            Contacts.objects.filter(id__in=changed['contacts']),
+        )
+        data.update({
+            'revision': delta['revision'],
+            'has_more': delta['has_more'],
+            'deleted': {
+                'tasks': removed['task'],
+                'subtasks': removed['subtask'],
+                'contacts': removed['contacts'],
+            },
+        })
+        return Response(data, status=status.HTTP_200_OK)
+
+    def serialize(self, tasks, subtasks, contacts):
+        return {
+            'tasks': fast.serialize_tasks(tasks),
+            'subtasks': SubTaskSerializer(subtasks, many=True).data,
+            'contacts': ContactsSerializer(contacts.select_related('user'), many=True).data,
+        }
+
+
+class ExportView(APIView):
+    """`GET /api/export/<contacts|tasks>/<ndjson|csv>/` streamt alle Kontakte bzw. Tasks als Datei."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, kind, file_format):
+        response = StreamingHttpResponse(
+            transfer.export_stream(kind, file_format),
+            content_type=transfer.CONTENT_TYPES[file_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{kind}.{file_format}"'
+        return response
+
+
+class ImportView(APIView):
+    """
+    `POST /api/import/<contacts|tasks>/<ndjson|csv>/` mit der Datei als Request-Body.
+    Die Datei wird zeilenweise gelesen und blockweise gespeichert, fehlerhafte Zeilen
+    werden übersprungen und mit Zeilennummer in der Antwort gemeldet.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, kind, file_format):
+        result = transfer.import_rows(request.stream or [], kind, file_format)
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
+
+
+class SearchView(APIView):
+    """
+    Volltextsuche: `GET /api/search/?q=<Begriff>&types=tasks,subtasks,contacts&limit=20`.
+    Alle Wörter müssen vorkommen, das letzte auch als Wortanfang. Je Typ kommen die
+    besten Treffer nach Relevanz sortiert zurück (siehe backend/search.py).
+    """
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not search.search_terms(query):
+            raise ValidationError({'q': 'Bitte einen Suchbegriff angeben.'})
+
+        types = request.query_params.get('types')
+        types = [kind for kind in types.split(',') if kind] if types else list(search.INDEXES)
+        unknown = [kind for kind in types if kind not in search.INDEXES]
+        if unknown:
+            raise ValidationError({'types': f"Unbekannte Typen: {', '.join(unknown)}."})
+
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Das Limit muss eine Zahl sein.'})
+        limit = min(max(limit, 1), self.max_limit)
+
+        backend = search.get_backend()
+        data = {}
+        for kind in types:
+            ids = backend.search(kind, query, limit)
+            data[kind] = self.serialize(kind, ids)
+        return Response(data, status=status.HTTP_200_OK)
+
+    def serialize(self, kind, ids):
+        if kind == 'tasks':
+            return fast.serialize_task_ids(ids)
+        if kind == 'subtasks':
+            objects, serializer_class = Subtask.objects.in_bulk(ids), SubTaskSerializer
+        else:
+            objects, serializer_class = Contacts.objects.select_related('user').in_bulk(ids), ContactsSerializer
+        return serializer_class([objects[pk] for pk in ids if pk in objects], many=True).data
+
+
+class SummaryView(APIView):
+    """
+    Board-Übersicht: Anzahl der Tasks gesamt, je Status und offen dringend sowie die
+    nächste anstehende Deadline eines offenen Tasks. Die Zahlen kommen aus den
+    mitgeführten Zählern (backend/counters.py), die Deadline über einen Teilindex; das
+    kostet unabhängig von der Task-Anzahl zwei Queries.
+    """
+
+    def get(self, request):
+        return Response(counters.summary(), status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    """Request-Metriken je Route im Prometheus-Textformat (siehe backend/metrics.py)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class CacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache.stats(), status=status.HTTP_200_OK)
 
 
 class LoginView(APIView):
     
     permission_classes = [AllowAny]
+    throttle_classes = [FailedLoginThrottle]
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data, context={'request': request})
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            FailedLoginThrottle.record_failure(request)
+            raise ValidationError(serializer.errors)
+        FailedLoginThrottle.reset(request)
         user = serializer.validated_data['user']
-        login(request, user)
         response_data = {'message': 'Erfolgreich angemeldet', 'user_id': user.id, 'email': user.email}
-        print(f"DEBUG: LoginView sendet Antwort: {response_data}")
+        logger.debug('LoginView sendet Antwort: %s', response_data)
+        response_data.update(sign_in(request, user))
         return Response(response_data, status=status.HTTP_200_OK)
 
 
 class LogoutView(APIView):
 
     def post(self, request):
+        # Mit Tokens: das Access-Token aus dem Header und ein mitgeschicktes Refresh-Token widerrufen
+        if isinstance(request.auth, dict):
+            tokens.revoke_payload(request.auth, tokens.lifetimes()[0])
+        if request.data.get('refresh'):
+            tokens.revoke(str(request.data['refresh']))
         logout(request)
         return Response({'message': 'Erfolgreich abgemeldet'}, status=status.HTTP_200_OK)
 
 
+class TokenView(APIView):
+    """`POST /api/token/` mit E-Mail und Passwort: Access- und Refresh-Token, unabhängig von JOIN_AUTH_MODE."""
+    permission_classes = [AllowAny]
+    throttle_classes = [FailedLoginThrottle]
+
+    def post(self, request):
+        serializer = LoginSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            FailedLoginThrottle.record_failure(request)
+            raise ValidationError(serializer.errors)
+        FailedLoginThrottle.reset(request)
+        user = serializer.validated_data['user']
+        user_logged_in.send(sender=user.__class__, request=request, user=user)
+        return Response(tokens.issue(user), status=status.HTTP_200_OK)
+
+
+class TokenRefreshView(APIView):
+    """`POST /api/token/refresh/` mit `{"token": <refresh>}`: neues Token-Paar, das alte Refresh-Token verfällt."""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = TokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            return Response(tokens.refresh(serializer.validated_data['token']), status=status.HTTP_200_OK)
+        except tokens.InvalidToken as exc:
+            raise AuthenticationFailed(str(exc))
+
+
+class TokenRevokeView(APIView):
+    """`POST /api/token/revoke/` mit `{"token": <access oder refresh>}`."""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = TokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tokens.revoke(serializer.validated_data['token'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class RegisterView(CreateAPIView):
     
     serializer_class = RegisterSerializer
@@ -107,8 +447,6 @@ class RegisterView(CreateAPIView):
         self.perform_create(serializer)
 
         user = serializer._user_instance_for_view
-        
-        login(request, user)
 
         response_data = {
             'message': 'Erfolgreich registriert und angemeldet',
@@ -116,4 +454,5 @@ class RegisterView(CreateAPIView):
             'email': user.email,
             'contact_id': serializer.instance.id
         }
+        response_data.update(sign_in(request, user))
         return Response(response_data, status=status.HTTP_201_CREATED)
\ No newline at end of file
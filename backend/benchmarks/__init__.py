@@ -0,0 +1,138 @@
+# backend/benchmarks/__init__.py
+#
+# Benchmarks für `python manage.py benchmark <scenario>`. Jedes Szenario ist ein Modul
+# mit einer Funktion `run(**options)`, die ein JSON-fähiges Ergebnis zurückgibt.
+
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.test.utils import override_settings
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Legt wie der Test-Runner eine frische Testdatenbank an, damit Benchmarks nie
+    die echten Daten berühren, und entfernt sie danach wieder.
+    """
+    connection = connections['default']
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        with override_settings(CACHES={**settings.CACHES, 'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(durations, elapsed=None):
+    """Kennzahlen für eine Liste von Einzeldauern in Sekunden."""
+    elapsed = elapsed if elapsed is not None else sum(durations)
+    return {
+        'requests': len(durations),
+        'throughput': round(len(durations) / elapsed, 2) if elapsed else None,
+        'mean_ms': round(statistics.mean(durations) * 1000, 3) if durations else None,
+        'p50_ms': round(percentile(durations, 50) * 1000, 3) if durations else None,
+        'p99_ms': round(percentile(durations, 99) * 1000, 3) if durations else None,
+    }
+
+
+@contextmanager
+def stopwatch():
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['elapsed'] = time.perf_counter() - start
+
+
+def write_report(path, report):
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2, default=str)
+
+
+def git_revision():
+    """Aktueller Commit (mit "-dirty" bei lokalen Änderungen) oder None außerhalb von Git."""
+    try:
+        revision = subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], capture_output=True, text=True, check=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return revision or None
+
+
+def metadata(options):
+    return {
+        'commit': git_revision(),
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'options': options,
+    }
+
+
+def read_report(path):
+    with open(path, encoding='utf-8') as report_file:
+        return json.load(report_file)
+
+
+# Messwerte der Szenarien, alle übrigen Felder einer Zeile beschreiben die Messung
+MEASUREMENTS = {
+    'requests', 'throughput', 'mean_ms', 'p50_ms', 'p99_ms', 'queries_mean', 'queries_max', 'errors',
+    'seconds', 'tasks_per_second', 'bytes', 'speedup', 'plan', 'per_core',
+}
+
+
+def result_key(row):
+    """Zeilen zweier Berichte gehören zusammen, wenn alle beschreibenden Felder gleich sind."""
+    return tuple(sorted((key, value) for key, value in row.items() if key not in MEASUREMENTS))
+
+
+def compare(baseline, report, metrics=('throughput', 'p50_ms', 'p99_ms', 'queries_mean')):
+    """
+    Vergleicht die Ergebnisse mit einem früheren Bericht. Je gemeinsamer Zeile entstehen
+    die Werte beider Läufe und das Verhältnis neu/alt, Zeilen ohne Gegenstück entfallen.
+    """
+    previous = {result_key(row): row for row in baseline['results']}
+    rows = []
+    for row in report['results']:
+        old = previous.get(result_key(row))
+        if old is None:
+            continue
+        compared = dict(result_key(row))
+        for metric in metrics:
+            if old.get(metric) is None or row.get(metric) is None:
+                continue
+            compared[metric] = row[metric]
+            compared[f'{metric}_before'] = old[metric]
+            compared[f'{metric}_ratio'] = round(row[metric] / old[metric], 3) if old[metric] else None
+        rows.append(compared)
+    return rows
@@ -0,0 +1,202 @@
+# backend/benchmarks/api.py
+
+import datetime
+import json
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from backend import changes
+from backend.metrics import QueryCounter
+from backend.models import Contacts, Subtask, Task
+
+from . import benchmark_database, scenario, summarize
+from .data import seed
+
+# build(context, client, i) bereitet einen Request vor (nicht gemessen) und liefert
+# (Pfad, Body). limit begrenzt die Anzahl, z. B. für Endpunkte mit Passwort-Hashing.
+Endpoint = namedtuple('Endpoint', ['name', 'method', 'build', 'login', 'limit'], defaults=[None, None])
+
+PASSWORD = 'benchmark-passwort'
+
+
+def new_task(title='Benchmark'):
+    return Task.objects.create(
+        title=title, description='Benchmark', category='User Story', due_date=datetime.date.today(),
+    )
+
+
+def new_contact(i, prefix):
+    return Contacts.objects.create(name=f'{prefix} {i}', email=f'{prefix}{i}@example.com')
+
+
+def task_payload(context, i):
+    return {
+        'title': f'Neu {i}',
+        'description': 'Angelegt im Benchmark',
+        'category': 'User Story',
+        'due_date': '2025-06-01',
+        'prio': 'medium',
+        'status': 'toDos',
+        'subtasks': [{'subtasktext': 'Eins', 'done': False}, {'subtasktext': 'Zwei', 'done': True}],
+        'assignee_infos': context.contact_ids[:2],
+    }
+
+
+def reconciled_task(context, i):
+    """PUT mit Subtask-Abgleich: einen Subtask ändern, einen entfernen, einen neu anlegen."""
+    task_id = context.task_ids[i % len(context.task_ids)]
+    task = Task.objects.get(id=task_id)
+    subtasks = list(task.subtasks.order_by('id').values('id', 'subtasktext', 'done'))
+    kept = [{**subtask, 'done': not subtask['done']} for subtask in subtasks[1:]]
+    return f'/api/tasks/{task_id}/', {
+        'title': task.title,
+        'description': task.description,
+        'category': task.category,
+        'due_date': task.due_date.isoformat(),
+        'prio': task.prio,
+        'status': task.status,
+        'subtasks': kept + [{'subtasktext': f'Neu {i}', 'done': False}],
+        'assignee_infos': context.contact_ids[i % 3:i % 3 + 2],
+    }
+
+
+def pick(ids, i):
+    return ids[i % len(ids)]
+
+
+def logout(context, client, i):
+    client.force_login(context.user)
+    return '/api/logout/', None
+
+
+def delete_account(context, client, i):
+    email = f'weg{i}@example.com'
+    client.force_login(User.objects.create_user(email, email))
+    return '/api/delete-my-account/', None
+
+
+ENDPOINTS = [
+    Endpoint('tasks-list', 'GET', lambda c, client, i: ('/api/tasks/', None)),
+    Endpoint('tasks-list-page', 'GET', lambda c, client, i: ('/api/tasks/?limit=50', None)),
+    Endpoint('tasks-list-keyset', 'GET', lambda c, client, i: ('/api/tasks/?page_size=50', None)),
+    Endpoint('tasks-list-filter', 'GET', lambda c, client, i: ('/api/tasks/?status=inProgress&prio=urgent,medium', None)),
+    Endpoint('tasks-list-stream', 'GET', lambda c, client, i: ('/api/tasks/?stream=1', None)),
+    Endpoint('tasks-detail', 'GET', lambda c, client, i: (f'/api/tasks/{pick(c.task_ids, i)}/', None)),
+    Endpoint('tasks-create', 'POST', lambda c, client, i: ('/api/tasks/', task_payload(c, i))),
+    Endpoint('tasks-update', 'PUT', lambda c, client, i: reconciled_task(c, i)),
+    Endpoint('tasks-partial-update', 'PATCH', lambda c, client, i: (f'/api/tasks/{pick(c.task_ids, i)}/', {'title': f'Geändert {i}'})),
+    Endpoint('tasks-bulk', 'POST', lambda c, client, i: ('/api/tasks/bulk/', {
+        'create': [task_payload(c, i) for _ in range(5)],
+        'update': [{'id': pick(c.task_ids, i), 'prio': 'low'}],
+    })),
+    Endpoint('tasks-move', 'POST', lambda c, client, i: ('/api/tasks/move/', {
+        'ids': [pick(c.task_ids, i + n) for n in range(5)], 'status': ['toDos', 'done'][i % 2],
+    })),
+    Endpoint('tasks-destroy', 'DELETE', lambda c, client, i: (f'/api/tasks/{new_task().id}/', None)),
+    Endpoint('contacts-list', 'GET', lambda c, client, i: ('/api/contacts/', None)),
+    Endpoint('contacts-list-page', 'GET', lambda c, client, i: ('/api/contacts/?page_size=50', None)),
+    Endpoint('contacts-detail', 'GET', lambda c, client, i: (f'/api/contacts/{pick(c.contact_ids, i)}/', None)),
+    Endpoint('contacts-create', 'POST', lambda c, client, i: ('/api/contacts/', {
+        'name': f'Neu {i}', 'email': f'neu{i}@example.com', 'color': '#FF7A00',
+    })),
+    Endpoint('contacts-partial-update', 'PATCH', lambda c, client, i: (f'/api/contacts/{pick(c.contact_ids, i)}/', {'phone': f'+49 {i}'})),
+    Endpoint('contacts-destroy', 'DELETE', lambda c, client, i: (f'/api/contacts/{new_contact(i, "weg").id}/', None)),
+    Endpoint('subtasks-list', 'GET', lambda c, client, i: ('/api/subtasks/', None)),
+    Endpoint('subtasks-detail', 'GET', lambda c, client, i: (f'/api/subtasks/{pick(c.subtask_ids, i)}/', None)),
+    Endpoint('subtasks-partial-update', 'PATCH', lambda c, client, i: (f'/api/subtasks/{pick(c.subtask_ids, i)}/', {'done': bool(i % 2)})),
+    Endpoint('sync-full', 'GET', lambda c, client, i: ('/api/sync/', None)),
+    Endpoint('sync-delta', 'GET', lambda c, client, i: (f'/api/sync/?since={max(changes.current_revision() - 20, 0)}', None)),
+    Endpoint('summary', 'GET', lambda c, client, i: ('/api/summary/', None)),
+    Endpoint('search', 'GET', lambda c, client, i: (f'/api/search/?q=Task {pick(c.task_ids, i) % 1000}', None)),
+    Endpoint('async-task-list', 'GET', lambda c, client, i: ('/api/async/tasks/', None)),
+    Endpoint('async-task-detail', 'GET', lambda c, client, i: (f'/api/async/tasks/{pick(c.task_ids, i)}/', None)),
+    Endpoint('async-contacts-list', 'GET', lambda c, client, i: ('/api/async/contacts/', None)),
+    Endpoint('export-tasks', 'GET', lambda c, client, i: ('/api/export/tasks/ndjson/', None), 'admin', 20),
+    Endpoint('import-contacts', 'POST', lambda c, client, i: ('/api/import/contacts/ndjson/', '\n'.join(
+        json.dumps({'name': f'Import {i}-{n}', 'email': f'import{i}-{n}@example.com'}) for n in range(50)
+    )), 'admin', 20),
+    Endpoint('cache-stats', 'GET', lambda c, client, i: ('/api/cache-stats/', None), 'admin'),
+    Endpoint('metrics', 'GET', lambda c, client, i: ('/api/metrics/', None), 'admin'),
+    # Registrierung und Login hashen Passwörter und sind dadurch bewusst langsam
+    Endpoint('register', 'POST', lambda c, client, i: ('/api/register/', {
+        'email': f'registriert{i}@example.com', 'password': PASSWORD, 'name': f'Registriert {i}',
+    }), None, 10),
+    Endpoint('login', 'POST', lambda c, client, i: ('/api/login/', {'email': c.user.email, 'password': PASSWORD}), None, 10),
+    Endpoint('logout', 'POST', logout),
+    Endpoint('delete-my-account', 'DELETE', delete_account),
+]
+
+
+class Context:
+
+    def __init__(self):
+        self.task_ids = list(Task.objects.order_by('id').values_list('id', flat=True))
+        self.contact_ids = list(Contacts.objects.order_by('id').values_list('id', flat=True))
+        self.admin = User.objects.create_superuser('benchmark-admin', 'admin@example.com', PASSWORD)
+        self.user = User.objects.create_user('benchmark@example.com', 'benchmark@example.com', PASSWORD)
+
+    @property
+    def subtask_ids(self):
+        # PUT auf Tasks entfernt Subtasks, deshalb jedes Mal neu laden
+        return list(Subtask.objects.order_by('id').values_list('id', flat=True))
+
+
+def send(client, method, path, body):
+    if isinstance(body, str):
+        return client.generic(method, path, body.encode(), content_type='application/x-ndjson')
+    if body is None:
+        return client.generic(method, path)
+    return client.generic(method, path, json.dumps(body), content_type='application/json')
+
+
+def measure(endpoint, context, requests):
+    client = Client()
+    if endpoint.login == 'admin':
+        client.force_login(context.admin)
+    durations, queries = [], []
+    for i in range(min(requests, endpoint.limit or requests)):
+        path, body = endpoint.build(context, client, i)
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            start = time.perf_counter()
+            response = send(client, endpoint.method, path, body)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            durations.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{endpoint.method} {path} antwortete mit {response.status_code}')
+        queries.append(counter.count)
+
+    return {
+        'endpoint': endpoint.name,
+        'method': endpoint.method,
+        **summarize(durations),
+        'queries_mean': round(sum(queries) / len(queries), 2),
+        'queries_max': max(queries),
+    }
+
+
+@scenario('api')
+def run(tasks=500, contacts=50, requests=200, **options):
+    """
+    Treibt jeden Endpunkt aus backend/api/urls.py über den Test-Client: Listen, Detail,
+    Anlegen, Ändern (inklusive Subtask-Abgleich), Löschen, Sync, Import/Export sowie
+    Registrierung und Login. Je Endpunkt Durchsatz, Latenz und Queries pro Request.
+    """
+    setup_test_environment()
+    try:
+        with benchmark_database():
+            seed(contacts=contacts, tasks=tasks)
+            context = Context()
+            results = [measure(endpoint, context, requests) for endpoint in ENDPOINTS]
+    finally:
+        teardown_test_environment()
+    return {'scenario': 'api', 'tasks': tasks, 'contacts': contacts, 'results': results}
@@ -0,0 +1,107 @@
+# backend/benchmarks/asgi.py
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import benchmark_database, scenario, stopwatch, summarize
+from .data import seed
+
+ENDPOINTS = {
+    'tasks': ('/api/tasks/', '/api/async/tasks/'),
+    'contacts': ('/api/contacts/', '/api/async/contacts/'),
+}
+
+
+async def asgi_get(application, path):
+    """Schickt einen GET-Request direkt an die ASGI-Anwendung und liefert Status und Bytes."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode('ascii'),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'accept', b'application/json')],
+        'server': ('localhost', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+    request_sent = False
+    response = {'status': None, 'size': 0}
+    response_sent = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Der Client trennt die Verbindung, sobald die Antwort da ist. Ein früheres
+        # http.disconnect würde Django als Abbruch des Requests werten.
+        await response_sent.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['size'] += len(message.get('body', b''))
+            if not message.get('more_body', False):
+                response_sent.set()
+
+    await application(scope, receive, send)
+    return response
+
+
+async def load(application, path, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    durations = []
+    failures = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await asgi_get(application, path)
+            durations.append(time.perf_counter() - start)
+            if response['status'] != 200:
+                failures.append(response['status'])
+
+    # Fehler erst nach dem letzten Request melden: Ein Abbruch mitten in gather würde
+    # laufende Requests abbrechen, deren Django-Thread dann nie mehr fertig wird.
+    with stopwatch() as watch:
+        await asyncio.gather(*(one() for _ in range(requests)))
+    if failures:
+        raise RuntimeError(f'{path} antwortete {len(failures)}-mal nicht mit 200: {sorted(set(failures))}')
+    return summarize(durations, watch['elapsed'])
+
+
+def measure(application, path, requests, concurrency):
+    # Eigene Event-Loop in einem eigenen Thread, wie bei einem ASGI-Server. Unter
+    # async_to_sync im Haupt-Thread liefen die synchronen Views über dessen
+    # CurrentThreadExecutor, parallele Requests blockierten sich dort gegenseitig.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, load(application, path, requests, concurrency)).result()
+
+
+@scenario('asgi')
+def run(tasks=500, contacts=50, requests=200, concurrency=(1, 8, 32), **options):
+    """
+    Vergleicht den Durchsatz der synchronen DRF-Views mit den async Views unter
+    steigender Parallelität. Beide Pfade laufen über dieselbe ASGI-Anwendung,
+    der Response-Cache ist dabei abgeschaltet. Die synchronen Views berechnen
+    weiterhin ihren ETag (eine Query auf die Änderungsmarker), die async Views
+    haben diese Schicht nicht (siehe backend/api/async_views.py).
+    """
+    from join_backend.asgi import application
+
+    with benchmark_database():
+        seeded = seed(contacts=contacts, tasks=tasks)
+        results = []
+        for name, (sync_path, async_path) in ENDPOINTS.items():
+            for level in concurrency:
+                for mode, path in (('sync', sync_path), ('async', async_path)):
+                    stats = measure(application, path, requests, level)
+                    results.append({'endpoint': name, 'mode': mode, 'concurrency': level, **stats})
+    return {'scenario': 'asgi', 'seeded': seeded, 'results': results}
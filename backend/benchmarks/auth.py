@@ -0,0 +1,66 @@
+# backend/benchmarks/auth.py
+
+import time
+from contextlib import ExitStack
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from backend import tokens
+from backend.metrics import QueryCounter
+
+from . import benchmark_database, scenario, summarize
+from .data import seed
+
+PATHS = {
+    'summary': '/api/summary/',
+    'tasks-page': '/api/tasks/?limit=50',
+}
+
+
+def clients(user):
+    anonymous = Client()
+    session = Client()
+    session.force_login(user)
+    token = Client(HTTP_AUTHORIZATION=f"Bearer {tokens.issue(user)['access']}")
+    return {'anonymous': anonymous, 'session': session, 'token': token}
+
+
+def measure(client, path, requests):
+    durations, queries = [], []
+    for _ in range(requests):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            start = time.perf_counter()
+            response = client.get(path)
+            durations.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} antwortete mit {response.status_code}')
+        queries.append(counter.count)
+    return {**summarize(durations), 'queries_mean': round(sum(queries) / len(queries), 2)}
+
+
+@scenario('auth')
+def run(tasks=500, contacts=50, requests=200, **options):
+    """
+    Aufwand der Authentifizierung je Request: anonym, mit Session-Cookie (Session- und
+    User-Query) und mit signiertem Bearer-Token (ohne Query).
+    """
+    results = []
+    setup_test_environment()
+    try:
+        with benchmark_database():
+            seed(contacts=contacts, tasks=tasks)
+            user = User.objects.create_user('benchmark@example.com', 'benchmark@example.com')
+            # Erstes Laden der Widerrufsliste nicht mitmessen
+            tokens.revocations.reload()
+            for endpoint, path in PATHS.items():
+                for mode, client in clients(user).items():
+                    results.append({'endpoint': endpoint, 'auth': mode, **measure(client, path, requests)})
+    finally:
+        teardown_test_environment()
+    return {'scenario': 'auth', 'results': results}
@@ -0,0 +1,73 @@
+# backend/benchmarks/data.py
+
+import datetime
+import random
+
+from django.db import connection
+
+from backend import counters, search
+from backend.models import Contacts, Subtask, Task
+
+CATEGORIES = ['Technical Task', 'User Story']
+COLORS = ['#FF7A00', '#9327FF', '#6E52FF', '#FC71FF', '#FFBB2B', '#1FD7C1', '#462F8A']
+
+
+def seed(contacts=50, tasks=1000, subtasks_per_task=3, assignees_per_task=2, random_seed=1, batch_size=2000):
+    """
+    Erzeugt reproduzierbare Testdaten per bulk_create. Gibt die Anzahl der angelegten
+    Kontakte, Tasks, Subtasks und Zuordnungen zurück.
+
+    bulk_create löst keine Signale aus, Cache, Änderungsmarker und Änderungsprotokoll
+    werden hier bewusst nicht gepflegt.
+    """
+    rng = random.Random(random_seed)
+    offset = Contacts.objects.count()
+    contact_objects = Contacts.objects.bulk_create([
+        Contacts(
+            name=f'Kontakt {offset + i}',
+            email=f'kontakt{offset + i}@example.com',
+            color=rng.choice(COLORS),
+            phone=f'+49 30 {rng.randint(1000000, 9999999)}',
+        )
+        for i in range(contacts)
+    ], batch_size=batch_size)
+    contact_ids = [contact.id for contact in contact_objects] or list(Contacts.objects.values_list('id', flat=True))
+
+    statuses = [status for status, _ in Task.STATUS_CHOICES]
+    prios = [prio for prio, _ in Task.PRIO_CHOICES]
+    start = datetime.date.today()
+    created = {'contacts': len(contact_objects), 'tasks': 0, 'subtasks': 0, 'assignees': 0}
+    Assignee = Task.assignee_infos.through
+
+    for first in range(0, tasks, batch_size):
+        count = min(batch_size, tasks - first)
+        task_objects = Task.objects.bulk_create([
+            Task(
+                title=f'Task {first + i}',
+                description=f'Beschreibung für Task {first + i}',
+                category=rng.choice(CATEGORIES),
+                due_date=start + datetime.timedelta(days=rng.randint(-30, 90)),
+                prio=rng.choice(prios),
+                status=rng.choice(statuses),
+            )
+            for i in range(count)
+        ])
+        subtasks = [
+            Subtask(task=task, subtasktext=f'Subtask {n} von {task.title}', done=rng.random() < 0.3)
+            for task in task_objects for n in range(subtasks_per_task)
+        ]
+        Subtask.objects.bulk_create(subtasks, batch_size=batch_size)
+        assignees = [
+            Assignee(task_id=task.id, contacts_id=contact_id)
+            for task in task_objects
+            for contact_id in rng.sample(contact_ids, min(assignees_per_task, len(contact_ids)))
+        ]
+        Assignee.objects.bulk_create(assignees, batch_size=batch_size)
+        created['tasks'] += count
+        created['subtasks'] += len(subtasks)
+        created['assignees'] += len(assignees)
+
+    # bulk_create umgeht die Signale, die Zähler der Board-Übersicht daher einmal nachziehen
+    counters.reset(counters.recount())
+    search.optimize_fts(connection)
+    return created
@@ -0,0 +1,139 @@
+# backend/benchmarks/database.py
+
+import io
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import override_settings
+
+from backend.models import Task
+from join_backend.database import PROFILES, sqlite_database
+
+from . import scenario, stopwatch, summarize
+from .data import seed
+
+
+def drop_default_connection():
+    connections.close_all()
+    try:
+        del connections['default']
+    except AttributeError:
+        pass
+
+
+@contextmanager
+def profile_database(profile, directory):
+    """
+    Stellt die Verbindung "default" auf eine eigene SQLite-Datei mit dem Profil um.
+    Eine Testdatenbank im Speicher taugt hier nicht, WAL und Sperren gibt es nur mit Datei.
+    """
+    original = connections.settings['default']
+    drop_default_connection()
+    connections.settings['default'] = {**original, **sqlite_database(os.path.join(directory, f'{profile}.sqlite3'), profile)}
+    try:
+        with override_settings(CACHES={**settings.CACHES, 'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            call_command('migrate', verbosity=0, interactive=False)
+            yield
+    finally:
+        drop_default_connection()
+        connections.settings['default'] = original
+
+
+def wsgi_request(handler, method, path, body=None):
+    """Schickt einen Request wie ein WSGI-Server an Django, inklusive request_started/finished."""
+    path, _, query = path.partition('?')
+    payload = json.dumps(body).encode() if body is not None else b''
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost',
+        'HTTP_ACCEPT': 'application/json',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': io.BytesIO(payload),
+        'wsgi.url_scheme': 'http',
+        'wsgi.errors': io.StringIO(),
+    }
+    status = []
+    response = handler(environ, lambda status_line, headers: status.append(int(status_line[:3])))
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return status[0]
+
+
+def request_mix(task_ids, requests, write_share, random_seed=1):
+    """Feste Folge aus Lese- (Liste, Übersicht) und Schreib-Requests (Verschieben, Bearbeiten)."""
+    rng = random.Random(random_seed)
+    statuses = [status for status, _ in Task.STATUS_CHOICES]
+    mix = []
+    for i in range(requests):
+        if rng.random() < write_share:
+            if i % 2:
+                mix.append(('POST', '/api/tasks/move/', {'ids': rng.sample(task_ids, 5), 'status': rng.choice(statuses)}))
+            else:
+                mix.append(('PATCH', f'/api/tasks/{rng.choice(task_ids)}/', {'title': f'Bearbeitet {i}'}))
+        elif i % 2:
+            mix.append(('GET', f'/api/tasks/?limit=50&offset={rng.randrange(len(task_ids))}', None))
+        else:
+            mix.append(('GET', '/api/summary/', None))
+    return mix
+
+
+def load(handler, mix, concurrency):
+    durations, errors = [], 0
+
+    def one(request):
+        start = time.perf_counter()
+        status = wsgi_request(handler, *request)
+        return time.perf_counter() - start, status
+
+    with stopwatch() as watch, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for duration, status in pool.map(one, mix):
+            durations.append(duration)
+            errors += status >= 400
+    return {'errors': errors, **summarize(durations, watch['elapsed'])}
+
+
+@scenario('database')
+def run(tasks=500, contacts=50, requests=200, concurrency=(1, 8, 32), write_share=0.2, **options):
+    """
+    Gemischte Lese-/Schreiblast (Anteil Schreibzugriffe: write_share) über den WSGI-Handler
+    gegen eine SQLite-Datei, je Datenbankprofil aus join_backend/database.py. Fehler sind
+    Antworten mit Status >= 400, typischerweise "database is locked".
+    """
+    handler = WSGIHandler()
+    request_logger = logging.getLogger('django.request')
+    results = []
+    with tempfile.TemporaryDirectory() as directory, override_settings(ALLOWED_HOSTS=['localhost']):
+        request_logger.disabled = True
+        try:
+            for profile in PROFILES:
+                with profile_database(profile, directory):
+                    seed(contacts=contacts, tasks=tasks)
+                    task_ids = list(Task.objects.values_list('id', flat=True))
+                    for level in sorted(concurrency):
+                        mix = request_mix(task_ids, requests, write_share)
+                        results.append({'profile': profile, 'concurrency': level, **load(handler, mix, level)})
+        finally:
+            request_logger.disabled = False
+
+    baseline = {row['concurrency']: row['throughput'] for row in results if row['profile'] == 'default'}
+    for row in results:
+        row['speedup'] = round(row['throughput'] / baseline[row['concurrency']], 2)
+    return {'scenario': 'database', 'results': results}
@@ -0,0 +1,93 @@
+# backend/benchmarks/hashing.py
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from backend.hashers import pool
+from join_backend.passwords import PROFILES, argon2_available, password_hashers
+
+from . import benchmark_database, scenario, stopwatch, summarize
+
+PASSWORD = 'benchmark-passwort'
+
+# Ein Hash kostet je nach Profil bis zu einer halben Sekunde, mehr Messungen bringen nichts
+MAX_HASHES = 50
+
+
+def profiles():
+    return [profile for profile in PROFILES if profile != 'argon2' or argon2_available()]
+
+
+def hashing_load(encoded, hashes, concurrency):
+    durations = []
+
+    def one(_):
+        start = time.perf_counter()
+        if not check_password(PASSWORD, encoded):
+            raise RuntimeError('Passwortprüfung fehlgeschlagen')
+        durations.append(time.perf_counter() - start)
+
+    with stopwatch() as watch, ThreadPoolExecutor(max_workers=concurrency) as threads:
+        list(threads.map(one, range(hashes)))
+    return summarize(durations, watch['elapsed'])
+
+
+def login_load(client, payload, requests, expected):
+    durations = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.post('/api/login/', payload, content_type='application/json')
+        durations.append(time.perf_counter() - start)
+        if response.status_code != expected:
+            raise RuntimeError(f'Login antwortete mit {response.status_code} statt {expected}')
+    return summarize(durations)
+
+
+@scenario('hashing')
+def run(requests=200, concurrency=(1, 8, 32), **options):
+    """
+    Passwortprüfungen je Sekunde und CPU-Kern für jedes Hashing-Profil über den
+    Worker-Pool bei steigender Parallelität, dazu Logins über die API und Logins, die
+    nach zu vielen Fehlversuchen ohne Hashing abgelehnt werden.
+    """
+    hashes = min(requests, MAX_HASHES)
+    cores = os.cpu_count() or 1
+    results = []
+    setup_test_environment()
+    try:
+        # Der Zähler der Fehlversuche braucht einen echten Cache statt DummyCache
+        with benchmark_database(), override_settings(CACHES={**settings.CACHES, 'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-hashing',
+        }}):
+            for profile in profiles():
+                with override_settings(PASSWORD_HASHERS=password_hashers(profile)):
+                    encoded = make_password(PASSWORD)
+                    for level in concurrency:
+                        stats = hashing_load(encoded, hashes, level)
+                        results.append({
+                            'profile': profile, 'measure': 'check_password', 'concurrency': level,
+                            'per_core': round(stats['throughput'] / min(cores, pool.workers), 2), **stats,
+                        })
+
+                    email = f'{profile}@example.com'
+                    User.objects.create_user(email, email, PASSWORD)
+                    client = Client()
+                    stats = login_load(client, {'email': email, 'password': PASSWORD}, min(requests, MAX_HASHES // 5), 200)
+                    results.append({'profile': profile, 'measure': 'login', 'concurrency': 1, **stats})
+
+                    cache.clear()
+                    wrong = {'email': email, 'password': 'falsch'}
+                    login_load(client, wrong, settings.JOIN_LOGIN_FAILURE_LIMITS['account'], 400)
+                    stats = login_load(client, wrong, requests, 429)
+                    results.append({'profile': profile, 'measure': 'login_throttled', 'concurrency': 1, **stats})
+    finally:
+        teardown_test_environment()
+    return {'scenario': 'hashing', 'cores': cores, 'results': results}
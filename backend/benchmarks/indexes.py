@@ -0,0 +1,87 @@
+# backend/benchmarks/indexes.py
+
+import datetime
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.models.functions import Lower
+
+from backend import counters
+from backend.models import Contacts, Task
+
+from . import benchmark_database, scenario, stopwatch, summarize
+from .data import seed
+
+INDEXED_MODELS = (Task, Contacts)
+
+
+def queries():
+    """Die Zugriffe aus API, Admin und Registrierung, für die die Indizes gedacht sind."""
+    today = datetime.date.today()
+    return {
+        'board_status_page': Task.objects.filter(status='inProgress').order_by('due_date', 'id')[:50],
+        'admin_prio_page': Task.objects.filter(prio='urgent').order_by('due_date', 'id')[:50],
+        'category_page': Task.objects.filter(category='User Story').order_by('due_date', 'id')[:50],
+        'keyset_page': Task.objects.filter(due_date__gt=today).order_by('due_date', 'id')[:50],
+        'upcoming_deadline': counters.upcoming_deadlines()[:1],
+        'contacts_page': Contacts.objects.order_by('name', 'id')[:50],
+        'register_email_lower': Contacts.objects.alias(email_lower=Lower('email')).filter(email_lower='kontakt4711@example.com')[:1],
+        'register_email_iexact': Contacts.objects.filter(email__iexact='KONTAKT4711@example.com')[:1],
+    }
+
+
+@contextmanager
+def without_indexes():
+    """Entfernt vorübergehend alle Meta.indexes von Task und Contacts (Stand vor den Migrationen)."""
+    with connection.schema_editor() as editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+    analyze()
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+        analyze()
+
+
+def analyze():
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def measure(size, state, requests):
+    results = []
+    for name, queryset in queries().items():
+        plan = ' | '.join(line.split(' ', 3)[-1] for line in queryset.explain().splitlines())
+        durations = []
+        for _ in range(requests):
+            with stopwatch() as watch:
+                list(queryset.all())
+            durations.append(watch['elapsed'])
+        results.append({'tasks': size, 'query': name, 'indexes': state, 'plan': plan, **summarize(durations)})
+    return results
+
+
+@scenario('indexes')
+def run(sizes=(1000, 10000, 100000), requests=200, **options):
+    """
+    Query-Pläne (EXPLAIN QUERY PLAN) und Laufzeiten der typischen Zugriffe ohne und mit
+    den Indizes aus Meta.indexes. Je Datenmenge kommen zehnmal so viele Tasks wie Kontakte.
+    """
+    results = []
+    with benchmark_database():
+        for size in sorted(sizes):
+            missing_tasks = size - Task.objects.count()
+            missing_contacts = size // 10 - Contacts.objects.count()
+            if missing_tasks > 0 or missing_contacts > 0:
+                seed(contacts=max(missing_contacts, 0), tasks=max(missing_tasks, 0))
+            analyze()
+
+            with without_indexes():
+                results.extend(measure(size, 'before', requests))
+            results.extend(measure(size, 'after', requests))
+    return {'scenario': 'indexes', 'results': results}
@@ -0,0 +1,37 @@
+# backend/benchmarks/search.py
+
+from backend import search
+from backend.models import Task
+
+from . import benchmark_database, scenario, stopwatch, summarize
+from .data import seed
+
+# Die Testdaten enthalten "task", "subtask" und "beschreibung" in jeder Zeile, Zahlen sind selten
+QUERIES = ['4711', 'Task 4711', 'kontakt 4', 'subtask 2 von task 99']
+
+
+@scenario('search')
+def run(sizes=(10000, 100000, 1000000), requests=20, **options):
+    """
+    Misst die Suche über Tasks, Subtasks und Kontakte (je Typ die besten 20 Treffer) mit
+    dem FTS5-Index und mit der icontains-Suche bei wachsender Anzahl an Tasks.
+    """
+    backends = {'fts5': search.Fts5SearchBackend(), 'icontains': search.ContainsSearchBackend()}
+    results = []
+    with benchmark_database():
+        seed(tasks=0)
+        for size in sorted(sizes):
+            missing = size - Task.objects.count()
+            if missing > 0:
+                seed(contacts=0, tasks=missing)
+
+            for query in QUERIES:
+                for name, backend in backends.items():
+                    durations = []
+                    for _ in range(requests):
+                        with stopwatch() as watch:
+                            for kind in search.INDEXES:
+                                backend.search(kind, query, 20)
+                        durations.append(watch['elapsed'])
+                    results.append({'tasks': size, 'query': query, 'backend': name, **summarize(durations)})
+    return {'scenario': 'search', 'results': results}
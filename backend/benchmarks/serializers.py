@@ -0,0 +1,50 @@
+# backend/benchmarks/serializers.py
+
+from rest_framework.renderers import JSONRenderer
+
+from backend.api import fast
+from backend.api.serializers import TaskSerializer
+from backend.models import Task
+
+from . import benchmark_database, scenario, stopwatch
+from .data import seed
+
+
+def measure(render):
+    with stopwatch() as watch:
+        size = len(render())
+    return watch['elapsed'], size
+
+
+@scenario('serializers')
+def run(sizes=(1000, 10000, 100000), contacts=50, **options):
+    """
+    Misst die Serialisierung der kompletten Task-Liste über TaskSerializer und über den
+    schnellen Lesepfad bei wachsender Anzahl an Tasks, jeweils inklusive Datenbankzugriff
+    und JSON-Rendering.
+    """
+    renderer = JSONRenderer()
+    results = []
+    with benchmark_database():
+        seed(contacts=contacts, tasks=0)
+        for size in sorted(sizes):
+            missing = size - Task.objects.count()
+            if missing > 0:
+                seed(contacts=0, tasks=missing)
+
+            drf_seconds, drf_bytes = measure(
+                lambda: renderer.render(TaskSerializer(Task.objects.with_relations(), many=True).data)
+            )
+            fast_seconds, fast_bytes = measure(
+                lambda: renderer.render(fast.serialize_tasks(Task.objects.all()))
+            )
+            for mode, seconds, size_bytes in (('drf', drf_seconds, drf_bytes), ('fast', fast_seconds, fast_bytes)):
+                results.append({
+                    'tasks': size,
+                    'mode': mode,
+                    'seconds': round(seconds, 4),
+                    'tasks_per_second': round(size / seconds, 1),
+                    'bytes': size_bytes,
+                    'speedup': round(drf_seconds / seconds, 2),
+                })
+    return {'scenario': 'serializers', 'results': results}
@@ -0,0 +1,78 @@
+# backend/cache.py
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'join:api:version'
+HITS_KEY = 'join:api:hits'
+MISSES_KEY = 'join:api:misses'
+
+
+def get_version():
+    """
+    Aktuelle Version der API-Daten. Fehlt der Zähler (Neustart, Verdrängung), wird er
+    mit einem Zeitstempel neu gestartet, damit alte Einträge nicht wieder gültig werden.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        get_version()
+
+
+def invalidate():
+    """
+    Macht alle gecachten Antworten ungültig. Innerhalb einer Transaktion wird nach dem
+    Commit noch einmal erhöht, damit zwischenzeitlich gecachte Alt-Daten verworfen werden.
+    """
+    bump_version()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump_version)
+
+
+def response_cache_key(request, version):
+    path = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+    return f'join:api:response:{version}:{path}'
+
+
+def get_timeout():
+    return getattr(settings, 'JOIN_RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def record_hit():
+    _increment(HITS_KEY)
+
+
+def record_miss():
+    _increment(MISSES_KEY)
+
+
+def _increment(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+        'version': get_version(),
+    }
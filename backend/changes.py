@@ -0,0 +1,83 @@
+# backend/changes.py
+
+from functools import partial
+
+from django.db import models, transaction
+
+from . import cache, realtime
+from .models import ChangeLogEntry, ChangeMarker
+
+
+def record_change(table, ids=(), deleted=False):
+    """
+    Zentrale Stelle für jede Änderung an Tasks, Subtasks oder Kontakten: verwirft die
+    gecachten API-Antworten, erhöht den Änderungsmarker der Tabelle und protokolliert
+    die betroffenen ids für die Delta-Synchronisation.
+
+    Nach dem Commit wird die Änderung an die verbundenen WebSocket-Clients verteilt.
+
+    Wird von den Model-Signalen aufgerufen und muss zusätzlich von Schreibpfaden
+    aufgerufen werden, die keine Signale auslösen (queryset.update, bulk_create, bulk_update).
+    """
+    cache.invalidate()
+    ChangeMarker.bump(table)
+    if ids:
+        entries = ChangeLogEntry.objects.bulk_create([
+            ChangeLogEntry(table=table, object_id=object_id, deleted=deleted) for object_id in ids
+        ])
+        revision = max(entry.id for entry in entries)
+        transaction.on_commit(partial(realtime.publish_change, table, ids, deleted, revision))
+
+
+def changes_since(revision, limit):
+    """
+    Liefert die seit `revision` geänderten und gelöschten ids je Tabelle sowie die
+    Revision, bis zu der die Antwort reicht. Mehrfach geänderte Objekte erscheinen
+    nur einmal, maßgeblich ist ihr letzter Eintrag.
+
+    Die Revision ist die id des Protokolleintrags. Das setzt voraus, dass ids in
+    Commit-Reihenfolge vergeben werden, was SQLite durch seine Schreibsperre garantiert.
+    """
+    entries = list(
+        ChangeLogEntry.objects.filter(id__gt=revision)
+        .order_by('id')
+        .values_list('id', 'table', 'object_id', 'deleted')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for _, table, object_id, deleted in entries:
+        latest[(table, object_id)] = deleted
+
+    changed = {table: [] for table, _ in ChangeMarker.TABLE_CHOICES}
+    removed = {table: [] for table, _ in ChangeMarker.TABLE_CHOICES}
+    for (table, object_id), deleted in latest.items():
+        (removed if deleted else changed)[table].append(object_id)
+
+    return {
+        'revision': entries[-1][0] if entries else revision,
+        'has_more': has_more,
+        'changed': changed,
+        'removed': removed,
+    }
+
+
+def current_revision():
+    return ChangeLogEntry.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def compact():
+    """
+    Entfernt Protokolleinträge, die durch einen späteren Eintrag für dasselbe Objekt
+    überholt sind. Der jeweils letzte Eintrag (auch Tombstones) bleibt erhalten,
+    dadurch bekommt jeder Client weiterhin alle Änderungen seit seiner Revision.
+    """
+    superseded = ChangeLogEntry.objects.filter(
+        id__lt=ChangeLogEntry.objects.filter(
+            table=models.OuterRef('table'),
+            object_id=models.OuterRef('object_id'),
+        ).order_by('-id').values('id')[:1]
+    )
+    deleted, _ = superseded.delete()
+    return deleted
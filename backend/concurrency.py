@@ -0,0 +1,60 @@
+# backend/concurrency.py
+#
+# Optimistische Nebenläufigkeit für Tasks. Jeder Task trägt eine Versionsnummer
+# (Task.version). Bevor TaskSerializer.update speichert, zählt claim_version die Version
+# mit einem bedingten UPDATE (... WHERE id = ? AND version = ?) hoch. Hat jemand den
+# Task seit dem Laden geändert, trifft das UPDATE keine Zeile und es gibt
+# VersionConflict statt eines stillen Überschreibens. Das anschließende save() läuft
+# in derselben Transaktion und löst wie gewohnt die Signale aus.
+#
+# Task.save() selbst prüft nichts und schreibt die geladene Version unverändert zurück.
+# Verschieben (move) und der Admin zählen die Version ohne Bedingung hoch; eigene
+# Schreibpfade, die Clients mit If-Match bemerken sollen, rufen claim_version auf.
+#
+# Über HTTP: GET /api/tasks/<id>/ liefert die Version im Body und am Anfang des ETag
+# ("<version>-<fingerprint>"). PUT und PATCH nehmen diesen ETag oder nur "<version>"
+# in If-Match entgegen und antworten mit 412, wenn der Task eine andere Version hat.
+
+from django.db.models import F
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Task
+
+
+class VersionConflict(APIException):
+    # Außerhalb von DRF-Views (z. B. im Admin) wird daraus ein Fehler 500
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'Der Task wurde zwischenzeitlich geändert. Bitte neu laden.'
+    default_code = 'version_conflict'
+
+
+def claim_version(task):
+    """Zählt die Version hoch, falls der Task in der Datenbank noch task.version hat, sonst VersionConflict."""
+    if not Task.objects.filter(pk=task.pk, version=task.version).update(version=F('version') + 1):
+        raise VersionConflict()
+    task.version += 1
+
+
+def versioned_etag(version, etag):
+    """Stellt einem (gequoteten) ETag die Version voran."""
+    return f'"{version}-{etag.strip(chr(34))}"'
+
+
+def if_match_versions(header):
+    """
+    Versionen aus einem If-Match-Header. None ohne Header oder bei "*", sonst die Menge
+    der lesbaren Versionen (leer, wenn keine lesbar ist, das passt dann auf nichts).
+    """
+    if not header:
+        return None
+    etags = parse_etags(header)
+    if '*' in etags:
+        return None
+    versions = set()
+    for etag in etags:
+        version = etag.strip('"').partition('-')[0]
+        if version.isdigit():
+            versions.add(int(version))
+    return versions
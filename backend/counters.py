@@ -0,0 +1,137 @@
+# backend/counters.py
+#
+# Zähler für die Board-Übersicht: Tasks gesamt, je Status und offene dringende Tasks
+# (prio 'urgent', nicht 'done'). Sie werden bei jedem Anlegen, Ändern und Löschen eines
+# Tasks inkrementell angepasst (siehe backend/signals.py sowie die Schreibpfade ohne
+# Signale), damit die Übersicht unabhängig von der Anzahl der Tasks mit zwei kleinen
+# Queries auskommt: eine für die Zähler, eine für die nächste Deadline über den Teilindex.
+#
+# Die Signale rechnen mit dem Zustand, mit dem der Task geladen wurde. Wer ein veraltetes
+# Objekt speichert oder löscht, verfälscht die Zähler; `manage.py verify_board_counters --fix`
+# zählt dann neu.
+
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Case, Count, F, Value, When
+from django.utils import timezone
+
+from .models import BoardCounter, Task
+
+TOTAL = 'total'
+URGENT = 'urgent'
+
+
+def status_key(status):
+    return f'status:{status}'
+
+
+def all_keys():
+    return [TOTAL, URGENT] + [status_key(status) for status, _ in Task.STATUS_CHOICES]
+
+
+def task_keys(status, prio):
+    keys = [TOTAL, status_key(status)]
+    if prio == 'urgent' and status != 'done':
+        keys.append(URGENT)
+    return keys
+
+
+def deltas_for(old=None, new=None):
+    """Änderung der Zähler, wenn ein Task vom Zustand old (status, prio) in new übergeht."""
+    deltas = Counter()
+    if old:
+        deltas.subtract(task_keys(*old))
+    if new:
+        deltas.update(task_keys(*new))
+    return Counter({key: value for key, value in deltas.items() if value})
+
+
+def added(states):
+    """Änderung der Zähler für neu angelegte Tasks, z. B. nach bulk_create."""
+    deltas = Counter()
+    for state in states:
+        deltas.update(task_keys(*state))
+    return deltas
+
+
+def moved(queryset, status):
+    """Änderung der Zähler, bevor die Tasks aus queryset per UPDATE nach status verschoben werden."""
+    deltas = Counter()
+    rows = queryset.exclude(status=status).order_by().values_list('status', 'prio').annotate(count=Count('id'))
+    for old_status, prio, count in rows:
+        for key, value in deltas_for((old_status, prio), (status, prio)).items():
+            deltas[key] += value * count
+    return deltas
+
+
+def apply(deltas):
+    """Schreibt alle Änderungen mit einem einzigen UPDATE."""
+    deltas = {key: value for key, value in deltas.items() if value}
+    if not deltas:
+        return
+    BoardCounter.objects.filter(key__in=deltas).update(value=F('value') + Case(
+        *(When(key=key, then=Value(value)) for key, value in deltas.items()),
+        default=Value(0),
+    ))
+
+
+def recount():
+    """Zählt alle Zähler vollständig aus der Task-Tabelle nach."""
+    values = dict.fromkeys(all_keys(), 0)
+    for status, prio, count in Task.objects.order_by().values_list('status', 'prio').annotate(count=Count('id')):
+        for key in task_keys(status, prio):
+            values[key] += count
+    return values
+
+
+def stored():
+    return dict(BoardCounter.objects.filter(key__in=all_keys()).values_list('key', 'value'))
+
+
+def reset(values):
+    BoardCounter.objects.bulk_create(
+        [BoardCounter(key=key, value=value) for key, value in values.items()],
+        update_conflicts=True,
+        unique_fields=['key'],
+        update_fields=['value'],
+    )
+
+
+def upcoming_deadlines():
+    # Nutzt den Teilindex task_open_due_date_idx, der nur offene Tasks enthält
+    return (
+        Task.objects.filter(due_date__gte=timezone.localdate())
+        .exclude(status='done')
+        .order_by('due_date')
+        .values_list('due_date', flat=True)
+    )
+
+
+def upcoming_deadline():
+    return upcoming_deadlines().first()
+
+
+def summary():
+    """
+    Übersicht aus den Zählern plus die nächste Deadline (zusammen zwei Queries). Sind die
+    Zähler abgeschaltet (JOIN_BOARD_COUNTERS) oder fehlen sie, wird per Aggregat-Query
+    über die Task-Tabelle gezählt.
+    """
+    values, source = None, 'aggregate'
+    if getattr(settings, 'JOIN_BOARD_COUNTERS', True):
+        values = stored()
+        if len(values) == len(all_keys()):
+            source = 'counters'
+        else:
+            values = None
+    if values is None:
+        values = recount()
+
+    return {
+        'total': values[TOTAL],
+        'status': {status: values[status_key(status)] for status, _ in Task.STATUS_CHOICES},
+        'urgent': values[URGENT],
+        'upcoming_deadline': upcoming_deadline(),
+        'source': source,
+    }
@@ -0,0 +1,138 @@
+# backend/hashers.py
+#
+# Passwort-Hasher mit abgestimmten Parametern (Profile in join_backend/passwords.py),
+# die ihre Rechenarbeit an einen begrenzten Worker-Pool abgeben. hashlib gibt bei
+# pbkdf2_hmac und scrypt den GIL frei, argon2-cffi ebenso, die Worker rechnen also
+# parallel. Der Pool begrenzt, wie viele Hashes gleichzeitig laufen: Ein Ansturm von
+# Logins belegt dann höchstens JOIN_HASHING_WORKERS Kerne (und bei scrypt deren
+# Speicher), statt jeden Request-Thread des Servers.
+#
+# Das gilt für jedes Hashing über django.contrib.auth: Login, Registrierung,
+# set_password, das Nachrechnen auf neue Parameter und das Hashing für unbekannte
+# Benutzer in authenticate().
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+SETTINGS = ('JOIN_HASHING_WORKERS', 'JOIN_HASHING_QUEUE', 'JOIN_HASHING_TIMEOUT')
+
+
+class HashingBusy(APIException):
+    # Außerhalb von DRF-Views (z. B. im Admin-Login) wird daraus ein Fehler 500
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Zu viele Anmeldungen gleichzeitig. Bitte gleich noch einmal versuchen.'
+    default_code = 'hashing_busy'
+
+
+class HashingPool:
+    """
+    Höchstens `workers` Hashes laufen gleichzeitig, bis zu `queue` weitere warten auf
+    einen Worker. Wer darüber hinaus kommt, wartet bis zu `timeout` Sekunden auf einen
+    freien Platz und bekommt sonst HashingBusy. Ohne Angaben gelten die Settings.
+    """
+
+    def __init__(self, workers=None, queue=None, timeout=None):
+        self.options = {'workers': workers, 'queue': queue, 'timeout': timeout}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+
+    def _setup(self):
+        with self._lock:
+            if self._executor is None:
+                workers = self.options['workers'] or getattr(settings, 'JOIN_HASHING_WORKERS', None) or os.cpu_count() or 1
+                queue = self.options['queue']
+                if queue is None:
+                    queue = getattr(settings, 'JOIN_HASHING_QUEUE', 64)
+                timeout = self.options['timeout']
+                if timeout is None:
+                    timeout = getattr(settings, 'JOIN_HASHING_TIMEOUT', 10)
+                self._slots = threading.BoundedSemaphore(workers + queue)
+                self._workers = workers
+                self._timeout = timeout
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix='join-hashing', initializer=self._mark_worker,
+                )
+            return self._executor, self._slots, self._timeout
+
+    @property
+    def workers(self):
+        self._setup()
+        return self._workers
+
+    def _mark_worker(self):
+        self._local.worker = True
+
+    def run(self, func, *args):
+        # Aus einem Worker heraus (verify ruft encode auf) direkt rechnen, sonst droht ein Deadlock
+        if getattr(self._local, 'worker', False):
+            return func(*args)
+        executor, slots, timeout = self._setup()
+        if not slots.acquire(timeout=timeout):
+            raise HashingBusy()
+        try:
+            return executor.submit(func, *args).result()
+        finally:
+            slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+pool = HashingPool()
+
+
+@receiver(setting_changed)
+def reset_pool(*, setting, **kwargs):
+    if setting in SETTINGS:
+        pool.shutdown()
+
+
+class PooledHasherMixin:
+
+    def encode(self, password, salt, *args, **kwargs):
+        return pool.run(partial(super().encode, password, salt, *args, **kwargs))
+
+    def verify(self, password, encoded):
+        return pool.run(super().verify, password, encoded)
+
+    def harden_runtime(self, password, encoded):
+        return pool.run(super().harden_runtime, password, encoded)
+
+
+class ScryptPasswordHasher(PooledHasherMixin, hashers.ScryptPasswordHasher):
+    # OWASP-Minimum für n = 2**15: p = 3. Das ist mehr Arbeit (n * p) als Djangos
+    # n = 2**14 bei p = 5 und braucht 128 * r * n = 32 MiB je Hash, weil hashlib die p
+    # Durchläufe nacheinander im selben Speicher rechnet. Durchsatz kommt aus dem Pool
+    # und der Drosselung, nicht aus billigeren Hashes.
+    work_factor = 2**15
+    block_size = 8
+    parallelism = 3
+    maxmem = 64 * 1024 * 1024
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    # Argon2id mit 19 MiB und zwei Durchläufen statt Djangos 100 MiB bei Parallelität 8
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    pass
+
+
+class PBKDF2SHA1PasswordHasher(PooledHasherMixin, hashers.PBKDF2SHA1PasswordHasher):
+    pass
@@ -0,0 +1,71 @@
+# backend/maintenance.py
+#
+# Aufräumen für `python manage.py cleanup`: abgelaufene Sessions, Widerrufe abgelaufener
+# Tokens und verwaiste Benutzer. Gelöscht wird in kleinen Stapeln mit je eigener
+# Transaktion und einer kurzen Pause dazwischen. SQLite sperrt beim Schreiben die ganze
+# Datenbank, so kommen Requests zwischen zwei Stapeln zum Zug.
+#
+# Verwaiste Kontakte gibt es nicht: Kontakt.user löscht kaskadierend mit, und ein Kontakt
+# ohne Benutzer ist ein gewöhnlicher Eintrag im Adressbuch.
+
+import datetime
+import time
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+def expired_sessions():
+    return Session.objects.filter(expire_date__lt=timezone.now())
+
+
+def expired_revocations():
+    return RevokedToken.objects.filter(expires_at__lte=timezone.now())
+
+
+def orphan_users(grace):
+    """
+    Benutzer ohne Passwort und ohne Kontakt, z. B. nach dem Löschen eines Kontakts über
+    die API. Admins bleiben, ebenso Benutzer, die jünger als `grace` sind: Die
+    Registrierung legt Benutzer und Kontakt nacheinander an.
+    """
+    return User.objects.filter(
+        contact_profile__isnull=True,
+        password__startswith=UNUSABLE_PASSWORD_PREFIX,
+        is_staff=False,
+        is_superuser=False,
+        date_joined__lt=timezone.now() - grace,
+    )
+
+
+def delete_in_batches(queryset, batch_size=500, pause=0.05):
+    """Löscht alle Zeilen des Querysets stapelweise. Gibt die Anzahl gelöschter Zeilen zurück."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            model.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+def cleanup(batch_size=500, pause=0.05, grace=datetime.timedelta(days=1), dry_run=False):
+    """Räumt alles auf. Ergebnis: Anzahl gelöschter (bzw. mit dry_run betroffener) Zeilen je Art."""
+    targets = {
+        'sessions': expired_sessions(),
+        'revoked_tokens': expired_revocations(),
+        'orphan_users': orphan_users(grace),
+    }
+    if dry_run:
+        return {name: queryset.count() for name, queryset in targets.items()}
+    return {name: delete_in_batches(queryset, batch_size, pause) for name, queryset in targets.items()}
@@ -0,0 +1,59 @@
+import importlib
+import pkgutil
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend import benchmarks
+
+
+def load_scenarios():
+    for module in pkgutil.iter_modules(benchmarks.__path__):
+        importlib.import_module(f'{benchmarks.__name__}.{module.name}')
+    return benchmarks.SCENARIOS
+
+
+class Command(BaseCommand):
+    help = 'Führt ein Benchmark-Szenario auf einer eigenen Testdatenbank aus.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', help='Name des Szenarios, z. B. "asgi".')
+        parser.add_argument('--tasks', type=int, default=500, help='Anzahl der erzeugten Tasks.')
+        parser.add_argument('--contacts', type=int, default=50, help='Anzahl der erzeugten Kontakte.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests pro Messung.')
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[1, 8, 32],
+            help='Parallelitätsstufen für Lastmessungen.',
+        )
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+            help='Datenmengen (Anzahl Tasks) für Skalierungsmessungen.',
+        )
+        parser.add_argument('--json', dest='json_path', help='Ergebnis zusätzlich als JSON in diese Datei schreiben.')
+        parser.add_argument(
+            '--compare', dest='baseline_path',
+            help='Früheren JSON-Bericht (z. B. eines anderen Commits) als Vergleichsbasis verwenden.',
+        )
+
+    def handle(self, *args, **options):
+        scenarios = load_scenarios()
+        name = options.pop('scenario')
+        if name not in scenarios:
+            raise CommandError(f"Unbekanntes Szenario '{name}'. Verfügbar: {', '.join(sorted(scenarios))}")
+
+        json_path = options.pop('json_path')
+        baseline_path = options.pop('baseline_path')
+        baseline = benchmarks.read_report(baseline_path) if baseline_path else None
+        scenario_options = {key: options[key] for key in ('tasks', 'contacts', 'requests', 'concurrency', 'sizes')}
+        report = scenarios[name](**options)
+        report['meta'] = benchmarks.metadata(scenario_options)
+
+        for row in report['results']:
+            self.stdout.write('  '.join(f'{key}={value}' for key, value in row.items()))
+        if baseline is not None:
+            commit = baseline.get('meta', {}).get('commit') or baseline_path
+            self.stdout.write(f'\nVergleich mit {commit}:')
+            for row in benchmarks.compare(baseline, report):
+                self.stdout.write('  '.join(f'{key}={value}' for key, value in row.items()))
+        if json_path:
+            benchmarks.write_report(json_path, report)
+            self.stdout.write(self.style.SUCCESS(f'Ergebnis geschrieben nach {json_path}'))
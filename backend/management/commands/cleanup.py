@@ -0,0 +1,41 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend import maintenance
+
+
+class Command(BaseCommand):
+    help = (
+        'Löscht abgelaufene Sessions, Widerrufe abgelaufener Tokens und verwaiste Benutzer '
+        'in kleinen Stapeln. Mit --interval läuft der Befehl dauerhaft im Hintergrund.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Zeilen je Transaktion.')
+        parser.add_argument('--pause', type=float, default=0.05, help='Sekunden zwischen zwei Stapeln.')
+        parser.add_argument(
+            '--grace-hours', type=float, default=24,
+            help='Verwaiste Benutzer erst löschen, wenn sie älter als diese Zeit sind.',
+        )
+        parser.add_argument('--interval', type=float, help='Alle N Sekunden wiederholen, statt einmal zu laufen.')
+        parser.add_argument('--dry-run', action='store_true', help='Nur zählen, nichts löschen.')
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            result = maintenance.cleanup(
+                batch_size=options['batch_size'],
+                pause=options['pause'],
+                grace=datetime.timedelta(hours=options['grace_hours']),
+                dry_run=options['dry_run'],
+            )
+            verb = 'betroffen' if options['dry_run'] else 'gelöscht'
+            self.stdout.write(self.style.SUCCESS(
+                ', '.join(f'{name}: {count}' for name, count in result.items())
+                + f' {verb} in {time.perf_counter() - start:.2f}s.'
+            ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
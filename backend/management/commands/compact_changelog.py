@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from backend import changes
+
+
+class Command(BaseCommand):
+    help = 'Entfernt überholte Einträge aus dem Änderungsprotokoll der Delta-Synchronisation.'
+
+    def handle(self, *args, **options):
+        deleted = changes.compact()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} überholte Einträge entfernt.'))
@@ -0,0 +1,29 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend import transfer
+
+
+class Command(BaseCommand):
+    help = 'Exportiert Kontakte oder Tasks als NDJSON oder CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=transfer.KINDS)
+        parser.add_argument('--output', help='Zieldatei, ohne Angabe auf stdout.')
+        parser.add_argument('--format', dest='file_format', choices=transfer.FORMATS, help='Standard: aus der Dateiendung, sonst ndjson.')
+
+    def handle(self, *args, kind, output, file_format, **options):
+        if not file_format:
+            extension = output.rsplit('.', 1)[-1].lower() if output else 'ndjson'
+            file_format = extension if extension in transfer.FORMATS else None
+        if not file_format:
+            raise CommandError('Format nicht erkannt, bitte --format angeben.')
+
+        target = open(output, 'wb') if output else sys.stdout.buffer
+        try:
+            for block in transfer.export_stream(kind, file_format):
+                target.write(block)
+        finally:
+            if output:
+                target.close()
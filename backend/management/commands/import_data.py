@@ -0,0 +1,35 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend import search, transfer
+
+
+class Command(BaseCommand):
+    help = 'Importiert Kontakte oder Tasks aus einer NDJSON- oder CSV-Datei.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=transfer.KINDS)
+        parser.add_argument('path', help='Pfad zur Datei.')
+        parser.add_argument('--format', dest='file_format', choices=transfer.FORMATS, help='Standard: aus der Dateiendung.')
+        parser.add_argument('--batch-size', type=int, default=transfer.BATCH_SIZE)
+
+    def handle(self, *args, kind, path, file_format, batch_size, **options):
+        file_format = file_format or path.rsplit('.', 1)[-1].lower()
+        if file_format not in transfer.FORMATS:
+            raise CommandError('Format nicht erkannt, bitte --format angeben.')
+
+        start = time.perf_counter()
+        with open(path, encoding='utf-8-sig', newline='') as source:
+            result = transfer.import_rows(source, kind, file_format, batch_size)
+        if result.created:
+            search.optimize_fts(connection)
+        elapsed = time.perf_counter() - start
+
+        for error in result.as_dict()['errors']:
+            self.stderr.write(f"Zeile {error['line']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.created} angelegt, {result.failed} fehlerhaft in {elapsed:.2f}s.'
+        ))
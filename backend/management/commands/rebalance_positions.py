@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from backend import positions
+from backend.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        'Nummeriert Status-Spalten neu durch, deren Karten nach vielen Verschiebungen zu eng '
+        'beieinander liegen. Gedacht als regelmäßiger Job, z. B. nächtlich.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status', action='append', choices=[value for value, _ in Task.STATUS_CHOICES],
+            help='Nur diese Spalte prüfen (mehrfach möglich).',
+        )
+        parser.add_argument('--all', action='store_true', help='Auch Spalten mit ausreichenden Lücken neu nummerieren.')
+
+    def handle(self, *args, **options):
+        statuses = options['status'] or [value for value, _ in Task.STATUS_CHOICES]
+        for status in statuses:
+            gap = positions.smallest_gap(status)
+            if not options['all'] and (gap is None or gap >= positions.REBALANCE_GAP):
+                self.stdout.write(f'{status}: unverändert.')
+                continue
+            changed = positions.rebalance(status)
+            self.stdout.write(self.style.SUCCESS(f'{status}: {changed} Tasks neu nummeriert.'))
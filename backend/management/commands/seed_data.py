@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from backend import changes
+from backend.benchmarks.data import seed
+
+
+class Command(BaseCommand):
+    help = 'Erzeugt reproduzierbare Testdaten: Kontakte, Tasks mit Subtasks und Zuordnungen.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contacts', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=1000)
+        parser.add_argument('--subtasks', type=int, default=3, help='Subtasks je Task.')
+        parser.add_argument('--assignees', type=int, default=2, help='Zugeordnete Kontakte je Task.')
+        parser.add_argument('--seed', type=int, default=1, help='Startwert des Zufallsgenerators.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--force', action='store_true', help='Auch mit DEBUG = False ausführen.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('DEBUG ist aus. Testdaten nur mit --force in diese Datenbank schreiben.')
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            created = seed(
+                contacts=options['contacts'],
+                tasks=options['tasks'],
+                subtasks_per_task=options['subtasks'],
+                assignees_per_task=options['assignees'],
+                random_seed=options['seed'],
+                batch_size=options['batch_size'],
+            )
+            # Ohne Protokolleinträge je id: Caches und ETags werden ungültig, Clients der
+            # Delta-Synchronisation sehen die neuen Daten erst mit einer vollständigen Synchronisation
+            for table in ('contacts', 'task', 'subtask'):
+                changes.record_change(table)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{created['contacts']} Kontakte, {created['tasks']} Tasks, {created['subtasks']} Subtasks "
+            f"und {created['assignees']} Zuordnungen in {elapsed:.2f}s angelegt."
+        ))
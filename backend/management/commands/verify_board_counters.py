@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from backend import counters
+
+
+class Command(BaseCommand):
+    help = 'Vergleicht die Zähler der Board-Übersicht mit einer vollständigen Zählung und korrigiert sie auf Wunsch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Abweichende oder fehlende Zähler überschreiben.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = counters.recount()
+            stored = counters.stored()
+            mismatches = {key: value for key, value in expected.items() if stored.get(key) != value}
+            for key, value in mismatches.items():
+                self.stdout.write(f'{key}: gespeichert {stored.get(key)}, gezählt {value}')
+            if mismatches and options['fix']:
+                counters.reset(expected)
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('Alle Zähler stimmen.'))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f'{len(mismatches)} Zähler korrigiert.'))
+        else:
+            raise CommandError(f'{len(mismatches)} Zähler weichen ab, mit --fix korrigieren.')
@@ -0,0 +1,206 @@
+# backend/metrics.py
+#
+# Request-Metriken je Route (URL-Name) und Methode: Antwortzeit, Anzahl und Dauer der
+# Datenbank-Queries sowie Größe der Antwort. Je Route bleiben die letzten
+# JOIN_METRICS_WINDOW Werte im Speicher, daraus entstehen beim Abruf die Perzentile.
+# Summen und Zähler laufen dagegen seit dem Start des Prozesses. Der Abruf liefert das
+# Prometheus-Textformat (GET /api/metrics/, nur für Admins).
+#
+# Die Werte gelten pro Prozess. Bei mehreren Workern fragt Prometheus jeden einzeln ab.
+# Unter ASGI laufen die Queries in Worker-Threads. Dort zählt count_queries mit, das auf
+# jeder Verbindung sitzt und den QueryCounter des Requests aus einer ContextVar holt.
+# Bei gestreamten Antworten stehen Größe und Dauer erst am Ende des Streams fest.
+
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Kennzahl -> (Name in Prometheus, Beschreibung)
+SERIES = {
+    'duration': ('join_http_request_duration_seconds', 'Antwortzeit je Request in Sekunden.'),
+    'queries': ('join_db_queries', 'Datenbank-Queries je Request.'),
+    'db_time': ('join_db_query_duration_seconds', 'Zeit in Datenbank-Queries je Request in Sekunden.'),
+    'size': ('join_http_response_bytes', 'Größe der Antwort in Bytes.'),
+}
+
+
+class QueryCounter:
+    """execute_wrapper, der Anzahl und Dauer der Queries aufsummiert."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+# QueryCounter des laufenden async Requests, sync_to_async reicht ihn an die Threads weiter
+_counter = ContextVar('join_metrics_counter', default=None)
+
+
+def count_queries(execute, sql, params, many, context):
+    counter = _counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+def install(connection):
+    """Hängt count_queries an eine Verbindung (über connection_created, siehe signals.py)."""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+class EndpointStats:
+
+    def __init__(self, window):
+        self.samples = {name: deque(maxlen=window) for name in SERIES}
+        self.sums = dict.fromkeys(SERIES, 0.0)
+        self.count = 0
+        self.statuses = Counter()
+
+
+def quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+
+    def __init__(self, window=None):
+        self.window = window
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, route, method, status, **values):
+        with self._lock:
+            stats = self._endpoints.get((route, method))
+            if stats is None:
+                window = self.window or getattr(settings, 'JOIN_METRICS_WINDOW', 1024)
+                stats = self._endpoints[(route, method)] = EndpointStats(window)
+            stats.count += 1
+            stats.statuses[f'{status // 100}xx'] += 1
+            for name, value in values.items():
+                stats.samples[name].append(value)
+                stats.sums[name] += value
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                (route, method, stats.count, dict(stats.statuses), stats.sums.copy(),
+                 {name: sorted(samples) for name, samples in stats.samples.items()})
+                for (route, method), stats in sorted(self._endpoints.items())
+            ]
+
+    def render(self):
+        """Alle Metriken im Prometheus-Textformat (Version 0.0.4)."""
+        endpoints = self.snapshot()
+        lines = [
+            '# HELP join_http_requests_total Anzahl der Requests je Route, Methode und Statusklasse.',
+            '# TYPE join_http_requests_total counter',
+        ]
+        for route, method, _, statuses, _, _ in endpoints:
+            for status, count in sorted(statuses.items()):
+                lines.append(
+                    f'join_http_requests_total{{route="{escape(route)}",method="{method}",status="{status}"}} {count}'
+                )
+        for name, (metric, description) in SERIES.items():
+            lines += [f'# HELP {metric} {description}', f'# TYPE {metric} summary']
+            for route, method, count, _, sums, samples in endpoints:
+                labels = f'route="{escape(route)}",method="{method}"'
+                if samples[name]:
+                    for q in QUANTILES:
+                        lines.append(f'{metric}{{{labels},quantile="{q}"}} {quantile(samples[name], q):g}')
+                lines.append(f'{metric}_sum{{{labels}}} {sums[name]:g}')
+                lines.append(f'{metric}_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Misst jeden Request; mit JOIN_METRICS_ENABLED = False wird sie gar nicht geladen."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'JOIN_METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        return self.finish(request, response, counter, start)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        token = _counter.set(counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _counter.reset(token)
+        return self.finish(request, response, counter, start)
+
+    def finish(self, request, response, counter, start):
+        match = request.resolver_match
+        route = match.view_name if match else 'unmatched'
+
+        def record(size):
+            registry.record(
+                route, request.method, response.status_code,
+                duration=time.perf_counter() - start, queries=counter.count, db_time=counter.seconds, size=size,
+            )
+
+        if not response.streaming:
+            record(len(response.content))
+        elif not response.is_async:
+            response.streaming_content = self.measure_stream(response.streaming_content, counter, record)
+        else:
+            record(0)
+        return response
+
+    def measure_stream(self, content, counter, record):
+        size = 0
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            record(size)
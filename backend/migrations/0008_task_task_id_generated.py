@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:20
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import F
+
+
+def restore_task_ids(apps, schema_editor):
+    Task = apps.get_model('backend', 'Task')
+    Task.objects.using(schema_editor.connection.alias).update(task_id=F('id'))
+
+
+class Migration(migrations.Migration):
+    """
+    Ersetzt das per post_save nachgetragene task_id durch eine von der Datenbank
+    berechnete Spalte. Beim Neuaufbau der Spalte wird task_id für alle bestehenden
+    Zeilen aus der id befüllt, auch für Tasks, die per bulk_create ohne task_id
+    angelegt wurden. Beim Zurückrollen wird die alte Spalte wieder aus der id befüllt.
+    """
+
+    dependencies = [
+        ('backend', '0007_task_contacts_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_task_ids),
+        migrations.RemoveField(
+            model_name='task',
+            name='task_id',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='task_id',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.F('id'), output_field=models.BigIntegerField(), unique=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_markers(apps, schema_editor):
+    ChangeMarker = apps.get_model('backend', 'ChangeMarker')
+    ChangeMarker.objects.using(schema_editor.connection.alias).bulk_create(
+        [ChangeMarker(table=table) for table in ('task', 'subtask', 'contacts')],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0008_task_task_id_generated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeMarker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(choices=[('task', 'Tasks'), ('subtask', 'Subtasks'), ('contacts', 'Contacts')], max_length=50, unique=True)),
+                ('revision', models.BigIntegerField(default=0)),
+                ('modified_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'Change markers',
+            },
+        ),
+        migrations.RunPython(create_markers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0009_changemarker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(choices=[('task', 'Tasks'), ('subtask', 'Subtasks'), ('contacts', 'Contacts')], max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name_plural': 'Change log entries',
+                'indexes': [models.Index(fields=['table', 'object_id', 'id'], name='changelog_object_idx')],
+            },
+        ),
+    ]
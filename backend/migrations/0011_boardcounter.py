@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:18
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_counters(apps, schema_editor):
+    Task = apps.get_model('backend', 'Task')
+    BoardCounter = apps.get_model('backend', 'BoardCounter')
+    values = {'total': 0, 'urgent': 0}
+    for status, _ in Task._meta.get_field('status').choices:
+        values[f'status:{status}'] = 0
+    for status, prio, count in Task.objects.order_by().values_list('status', 'prio').annotate(count=Count('id')):
+        values['total'] += count
+        values[f'status:{status}'] += count
+        if prio == 'urgent':
+            values['urgent'] += count
+    BoardCounter.objects.bulk_create([BoardCounter(key=key, value=value) for key, value in values.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0010_changelogentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Board counters',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
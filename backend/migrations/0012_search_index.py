@@ -0,0 +1,116 @@
+from django.db import DatabaseError, migrations
+
+# FTS5-Index in dem Stand dieser Migration. Das SQL steht bewusst hier und nicht in
+# backend.search: Spätere Änderungen dort dürfen diese Migration nicht verändern.
+# install_fts (post_migrate) repariert danach nur noch verlorene Trigger.
+TABLES = ('backend_task_fts', 'backend_subtask_fts', 'backend_contacts_fts')
+
+INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS backend_task_fts USING fts5(
+        title, description, content='backend_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_task_fts_insert AFTER INSERT ON backend_task BEGIN
+        INSERT INTO backend_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_task_fts_delete AFTER DELETE ON backend_task BEGIN
+        INSERT INTO backend_task_fts(backend_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_task_fts_update AFTER UPDATE OF title, description ON backend_task BEGIN
+        INSERT INTO backend_task_fts(backend_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO backend_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS backend_subtask_fts USING fts5(
+        subtasktext, content='backend_subtask', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_subtask_fts_insert AFTER INSERT ON backend_subtask BEGIN
+        INSERT INTO backend_subtask_fts(rowid, subtasktext) VALUES (new.id, new.subtasktext);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_subtask_fts_delete AFTER DELETE ON backend_subtask BEGIN
+        INSERT INTO backend_subtask_fts(backend_subtask_fts, rowid, subtasktext)
+        VALUES ('delete', old.id, old.subtasktext);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_subtask_fts_update AFTER UPDATE OF subtasktext ON backend_subtask BEGIN
+        INSERT INTO backend_subtask_fts(backend_subtask_fts, rowid, subtasktext)
+        VALUES ('delete', old.id, old.subtasktext);
+        INSERT INTO backend_subtask_fts(rowid, subtasktext) VALUES (new.id, new.subtasktext);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS backend_contacts_fts USING fts5(
+        name, email, content='backend_contacts', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_contacts_fts_insert AFTER INSERT ON backend_contacts BEGIN
+        INSERT INTO backend_contacts_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_contacts_fts_delete AFTER DELETE ON backend_contacts BEGIN
+        INSERT INTO backend_contacts_fts(backend_contacts_fts, rowid, name, email)
+        VALUES ('delete', old.id, old.name, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS backend_contacts_fts_update AFTER UPDATE OF name, email ON backend_contacts BEGIN
+        INSERT INTO backend_contacts_fts(backend_contacts_fts, rowid, name, email)
+        VALUES ('delete', old.id, old.name, old.email);
+        INSERT INTO backend_contacts_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+]
+
+
+def install(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            for statement in INSTALL:
+                cursor.execute(statement)
+        except DatabaseError:
+            # SQLite ohne FTS5-Modul: es bleibt bei der icontains-Suche
+            return
+        for table in TABLES:
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def uninstall(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            for suffix in ('insert', 'delete', 'update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {table}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0011_boardcounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:40
+
+from django.db import migrations, models
+
+STEP = 1024.0
+
+
+def number_columns(apps, schema_editor):
+    # Bestehende Tasks behalten je Spalte die bisherige Reihenfolge (nach id)
+    Task = apps.get_model('backend', 'Task')
+    for status, _ in Task._meta.get_field('status').choices:
+        tasks = list(Task.objects.filter(status=status).order_by('id').only('id'))
+        for index, task in enumerate(tasks, start=1):
+            task.position = index * STEP
+        Task.objects.bulk_update(tasks, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0014_revoked_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='position',
+            field=models.FloatField(default=0.0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(number_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'position', 'id'], name='task_status_position_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:30
+
+from django.db import migrations
+
+
+def recount_urgent(apps, schema_editor):
+    # 'urgent' zählt ab jetzt nur noch offene dringende Tasks
+    Task = apps.get_model('backend', 'Task')
+    BoardCounter = apps.get_model('backend', 'BoardCounter')
+    BoardCounter.objects.filter(key='urgent').update(
+        value=Task.objects.filter(prio='urgent').exclude(status='done').count()
+    )
+
+
+def recount_all_urgent(apps, schema_editor):
+    Task = apps.get_model('backend', 'Task')
+    BoardCounter = apps.get_model('backend', 'BoardCounter')
+    BoardCounter.objects.filter(key='urgent').update(value=Task.objects.filter(prio='urgent').count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0016_task_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(recount_urgent, recount_all_urgent),
+    ]
@@ -1,9 +1,9 @@
 # models.py
 
 from django.db import models
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 # contacts
 class Contacts(models.Model):
@@ -19,6 +19,11 @@ class Contacts(models.Model):
     
     class Meta:
         verbose_name_plural = "Contacts"
+        indexes = [
+            models.Index(fields=['name', 'id'], name='contacts_name_id_idx'),
+            # E-Mail-Abgleich ohne Groß-/Kleinschreibung (Registrierung)
+            models.Index(Lower('email'), name='contacts_email_lower_idx'),
+        ]
     
     @property
     def is_registered_user(self):
@@ -40,9 +45,41 @@ class Subtask(models.Model):
     class Meta:
         verbose_name_plural = "Subtasks"
 
+class TaskQuerySet(models.QuerySet):
+
+    def with_relations(self):
+        """
+        Lädt Subtasks und Assignees gesammelt nach, in fester Reihenfolge nach id,
+        so wie sie auch der schnelle Lesepfad in backend.api.fast ausliefert.
+        """
+        return self.prefetch_related(
+            models.Prefetch('subtasks', queryset=Subtask.objects.order_by('id')),
+            models.Prefetch('assignee_infos', queryset=Contacts.objects.order_by('id')),
+        )
+
+    def board_order(self):
+        """Spalte für Spalte in der Reihenfolge des Boards (Index task_status_position_idx)."""
+        return self.order_by('status', 'position', 'id')
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create löst kein pre_save aus; Tasks ohne Position kommen ans Ende ihrer Spalte
+        from .positions import append
+
+        objs = list(objs)
+        append([task for task in objs if task.position is None])
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 # Tasks
 class Task(models.Model):
-    task_id = models.IntegerField(unique=True, null=True, blank=True)
+    # Wird von der Datenbank beim INSERT aus der id berechnet, dadurch kostet das
+    # Anlegen eines Tasks (auch per bulk_create) genau ein Statement.
+    task_id = models.GeneratedField(
+        expression=models.F('id'),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+        unique=True,
+    )
     category = models.CharField(max_length=100)
     description = models.TextField()
     due_date = models.DateField()
@@ -61,7 +98,11 @@ class Task(models.Model):
         ('done', 'Done'),
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='toDos')
-    
+    # Reihenfolge innerhalb der Status-Spalte, vergeben in backend/positions.py
+    position = models.FloatField(editable=False)
+    # Wird bei jeder Änderung über API und Admin hochgezählt, siehe backend/concurrency.py
+    version = models.PositiveIntegerField(default=1, editable=False)
+
     title = models.CharField(max_length=255)
 
     assignee_infos = models.ManyToManyField(
@@ -70,14 +111,87 @@ class Task(models.Model):
         blank=True 
     )
 
+    objects = TaskQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
     class Meta:
         verbose_name_plural = "Tasks"
+        # Passend zur Keyset-Pagination (due_date, id) und den Filtern der Task-Liste
+        indexes = [
+            models.Index(fields=['due_date', 'id'], name='task_due_date_id_idx'),
+            models.Index(fields=['status', 'due_date', 'id'], name='task_status_due_date_idx'),
+            # Board-Reihenfolge der Task-Liste und Nachbarn beim Verschieben
+            models.Index(fields=['status', 'position', 'id'], name='task_status_position_idx'),
+            models.Index(fields=['prio', 'due_date', 'id'], name='task_prio_due_date_idx'),
+            models.Index(fields=['category', 'due_date', 'id'], name='task_category_due_date_idx'),
+            # Nächste Deadline offener Tasks (Board-Übersicht), erledigte Tasks bleiben draußen
+            models.Index(fields=['due_date'], condition=~models.Q(status='done'), name='task_open_due_date_idx'),
+        ]
+
+# Änderungsmarker pro Tabelle, Grundlage für ETag und Last-Modified der API
+class ChangeMarker(models.Model):
+    TABLE_CHOICES = [
+        ('task', 'Tasks'),
+        ('subtask', 'Subtasks'),
+        ('contacts', 'Contacts'),
+    ]
+    table = models.CharField(max_length=50, choices=TABLE_CHOICES, unique=True)
+    revision = models.BigIntegerField(default=0)
+    modified_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f'{self.table}@{self.revision}'
+
+    class Meta:
+        verbose_name_plural = "Change markers"
+
+    @classmethod
+    def bump(cls, *tables):
+        now = timezone.now()
+        updated = cls.objects.filter(table__in=tables).update(revision=models.F('revision') + 1, modified_at=now)
+        if updated < len(tables):
+            for table in tables:
+                cls.objects.get_or_create(table=table, defaults={'revision': 1, 'modified_at': now})
 
-@receiver(post_save, sender=Task)
-def set_task_id(instance, created):
-    if created and instance.task_id is None:
-        instance.task_id = instance.id
-        instance.save(update_fields=['task_id'])
\ No newline at end of file
+
+# Änderungsprotokoll für die Delta-Synchronisation. Die id ist die Revision: jede
+# Änderung und jedes Löschen (deleted=True, Tombstone) bekommt einen neuen Eintrag.
+class ChangeLogEntry(models.Model):
+    table = models.CharField(max_length=50, choices=ChangeMarker.TABLE_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f'{self.id}: {self.table} {self.object_id}'
+
+    class Meta:
+        verbose_name_plural = "Change log entries"
+        indexes = [
+            models.Index(fields=['table', 'object_id', 'id'], name='changelog_object_idx'),
+        ]
+
+
+# Zähler für die Board-Übersicht (Summary), gepflegt in backend/counters.py
+class BoardCounter(models.Model):
+    key = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.key}={self.value}'
+
+    class Meta:
+        verbose_name_plural = "Board counters"
+
+
+# Widerrufene Tokens (backend/tokens.py). Einträge werden nach Ablauf des Tokens überflüssig
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+    class Meta:
+        verbose_name_plural = "Revoked tokens"
@@ -0,0 +1,136 @@
+# backend/positions.py
+#
+# Reihenfolge der Karten innerhalb einer Status-Spalte (Task.position). Die Positionen
+# sind Gleitkommazahlen mit Lücken: Neue Karten kommen im Abstand STEP ans Ende der
+# Spalte, eine verschobene Karte bekommt die Mitte zwischen ihren neuen Nachbarn.
+# Verschieben schreibt dadurch nur die verschobenen Zeilen, unabhängig von der Länge
+# der Spalte.
+#
+# Nach vielen Verschiebungen an dieselbe Stelle wird die Lücke zu klein. Dann nummeriert
+# rebalance die Spalte neu durch (i * STEP): sofort beim Verschieben, wenn keine Lücke
+# mehr bleibt, und vorher schon über `manage.py rebalance_positions` als regelmäßiger Job.
+#
+# Gleiche Positionen sind erlaubt (z. B. zwei gleichzeitige Verschiebungen an dieselbe
+# Stelle), die Reihenfolge entscheidet dann die id.
+
+from django.db.models import Max
+
+from .changes import record_change
+from .models import Task
+
+STEP = 1024.0
+# Darunter ist keine sinnvolle Mitte mehr möglich, die Spalte wird sofort neu nummeriert
+MIN_GAP = 1e-9
+# Darunter nummeriert der regelmäßige Job die Spalte neu, lange bevor MIN_GAP erreicht ist
+REBALANCE_GAP = STEP / 2**20
+
+
+def column(status, exclude=()):
+    return Task.objects.filter(status=status).exclude(id__in=exclude)
+
+
+def last_position(status, exclude=()):
+    return column(status, exclude).order_by('-position', '-id').values_list('position', flat=True).first()
+
+
+def next_position(status):
+    last = last_position(status)
+    return STEP if last is None else last + STEP
+
+
+def append(tasks):
+    """Setzt die Positionen noch nicht gespeicherter Tasks (bulk_create) ans Ende ihrer Spalte."""
+    if not tasks:
+        return
+    statuses = {task.status for task in tasks}
+    last = dict(
+        Task.objects.filter(status__in=statuses).order_by().values_list('status').annotate(last=Max('position'))
+    )
+    for task in tasks:
+        last[task.status] = (last.get(task.status) or 0.0) + STEP
+        task.position = last[task.status]
+
+
+def place(ids, status, after=None, before=None):
+    """
+    Positionen für die Tasks `ids` (in dieser Reihenfolge) in der Spalte `status`:
+    direkt hinter `after` bzw. vor `before` (Task-ids), ohne beide am Ende der Spalte.
+    Die Tasks selbst zählen dabei nicht als Nachbarn. Wirft ValueError, wenn ein
+    Nachbar nicht in der Spalte steht.
+    """
+    neighbours = [task_id for task_id in (after, before) if task_id is not None]
+    if set(neighbours) & set(ids):
+        raise ValueError('Eine Karte kann nicht neben sich selbst verschoben werden.')
+    known = dict(column(status).filter(id__in=neighbours).values_list('id', 'position'))
+    missing = [task_id for task_id in neighbours if task_id not in known]
+    if missing:
+        raise ValueError(f"Nicht in der Spalte {status}: {', '.join(map(str, missing))}.")
+
+    lower = known[after] if after is not None else None
+    upper = known[before] if before is not None else None
+    if after is not None and before is None:
+        upper = first_position_above(status, lower, ids)
+    elif before is not None and after is None:
+        lower = last_position_below(status, upper, ids)
+    elif after is None and before is None:
+        lower = last_position(status, ids)
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError('after muss in der Spalte vor before stehen.')
+
+    positions = spread(lower, upper, len(ids))
+    if positions is None:
+        rebalance(status)
+        return place(ids, status, after, before)
+    return dict(zip(ids, positions))
+
+
+def first_position_above(status, position, exclude):
+    return (
+        column(status, exclude).filter(position__gt=position)
+        .order_by('position', 'id').values_list('position', flat=True).first()
+    )
+
+
+def last_position_below(status, position, exclude):
+    return (
+        column(status, exclude).filter(position__lt=position)
+        .order_by('-position', '-id').values_list('position', flat=True).first()
+    )
+
+
+def spread(lower, upper, count):
+    """count Positionen zwischen lower und upper (je None = offen), None wenn die Lücke nicht reicht."""
+    if upper is None:
+        start = lower if lower is not None else 0.0
+        return [start + STEP * (i + 1) for i in range(count)]
+    if lower is None:
+        return [upper - STEP * (count - i) for i in range(count)]
+    gap = (upper - lower) / (count + 1)
+    if gap < MIN_GAP:
+        return None
+    return [lower + gap * (i + 1) for i in range(count)]
+
+
+def smallest_gap(status):
+    """Kleinster Abstand zweier benachbarter Karten der Spalte (None bei weniger als zwei)."""
+    smallest, previous = None, None
+    for position in column(status).order_by('position', 'id').values_list('position', flat=True).iterator():
+        if previous is not None and (smallest is None or position - previous < smallest):
+            smallest = position - previous
+        previous = position
+    return smallest
+
+
+def rebalance(status, batch_size=500):
+    """Nummeriert die Spalte in bestehender Reihenfolge mit Abstand STEP neu. Gibt die Anzahl zurück."""
+    tasks = list(column(status).order_by('position', 'id').only('id', 'position'))
+    changed = []
+    for index, task in enumerate(tasks, start=1):
+        if task.position != index * STEP:
+            task.position = index * STEP
+            changed.append(task)
+    # bulk_update löst keine Signale aus; Clients brauchen die neuen Positionen trotzdem
+    Task.objects.bulk_update(changed, ['position'], batch_size=batch_size)
+    if changed:
+        record_change('task', [task.id for task in changed])
+    return len(changed)
@@ -0,0 +1,156 @@
+# backend/realtime.py
+
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+BOARD_PATH = '/ws/board/'
+
+
+class Subscription:
+    """Empfangsseite eines Brokers für genau einen verbundenen Client."""
+
+    async def get(self):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+class Broker:
+    """
+    Schnittstelle für die Verteilung von Änderungsereignissen an WebSocket-Clients.
+
+    `publish` wird synchron aus den Schreibpfaden aufgerufen (auch aus Worker-Threads),
+    `subscribe` aus der Event-Loop des ASGI-Servers. Für mehrere Worker-Prozesse wird
+    eine Implementierung mit externem Broker (z. B. Redis Pub/Sub) eingetragen.
+    """
+
+    def publish(self, event):
+        raise NotImplementedError
+
+    def subscribe(self):
+        raise NotImplementedError
+
+
+class InMemorySubscription(Subscription):
+
+    def __init__(self, broker, loop, max_queue_size):
+        self.broker = broker
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def deliver(self, event):
+        # Läuft in der Event-Loop. Kommt ein Client nicht hinterher, werden seine
+        # ausstehenden Ereignisse verworfen und er wird zur Delta-Synchronisation aufgefordert.
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'type': 'resync'})
+        else:
+            self.queue.put_nowait(event)
+
+
+class InMemoryBroker(Broker):
+    """Verteilt Ereignisse innerhalb eines Prozesses, für Entwicklung, Tests und einen Worker."""
+
+    max_queue_size = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def publish(self, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Event-Loop bereits geschlossen
+                self.unsubscribe(subscription)
+
+    def subscribe(self):
+        subscription = InMemorySubscription(self, asyncio.get_running_loop(), self.max_queue_size)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'JOIN_REALTIME_BROKER', 'backend.realtime.InMemoryBroker')
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish_change(table, ids, deleted, revision):
+    get_broker().publish({
+        'type': 'change',
+        'table': table,
+        'ids': list(ids),
+        'deleted': deleted,
+        'revision': revision,
+    })
+
+
+def is_allowed_origin(scope):
+    allowed = getattr(settings, 'JOIN_WEBSOCKET_ALLOWED_ORIGINS', None)
+    if allowed is None:
+        allowed = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+    origin = dict(scope.get('headers', [])).get(b'origin')
+    return origin is None or origin.decode('latin1') in allowed
+
+
+async def board_websocket(scope, receive, send):
+    """
+    ASGI-Anwendung für `/ws/board/`: schickt jedem verbundenen Client die Änderungen an
+    Tasks, Subtasks und Kontakten als JSON. Der Client lädt die betroffenen Objekte
+    anschließend über `/api/sync/?since=<revision>` nach.
+    """
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    if scope['path'] != BOARD_PATH or not is_allowed_origin(scope):
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+
+    subscription = get_broker().subscribe()
+    await send({'type': 'websocket.accept'})
+
+    receive_task = asyncio.ensure_future(receive())
+    event_task = asyncio.ensure_future(subscription.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({receive_task, event_task}, return_when=asyncio.FIRST_COMPLETED)
+            if receive_task in done:
+                if receive_task.result()['type'] == 'websocket.disconnect':
+                    break
+                receive_task = asyncio.ensure_future(receive())
+            if event_task in done:
+                await send({'type': 'websocket.send', 'text': json.dumps(event_task.result())})
+                event_task = asyncio.ensure_future(subscription.get())
+    finally:
+        receive_task.cancel()
+        event_task.cancel()
+        subscription.close()
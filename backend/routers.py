@@ -0,0 +1,103 @@
+# backend/routers.py
+#
+# Lesezugriffe auf Lesereplikate verteilen (JOIN_REPLICA_DATABASES). Nur lesende Requests
+# (GET, HEAD, OPTIONS) lesen von einem Replikat. Schreibende Requests sowie alle Lesezugriffe
+# nach dem ersten Schreibzugriff im selben Request bleiben auf "default". Nach einem
+# Schreibzugriff setzt die Middleware außerdem ein Cookie. Solange es gilt
+# (JOIN_REPLICA_STICKY_SECONDS), liest der Client weiter von "default" und sieht seine
+# eigenen Änderungen auch dann, wenn die Replikate noch nicht nachgezogen haben.
+#
+# Außerhalb von Requests (Management-Commands, Shell, Tests ohne Client) liest alles von
+# "default". Gestreamte Antworten lesen nach dem Ende der Middleware ebenfalls von dort.
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+STICKY_COOKIE = 'join_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_routing = ContextVar('join_replica_routing', default=None)
+
+
+def replicas():
+    return getattr(settings, 'JOIN_REPLICA_DATABASES', [])
+
+
+def reads_from_primary():
+    """Ob Lesezugriffe im aktuellen Kontext von "default" kommen (und nicht von einem Replikat)."""
+    state = _routing.get()
+    return state is None or state['primary'] or not replicas()
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if reads_from_primary():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas())
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state['primary'] = state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikate enthalten dieselben Daten wie "default"
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replicas()
+
+
+class ReplicaRoutingMiddleware:
+    # Unter ASGI bleibt die Kette async; der Zustand liegt in einer ContextVar und
+    # wandert mit sync_to_async in die Threads der synchronen Views
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.initial_state(request)
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        state = self.initial_state(request)
+        token = _routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(response, state)
+
+    def initial_state(self, request):
+        return {
+            'primary': request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES,
+            'wrote': False,
+        }
+
+    def finish(self, response, state):
+        if state['wrote'] and replicas():
+            response.set_cookie(
+                STICKY_COOKIE, '1',
+                max_age=getattr(settings, 'JOIN_REPLICA_STICKY_SECONDS', 10),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
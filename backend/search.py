@@ -0,0 +1,180 @@
+# backend/search.py
+#
+# Volltextsuche über Tasks, Subtasks und Kontakte. Welches Backend sucht, bestimmt die
+# Einstellung JOIN_SEARCH_BACKEND. Ohne Angabe wird unter SQLite der FTS5-Index verwendet,
+# bei anderen Datenbanken eine einfache icontains-Suche.
+#
+# Der FTS5-Index besteht aus je einer virtuellen Tabelle mit externem Inhalt pro Model. Trigger
+# halten ihn aktuell, damit sind auch bulk_create und queryset.update erfasst. Angelegt wird
+# der Index von Migration 0012. Baut eine spätere Migration eine Tabelle unter SQLite neu auf,
+# gehen deren Trigger verloren. install_fts läuft deshalb nach jeder Migration, legt fehlende
+# Trigger neu an und baut den Index dann neu auf.
+
+import re
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Contacts, Subtask, Task
+
+SearchIndex = namedtuple('SearchIndex', ['model', 'fields', 'weights'])
+
+# Gewichte für bm25: Treffer im Titel bzw. Namen zählen mehr als in der Beschreibung
+INDEXES = {
+    'tasks': SearchIndex(Task, ('title', 'description'), (10.0, 1.0)),
+    'subtasks': SearchIndex(Subtask, ('subtasktext',), (1.0,)),
+    'contacts': SearchIndex(Contacts, ('name', 'email'), (10.0, 5.0)),
+}
+
+MAX_TERMS = 10
+
+
+def search_terms(query):
+    """Zerlegt die Eingabe in Wörter; Satz- und Sonderzeichen werden ignoriert."""
+    return re.findall(r'\w+', query)[:MAX_TERMS]
+
+
+def fts_table(index):
+    return f'{index.model._meta.db_table}_fts'
+
+
+def fts_statements(index):
+    """Virtuelle Tabelle und Trigger für einen Index, jeweils idempotent."""
+    source, table = index.model._meta.db_table, fts_table(index)
+    columns = ', '.join(index.fields)
+    new_values = ', '.join(f'new.{field}' for field in index.fields)
+    old_values = ', '.join(f'old.{field}' for field in index.fields)
+    delete = f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    insert = f'INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values});'
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({columns}, content='{source}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f'CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON {source} BEGIN {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON {source} BEGIN {delete} END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {columns} ON {source} BEGIN {delete} {insert} END',
+    ]
+
+
+def fts_objects(cursor):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    return {row[0] for row in cursor.fetchall() if '_fts' in row[0]}
+
+
+def install_fts(db):
+    """Legt fehlende Trigger für vorhandene FTS5-Tabellen unter SQLite neu an."""
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        existing = fts_objects(cursor)
+        for index in INDEXES.values():
+            table = fts_table(index)
+            expected = {table, f'{table}_insert', f'{table}_delete', f'{table}_update'}
+            # Ohne Tabelle fehlt FTS5 oder Migration 0012 ist (noch) nicht angewendet
+            if table not in existing or expected <= existing:
+                continue
+            for statement in fts_statements(index):
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def optimize_fts(db):
+    """Führt die Segmente der FTS5-Indizes zusammen, sinnvoll nach großen Importen."""
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        existing = fts_objects(cursor)
+        for index in INDEXES.values():
+            table = fts_table(index)
+            if table in existing:
+                cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+
+
+class SearchBackend:
+    """
+    Schnittstelle der Suche. `search` liefert die ids der besten Treffer nach Relevanz
+    sortiert, `filter` schränkt ein Queryset auf alle Treffer ein (z. B. für den Admin).
+    """
+
+    def search(self, kind, query, limit=20):
+        raise NotImplementedError
+
+    def filter(self, queryset, kind, query):
+        raise NotImplementedError
+
+
+class Fts5SearchBackend(SearchBackend):
+
+    def match_expression(self, query):
+        # Alle Wörter müssen vorkommen, nur das letzte (noch getippte) als Präfix. Präfixe
+        # auf häufigen Wörtern sind teuer, weil FTS5 dafür mehrere Trefferlisten mischt.
+        terms = [f'"{term}"' for term in search_terms(query)]
+        if terms:
+            terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search(self, kind, query, limit=20):
+        index, match = INDEXES[kind], self.match_expression(query)
+        if not match:
+            return []
+        table = fts_table(index)
+        weights = ', '.join(str(weight) for weight in index.weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH %s ORDER BY bm25({table}, {weights}), rowid LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter(self, queryset, kind, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        table = fts_table(INDEXES[kind])
+        return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [match]))
+
+
+class ContainsSearchBackend(SearchBackend):
+    """Ohne Index: jedes Wort muss in einem der Felder vorkommen, sortiert nach id."""
+
+    def filter(self, queryset, kind, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset.none()
+        fields = INDEXES[kind].fields
+        for term in terms:
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def search(self, kind, query, limit=20):
+        queryset = self.filter(INDEXES[kind].model.objects.order_by('id'), kind, query)
+        return list(queryset.values_list('id', flat=True)[:limit])
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def default_backend_path():
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            if fts_table(INDEXES['tasks']) in fts_objects(cursor):
+                return 'backend.search.Fts5SearchBackend'
+    return 'backend.search.ContainsSearchBackend'
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'JOIN_SEARCH_BACKEND', None) or default_backend_path()
+                _backend = import_string(path)()
+    return _backend
@@ -0,0 +1,44 @@
+# backend/sessions.py
+#
+# Session-Engine (SESSION_ENGINE = 'backend.sessions'): Djangos cached_db mit einem
+# Local-Memory-Cache je Prozess davor. Lesen kostet dann meist keine Query mehr,
+# geschrieben wird weiterhin zuerst in die Datenbank.
+#
+# cached_db legt Sessions für ihre volle Laufzeit in den Cache. Ein Logout löscht den
+# Eintrag aber nur im eigenen Prozess, andere Worker würden die Session bis zu ihrem
+# Ablauf weiter akzeptieren. Deshalb bleiben Einträge höchstens
+# JOIN_SESSION_CACHE_TIMEOUT Sekunden im Cache und werden danach aus der Datenbank
+# neu geladen.
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+
+class BoundedTimeoutCache:
+    """Reicht alle Aufrufe an den Cache weiter, begrenzt aber die Dauer der Einträge."""
+
+    def __init__(self, cache, max_timeout):
+        self.cache = cache
+        self.max_timeout = max_timeout
+
+    def bounded(self, timeout):
+        return self.max_timeout if timeout is None else min(timeout, self.max_timeout)
+
+    def set(self, key, value, timeout=None):
+        return self.cache.set(key, value, self.bounded(timeout))
+
+    async def aset(self, key, value, timeout=None):
+        return await self.cache.aset(key, value, self.bounded(timeout))
+
+    def __contains__(self, key):
+        return key in self.cache
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+
+class SessionStore(cached_db.SessionStore):
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = BoundedTimeoutCache(self._cache, settings.JOIN_SESSION_CACHE_TIMEOUT)
@@ -0,0 +1,116 @@
+# signals.py
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_migrate, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import counters, metrics, positions, search
+from .changes import record_change
+from .models import Contacts, Subtask, Task
+
+# Tabelle im Sinne von ChangeMarker/ChangeLogEntry je Model
+CHANGE_TABLES = {
+    Task: 'task',
+    Subtask: 'subtask',
+    Contacts: 'contacts',
+}
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=Contacts)
+def record_model_save(sender, instance, **kwargs):
+    record_change(CHANGE_TABLES[sender], [instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=Contacts)
+def record_model_delete(sender, instance, **kwargs):
+    record_change(CHANGE_TABLES[sender], [instance.pk], deleted=True)
+
+
+@receiver(post_init, sender=Task)
+def remember_board_state(sender, instance, **kwargs):
+    # Geladener Zustand für die Board-Zähler; bei zurückgestellten Feldern (only/defer) unbekannt
+    values = instance.__dict__
+    instance._board_state = (values['status'], values['prio']) if 'status' in values and 'prio' in values else None
+
+
+@receiver(pre_save, sender=Task)
+def load_board_state(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or instance._board_state is not None:
+        return
+    instance._board_state = Task.objects.filter(pk=instance.pk).values_list('status', 'prio').first()
+
+
+@receiver(pre_save, sender=Task)
+def place_on_board(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Neue Tasks und Tasks, die per save() die Spalte wechseln, kommen ans Ende der Spalte
+    if raw or (update_fields is not None and 'position' not in update_fields):
+        return
+    if instance._state.adding:
+        if instance.position is None:
+            instance.position = positions.next_position(instance.status)
+    elif instance._board_state is not None and instance._board_state[0] != instance.status:
+        instance.position = positions.next_position(instance.status)
+
+
+@receiver(post_save, sender=Task)
+def update_board_counters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_state = (instance.status, instance.prio)
+    counters.apply(counters.deltas_for(None if created else instance._board_state, new_state))
+    instance._board_state = new_state
+
+
+@receiver(post_delete, sender=Task)
+def remove_from_board_counters(sender, instance, **kwargs):
+    counters.apply(counters.deltas_for(old=(instance.status, instance.prio)))
+
+
+@receiver(pre_delete, sender=Contacts)
+def record_unassigned_tasks(sender, instance, **kwargs):
+    # Die Zuordnungen verschwinden beim Löschen ohne m2m_changed, die Tasks ändern sich trotzdem
+    task_ids = list(instance.assigned_tasks.values_list('id', flat=True))
+    if task_ids:
+        record_change('task', task_ids)
+
+
+@receiver(post_save, sender=User)
+def record_user_change(sender, instance, created, update_fields=None, **kwargs):
+    # Der Kontakt liefert has_password_set aus, ein reiner Login (last_login) ändert nichts daran
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    contact_ids = list(Contacts.objects.filter(user=instance).values_list('id', flat=True))
+    if contact_ids:
+        record_change('contacts', contact_ids)
+
+
+@receiver(m2m_changed, sender=Task.assignee_infos.through)
+def record_assignee_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        instance._cleared_task_ids = (
+            list(instance.assigned_tasks.values_list('id', flat=True)) if reverse else [instance.pk]
+        )
+    elif action == 'post_clear':
+        task_ids = instance.__dict__.pop('_cleared_task_ids', [])
+        if task_ids:
+            record_change('task', task_ids)
+    elif action in ('post_add', 'post_remove'):
+        record_change('task', list(pk_set) if reverse else [instance.pk])
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    # Neu aufgebaute Tabellen (SQLite-Remake in Migrationen) verlieren ihre FTS-Trigger
+    if sender.name == 'backend':
+        search.install_fts(connections[using])
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    metrics.install(connection)
@@ -1,3 +1,1413 @@
-from django.test import TestCase
+import asyncio
+import base64
+import datetime
+import faulthandler
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing, contextmanager
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.auth.hashers import make_password
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, connections
+from django.db.models.functions import Lower
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from backend import benchmarks, changes, counters, hashers, metrics, positions, search, tokens, transfer
+from backend.api import renderers
+from backend.api.fast import aserialize_tasks, serialize_tasks
+from backend.api.serializers import TaskMoveSerializer, TaskSerializer
+from backend.api.views import ContactsView, SyncView, TaskView
+from backend.concurrency import VersionConflict
+from backend.benchmarks import asgi as asgi_benchmark
+from backend.benchmarks.data import seed
+from backend.models import BoardCounter, ChangeLogEntry, ChangeMarker, Contacts, Subtask, Task
+from backend.realtime import InMemoryBroker, get_broker
+from backend.routers import STICKY_COOKIE, ReplicaRoutingMiddleware
+from backend.sessions import SessionStore
+from join_backend.asgi import application
+from join_backend.database import sqlite_database
+
+
+def create_task(title='Task', contacts=(), subtasks=0, **kwargs):
+    kwargs.setdefault('category', 'Technical Task')
+    kwargs.setdefault('description', 'Beschreibung')
+    kwargs.setdefault('due_date', datetime.date(2025, 6, 1))
+    task = Task.objects.create(title=title, **kwargs)
+    for i in range(subtasks):
+        Subtask.objects.create(task=task, subtasktext=f'{title} Subtask {i}')
+    task.assignee_infos.set(contacts)
+    return task
+
+
+def task_writes(ctx):
+    return [
+        query['sql'] for query in ctx.captured_queries
+        if query['sql'].startswith(('INSERT INTO "backend_task"', 'UPDATE "backend_task"'))
+    ]
+
+
+class APITestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+
+class TaskViewQueryCountTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.contacts = [
+            Contacts.objects.create(name=f'Kontakt {i}', email=f'kontakt{i}@example.com')
+            for i in range(3)
+        ]
+
+    def create_tasks(self, count):
+        for i in range(count):
+            create_task(f'Task {Task.objects.count()}', contacts=self.contacts, subtasks=2)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        self.create_tasks(2)
+        small, response = self.count_queries('/api/tasks/')
+        self.assertEqual(len(response.json()), 2)
+
+        self.create_tasks(20)
+        large, response = self.count_queries('/api/tasks/')
+        self.assertEqual(len(response.json()), 22)
+
+        self.assertEqual(small, large)
+
+    def test_retrieve_query_count_is_constant(self):
+        small_task = create_task('Klein', contacts=self.contacts[:1], subtasks=1)
+        large_task = create_task('Groß', contacts=self.contacts, subtasks=25)
+
+        small, _ = self.count_queries(f'/api/tasks/{small_task.id}/')
+        large, response = self.count_queries(f'/api/tasks/{large_task.id}/')
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.json()['subtasks']), 25)
+        self.assertEqual(len(response.json()['assignee-infos']), 3)
+
+
+class TaskListPaginationTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(7):
+            create_task(
+                f'Task {i}',
+                due_date=datetime.date(2025, 6, 1 + i % 3),
+                status='done' if i % 2 else 'toDos',
+                prio='urgent' if i == 0 else 'medium',
+            )
+
+    def test_without_parameters_returns_full_list(self):
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(len(response.json()), 7)
+
+    def test_limit_offset(self):
+        data = self.client.get('/api/tasks/?limit=3&offset=3').json()
+        self.assertEqual(data['count'], 7)
+        self.assertEqual(len(data['results']), 3)
+
+    def test_keyset_pages_cover_all_tasks_in_order(self):
+        url, seen = '/api/tasks/?page_size=2', []
+        while url:
+            data = self.client.get(url).json()
+            seen.extend((task['due-date'], task['id']) for task in data['results'])
+            url = data['next']
+        expected = sorted(Task.objects.values_list('due_date', 'id'))
+        self.assertEqual(seen, [(due_date.isoformat(), pk) for due_date, pk in expected])
+        self.assertEqual(seen[0][0], '2025-06-01')
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/tasks/?cursor=kaputt')
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor(self):
+        def cursor(position):
+            return base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+
+        for position in (['x', 'y'], ['2025-06-01', 'y'], ['2025-13-01', '1'], ['2025-06-01', 10**30],
+                         ['2025-06-01', True], [None, '1'], [['2025-06-01'], '1']):
+            response = self.client.get(f'/api/tasks/?cursor={cursor(position)}')
+            self.assertEqual(response.status_code, 404, position)
+        self.assertEqual(self.client.get(f'/api/tasks/?cursor={cursor(["2025-06-01", 1])}').status_code, 200)
+        self.assertEqual(self.client.get(f'/api/contacts/?cursor={cursor([[], "1"])}').status_code, 404)
+
+    def test_filters(self):
+        data = self.client.get('/api/tasks/?status=done').json()
+        self.assertEqual({task['status'] for task in data}, {'done'})
+        self.assertEqual(len(data), 3)
+
+        data = self.client.get('/api/tasks/?prio=urgent,low').json()
+        self.assertEqual([task['title'] for task in data], ['Task 0'])
+
+        data = self.client.get('/api/tasks/?due_date_from=2025-06-02&due_date_to=2025-06-02').json()
+        self.assertEqual({task['due-date'] for task in data}, {'2025-06-02'})
+
+    def test_invalid_filter_values(self):
+        response = self.client.get('/api/tasks/?status=archiv&due_date_from=morgen')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'status', 'due_date_from'})
+
+
+class TaskBulkTests(APITestCase):
+
+    def task_payload(self, title, **kwargs):
+        payload = {
+            'title': title,
+            'category': 'User Story',
+            'description': 'Beschreibung',
+            'due_date': '2025-06-01',
+        }
+        payload.update(kwargs)
+        return payload
+
+    def post_bulk(self, payload):
+        return self.client.post('/api/tasks/bulk/', payload, content_type='application/json')
+
+    def test_create_update_delete_in_one_request(self):
+        contact = Contacts.objects.create(name='Anna', email='anna@example.com')
+        existing = create_task('Alt', subtasks=3)
+        obsolete = create_task('Weg')
+        kept, changed, removed = existing.subtasks.order_by('id')
+
+        response = self.post_bulk({
+            'create': [self.task_payload('Neu', subtasks=[{'subtasktext': 'Eins'}], assignee_infos=[contact.id])],
+            'update': [{
+                'id': existing.id,
+                'status': 'done',
+                'subtasks': [
+                    {'id': kept.id, 'subtasktext': kept.subtasktext},
+                    {'id': changed.id, 'subtasktext': 'Geändert', 'done': True},
+                    {'subtasktext': 'Hinzugefügt'},
+                ],
+            }],
+            'delete': [obsolete.id],
+        })
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['deleted'], [obsolete.id])
+        self.assertEqual(data['created'][0]['assignee-infos'][0]['id'], contact.id)
+        self.assertEqual(data['updated'][0]['status'], 'done')
+        self.assertFalse(Task.objects.filter(id=obsolete.id).exists())
+
+        subtasks = list(existing.subtasks.order_by('id').values_list('id', 'subtasktext', 'done'))
+        self.assertEqual(subtasks[:2], [(kept.id, kept.subtasktext, False), (changed.id, 'Geändert', True)])
+        self.assertEqual(subtasks[2][1], 'Hinzugefügt')
+        self.assertFalse(Subtask.objects.filter(id=removed.id).exists())
+
+    def test_invalid_entry_rolls_back_everything(self):
+        task = create_task('Bleibt')
+        response = self.post_bulk({
+            'create': [self.task_payload('Neu')],
+            'update': [{'id': task.id, 'prio': 'sofort'}],
+            'delete': [task.id],
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('update', response.json())
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['Bleibt'])
+
+    def test_unknown_update_id(self):
+        response = self.post_bulk({'update': [{'id': 999, 'status': 'done'}]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_subtask_reconciliation_statement_count_is_constant(self):
+        def update_queries(subtask_count):
+            task = create_task(f'Task {subtask_count}', subtasks=subtask_count)
+            subtasks = [
+                {'id': subtask.id, 'subtasktext': 'Neu', 'done': True}
+                for subtask in task.subtasks.all()[1:]
+            ] + [{'subtasktext': f'Neu {i}'} for i in range(subtask_count)]
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.post_bulk({'update': [{'id': task.id, 'subtasks': subtasks}]})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['updated'][0]['subtasks']), 2 * subtask_count - 1)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(update_queries(2), update_queries(30))
+
+
+class TaskMoveTests(APITestCase):
+
+    def test_move_updates_status_with_single_query(self):
+        tasks = [create_task(f'Task {i}', subtasks=2) for i in range(3)]
+        ids = [task.id for task in tasks[:2]]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                '/api/tasks/move/', {'ids': ids, 'status': 'awaitFeedback'}, content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'moved': 2, 'status': 'awaitFeedback'})
+        self.assertEqual(len(task_writes(ctx)), 1)
+        self.assertEqual(
+            dict(Task.objects.values_list('id', 'status')),
+            {tasks[0].id: 'awaitFeedback', tasks[1].id: 'awaitFeedback', tasks[2].id: 'toDos'},
+        )
+
+    def test_move_rejects_unknown_status(self):
+        task = create_task()
+        response = self.client.post('/api/tasks/move/', {'ids': [task.id], 'status': 'archiv'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskPositionTests(APITestCase):
+
+    def column(self, status='toDos'):
+        return list(Task.objects.filter(status=status).board_order().values_list('title', flat=True))
+
+    def move(self, ids, status='toDos', **neighbours):
+        return self.client.post(
+            '/api/tasks/move/', {'ids': ids, 'status': status, **neighbours}, content_type='application/json'
+        )
+
+    def test_new_tasks_are_appended_to_their_column(self):
+        create_task('A')
+        create_task('B')
+        Task.objects.bulk_create([
+            Task(title='C', category='User Story', description='', due_date=datetime.date(2025, 6, 1)),
+        ])
+        create_task('Fertig', status='done')
+        self.assertEqual(self.column(), ['A', 'B', 'C'])
+        self.assertEqual(Task.objects.get(title='Fertig').position, positions.STEP)
+
+    def test_move_between_neighbours_writes_only_moved_row(self):
+        tasks = [create_task(f'Task {i}') for i in range(50)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.move([tasks[40].id], after=tasks[2].id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(task_writes(ctx)), 1)
+        self.assertEqual(self.column()[:5], ['Task 0', 'Task 1', 'Task 2', 'Task 40', 'Task 3'])
+
+        self.move([tasks[10].id, tasks[11].id], before=tasks[0].id)
+        self.assertEqual(self.column()[:3], ['Task 10', 'Task 11', 'Task 0'])
+
+        self.move([tasks[0].id], status='done')
+        self.assertEqual(self.column('done'), ['Task 0'])
+
+    def test_move_rejects_neighbour_outside_column(self):
+        task, other = create_task('A'), create_task('B', status='done')
+        self.assertEqual(self.move([task.id], after=other.id).status_code, 400)
+        self.assertEqual(self.move([task.id], after=task.id).status_code, 400)
+
+    def test_status_change_appends_and_list_follows_board_order(self):
+        first, second = create_task('Erster'), create_task('Zweiter', status='inProgress')
+        self.client.patch(f'/api/tasks/{first.id}/', {'status': 'inProgress'}, content_type='application/json')
+        self.assertEqual(self.column('inProgress'), ['Zweiter', 'Erster'])
+        self.assertEqual([task['title'] for task in self.client.get('/api/tasks/').json()], ['Zweiter', 'Erster'])
+
+    def test_exhausted_gap_triggers_rebalance(self):
+        tasks = [create_task(f'Task {i}') for i in range(3)]
+        for _ in range(60):
+            self.move([tasks[2].id], after=tasks[0].id)
+            self.move([tasks[1].id], after=tasks[0].id)
+        self.assertEqual(self.column(), ['Task 0', 'Task 1', 'Task 2'])
+
+        Task.objects.filter(id=tasks[1].id).update(position=tasks[0].position + 1e-6)
+        call_command('rebalance_positions', stdout=io.StringIO())
+        self.assertEqual(
+            list(Task.objects.board_order().values_list('position', flat=True)),
+            [positions.STEP, 2 * positions.STEP, 3 * positions.STEP],
+        )
+
+
+class TaskVersionTests(APITestCase):
+
+    def patch(self, task, data, **headers):
+        return self.client.patch(f'/api/tasks/{task.id}/', data, content_type='application/json', **headers)
+
+    def test_update_with_current_etag_bumps_version(self):
+        task = create_task('Alt')
+        etag = self.client.get(f'/api/tasks/{task.id}/')['ETag']
+        self.assertTrue(etag.startswith('"1-'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.patch(task, {'title': 'Neu'}, HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['version'], 2)
+        claim, save = task_writes(ctx)
+        self.assertIn('SET "version" = ("backend_task"."version" + 1)', claim)
+        self.assertIn('"backend_task"."version" = 1', claim)
+        self.assertIn('"title" = \'Neu\'', save)
+        self.assertEqual(response['ETag'], self.client.get(f'/api/tasks/{task.id}/')['ETag'])
+        self.assertEqual(self.patch(task, {'title': 'Ohne If-Match'}).json()['version'], 3)
+        self.assertEqual(self.patch(task, {'title': 'Stern'}, HTTP_IF_MATCH='*').status_code, 200)
+        self.assertEqual(self.patch(task, {'title': 'Nur Version'}, HTTP_IF_MATCH='"4"').status_code, 200)
+
+    def test_stale_if_match_is_rejected(self):
+        task = create_task('Alt', subtasks=2)
+        etag = self.client.get(f'/api/tasks/{task.id}/')['ETag']
+        self.patch(task, {'title': 'Anderer Tab'})
+
+        for header in (etag, '"1"', '"kaputt"'):
+            response = self.patch(task, {'title': 'Verloren', 'subtasks': []}, HTTP_IF_MATCH=header)
+            self.assertEqual(response.status_code, 412)
+        task.refresh_from_db()
+        self.assertEqual((task.title, task.version, task.subtasks.count()), ('Anderer Tab', 2, 2))
+
+    def test_concurrent_save_raises_and_rolls_back(self):
+        task = create_task('Alt', subtasks=2)
+        stale = Task.objects.get(id=task.id)
+        self.patch(task, {'title': 'Zuerst'})
+
+        serializer = TaskSerializer(stale, data={'title': 'Später', 'subtasks': []}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(VersionConflict):
+            serializer.save()
+        task.refresh_from_db()
+        self.assertEqual((task.title, task.version, task.subtasks.count()), ('Zuerst', 2, 2))
+
+    def test_plain_save_is_unchecked_and_admin_bumps_version(self):
+        task = create_task('Alt')
+        stale = Task.objects.get(id=task.id)
+        self.patch(task, {'title': 'API'})
+        stale.title = 'Skript'
+        stale.save()
+        self.assertEqual(Task.objects.get(id=task.id).title, 'Skript')
+
+        task = Task.objects.get(id=task.id)
+        self.patch(task, {'title': 'API'})
+        task.title = 'Admin'
+        admin.site._registry[Task].save_model(None, task, None, True)
+        self.assertEqual(self.patch(task, {'title': 'Verloren'}, HTTP_IF_MATCH=f'"{task.version - 1}"').status_code, 412)
+        self.assertEqual(Task.objects.values_list('title', 'version').get(id=task.id), ('Admin', task.version))
+
+    def test_move_bumps_version(self):
+        task = create_task()
+        self.client.post('/api/tasks/move/', {'ids': [task.id], 'status': 'done'}, content_type='application/json')
+        self.assertEqual(self.patch(task, {'title': 'Neu'}, HTTP_IF_MATCH='"1"').status_code, 412)
+        self.assertEqual(Task.objects.get(id=task.id).version, 2)
+
+
+class TaskIdTests(APITestCase):
+
+    def test_create_costs_single_insert(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/tasks/', {
+                'title': 'Neu',
+                'category': 'User Story',
+                'description': 'Beschreibung',
+                'due_date': '2025-06-01',
+            }, content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['task-id'], data['id'])
+        self.assertEqual(len(task_writes(ctx)), 1)
+
+    def test_bulk_create_sets_task_id(self):
+        tasks = Task.objects.bulk_create([
+            Task(title=f'Task {i}', category='User Story', description='', due_date=datetime.date(2025, 6, 1))
+            for i in range(3)
+        ])
+        self.assertEqual(
+            list(Task.objects.filter(id__in=[task.id for task in tasks]).values_list('id', 'task_id')),
+            [(task.id, task.id) for task in tasks],
+        )
+
+
+class ResponseCacheTests(APITestCase):
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_second_request_is_served_from_cache(self):
+        create_task('Eins', subtasks=1)
+        self.assertEqual(self.get('/api/tasks/')['X-Cache'], 'MISS')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.get('/api/tasks/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        # Nur die Änderungsmarker für den ETag werden gelesen
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response.json()[0]['title'], 'Eins')
+
+    def test_writes_invalidate_cached_responses(self):
+        task = create_task('Eins', subtasks=1)
+        contact = Contacts.objects.create(name='Anna', email='anna@example.com')
+        writes = [
+            lambda: Task.objects.filter(id=task.id).first().save(),
+            lambda: task.subtasks.first().save(),
+            lambda: task.assignee_infos.add(contact),
+            lambda: contact.save(),
+            lambda: self.client.post('/api/tasks/move/', {'ids': [task.id], 'status': 'done'}, content_type='application/json'),
+            lambda: self.client.patch(f'/api/tasks/{task.id}/', {'subtasks': [{'subtasktext': 'Neu'}]}, content_type='application/json'),
+        ]
+        for write in writes:
+            self.get('/api/tasks/')
+            self.assertEqual(self.get('/api/tasks/')['X-Cache'], 'HIT')
+            write()
+            self.assertEqual(self.get('/api/tasks/')['X-Cache'], 'MISS')
+
+        data = self.get(f'/api/tasks/{task.id}/').json()
+        self.assertEqual(data['status'], 'done')
+        self.assertEqual([subtask['subtasktext'] for subtask in data['subtasks']], ['Neu'])
+
+    def test_stats_are_admin_only(self):
+        self.get('/api/contacts/')
+        self.get('/api/contacts/')
+        self.assertEqual(self.client.get('/api/cache-stats/').status_code, 403)
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'geheim123')
+        self.client.force_login(admin)
+        stats = self.get('/api/cache-stats/').json()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+
+class ConditionalGetTests(APITestCase):
+
+    def test_not_modified_until_table_changes(self):
+        task = create_task('Eins', subtasks=1)
+        response = self.client.get('/api/tasks/')
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        subtask = task.subtasks.first()
+        subtask.done = True
+        subtask.save()
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_query(self):
+        create_task('Eins')
+        etag = self.client.get('/api/tasks/')['ETag']
+        response = self.client.get('/api/tasks/?status=done', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_contacts_ignore_task_changes(self):
+        Contacts.objects.create(name='Anna', email='anna@example.com')
+        etag = self.client.get('/api/contacts/')['ETag']
+        create_task('Eins')
+        response = self.client.get('/api/contacts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since(self):
+        create_task('Eins')
+        last_modified = self.client.get('/api/tasks/')['Last-Modified']
+        response = self.client.get('/api/tasks/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+
+class SyncTests(APITestCase):
+
+    def sync(self, since=None):
+        url = '/api/sync/' if since is None else f'/api/sync/?since={since}'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_returns_only_changes_since_revision(self):
+        task = create_task('Eins', subtasks=1)
+        create_task('Zwei')
+        snapshot = self.sync()
+        self.assertEqual(len(snapshot['tasks']), 2)
+
+        self.client.post('/api/tasks/move/', {'ids': [task.id], 'status': 'done'}, content_type='application/json')
+        subtask_id = task.subtasks.get().id
+        Subtask.objects.filter(id=subtask_id).delete()
+
+        delta = self.sync(snapshot['revision'])
+        self.assertEqual([item['id'] for item in delta['tasks']], [task.id])
+        self.assertEqual(delta['tasks'][0]['status'], 'done')
+        self.assertEqual(delta['deleted']['subtasks'], [subtask_id])
+        self.assertEqual(delta['contacts'], [])
+
+        self.assertEqual(self.sync(delta['revision'])['tasks'], [])
+
+    def test_assignee_changes_mark_tasks(self):
+        task = create_task('Eins')
+        contact = Contacts.objects.create(name='Anna', email='anna@example.com')
+        revision = self.sync()['revision']
+        contact.assigned_tasks.add(task)
+        self.assertEqual([item['id'] for item in self.sync(revision)['tasks']], [task.id])
+
+    def test_tombstones_for_cascaded_contact_deletes(self):
+        guest = User.objects.create_user('gast@example.com', 'gast@example.com')
+        guest.set_unusable_password()
+        guest.save()
+        contact = Contacts.objects.create(name='Gast', email='gast@example.com', user=guest)
+        task = create_task('Eins', contacts=[contact])
+        revision = self.sync()['revision']
+
+        response = self.client.delete(f'/api/contacts/{contact.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        delta = self.sync(revision)
+        self.assertEqual(delta['deleted']['contacts'], [contact.id])
+        self.assertEqual(delta['tasks'][0]['id'], task.id)
+        self.assertEqual(delta['tasks'][0]['assignee-infos'], [])
+
+    def test_tombstones_for_deleted_account(self):
+        user = User.objects.create_user('anna@example.com', 'anna@example.com', 'geheim123')
+        contact = Contacts.objects.create(name='Anna', email='anna@example.com', user=user)
+        revision = self.sync()['revision']
+
+        self.client.force_login(user)
+        self.client.delete('/api/delete-my-account/')
+
+        self.assertEqual(self.sync(revision)['deleted']['contacts'], [contact.id])
+
+    def test_has_more_pages_through_changes(self):
+        revision = self.sync()['revision']
+        for i in range(3):
+            create_task(f'Task {i}')
+        with mock.patch.object(SyncView, 'max_changes', 2):
+            first = self.sync(revision)
+            second = self.sync(first['revision'])
+        self.assertTrue(first['has_more'])
+        self.assertFalse(second['has_more'])
+        self.assertEqual(len(first['tasks']) + len(second['tasks']), 3)
+
+    def test_compact_keeps_latest_entry_per_object(self):
+        task = create_task('Eins')
+        revision = self.sync()['revision']
+        for _ in range(3):
+            task.save()
+        changes.compact()
+        self.assertEqual(ChangeLogEntry.objects.filter(table='task', object_id=task.id).count(), 1)
+        self.assertEqual([item['id'] for item in self.sync(revision)['tasks']], [task.id])
+
+
+class BoardWebSocketTests(APITestCase):
+
+    def connect(self, path='/ws/board/', headers=()):
+        communicator = ApplicationCommunicator(application, {
+            'type': 'websocket',
+            'path': path,
+            'headers': list(headers),
+        })
+        return communicator
+
+    def create_task_and_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_task('Live').id
+
+    async def test_pushes_task_changes(self):
+        communicator = self.connect()
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output(1))['type'], 'websocket.accept')
+
+        task_id = await sync_to_async(self.create_task_and_commit)()
+
+        message = await communicator.receive_output(1)
+        event = json.loads(message['text'])
+        self.assertEqual((event['type'], event['table'], event['ids'], event['deleted']), ('change', 'task', [task_id], False))
+        self.assertGreater(event['revision'], 0)
+
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait(1)
+        self.assertEqual(get_broker().subscriptions, set())
+
+    async def test_rolled_back_changes_are_not_pushed(self):
+        communicator = self.connect()
+        await communicator.send_input({'type': 'websocket.connect'})
+        await communicator.receive_output(1)
+
+        await sync_to_async(create_task)('Ohne Commit')
+
+        self.assertTrue(await communicator.receive_nothing(0.2))
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait(1)
+
+    async def test_rejects_unknown_path_and_origin(self):
+        for communicator in (
+            self.connect('/ws/anders/'),
+            self.connect(headers=[(b'origin', b'https://evil.example.com')]),
+        ):
+            await communicator.send_input({'type': 'websocket.connect'})
+            self.assertEqual(await communicator.receive_output(1), {'type': 'websocket.close', 'code': 4403})
+
+    def test_slow_client_is_asked_to_resync(self):
+        async def overflow():
+            broker = InMemoryBroker()
+            broker.max_queue_size = 2
+            subscription = broker.subscribe()
+            for i in range(3):
+                broker.publish({'type': 'change', 'ids': [i]})
+            await asyncio.sleep(0)
+            return await subscription.get()
+
+        self.assertEqual(async_to_sync(overflow)(), {'type': 'resync'})
+
+
+class AsyncReadViewTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        contact = Contacts.objects.create(name='Anna', email='anna@example.com')
+        self.task = create_task('Eins', contacts=[contact], subtasks=2, status='done')
+        create_task('Zwei')
+
+    async def test_async_views_match_sync_views(self):
+        for sync_url, async_url in (
+            ('/api/tasks/', '/api/async/tasks/'),
+            (f'/api/tasks/{self.task.id}/', f'/api/async/tasks/{self.task.id}/'),
+            ('/api/tasks/?status=done', '/api/async/tasks/?status=done'),
+            ('/api/contacts/', '/api/async/contacts/'),
+        ):
+            expected = await self.async_client.get(sync_url)
+            response = await self.async_client.get(async_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], expected['Content-Type'])
+            self.assertEqual(response.content, expected.content)
+
+    async def test_async_errors(self):
+        self.assertEqual((await self.async_client.get('/api/async/tasks/999/')).status_code, 404)
+        self.assertEqual((await self.async_client.get('/api/async/tasks/?prio=sofort')).status_code, 400)
+        self.assertEqual((await self.async_client.post('/api/async/tasks/')).status_code, 405)
+
+
+class AsgiBenchmarkTests(TransactionTestCase):
+
+    @override_settings(
+        ALLOWED_HOSTS=['localhost'],
+        CACHES={**settings.CACHES, 'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    )
+    def test_parallel_load_finishes(self):
+        create_task('Eins', subtasks=1)
+
+        # Wie im Befehl aus dem Haupt-Thread. Hängt die Messung, bricht faulthandler den
+        # Testlauf mit den Stacks aller Threads ab, statt ewig zu warten.
+        faulthandler.dump_traceback_later(60, exit=True)
+        try:
+            results = {
+                path: asgi_benchmark.measure(application, path, requests=6, concurrency=3)
+                for path in ('/api/tasks/', '/api/async/tasks/')
+            }
+        finally:
+            faulthandler.cancel_dump_traceback_later()
+        self.assertEqual([stats['requests'] for stats in results.values()], [6, 6])
+
+
+class FastTaskSerializationTests(APITestCase):
+
+    def test_matches_task_serializer_byte_for_byte(self):
+        contacts = [
+            Contacts.objects.create(name=name, email=f'{i}@example.com', color=color)
+            for i, (name, color) in enumerate([('Zoë Müller', '#FF7A00'), ('Anna', 'blue'), ('李', '#462F8A')])
+        ]
+        create_task('Ohne alles', description='')
+        create_task('Voll', contacts=contacts[::-1], subtasks=3, prio='urgent', status='done')
+        create_task('Sonderzeichen "<&>"', contacts=contacts[1:2], subtasks=1, due_date=datetime.date(2031, 12, 31))
+        seed(contacts=0, tasks=20, subtasks_per_task=2, assignees_per_task=2)
+
+        renderer = JSONRenderer()
+        queryset = Task.objects.board_order()
+        expected = renderer.render(TaskSerializer(queryset.with_relations(), many=True).data)
+
+        self.assertEqual(renderer.render(serialize_tasks(queryset)), expected)
+        self.assertEqual(renderer.render(serialize_tasks(queryset, chunk_size=7)), expected)
+        self.assertEqual(renderer.render(async_to_sync(aserialize_tasks)(queryset, chunk_size=7)), expected)
+        self.assertEqual(self.client.get('/api/tasks/').content, expected)
+
+    def test_paginated_list_keeps_page_order(self):
+        for i in range(5):
+            create_task(f'Task {i}', due_date=datetime.date(2025, 6, 5 - i))
+        data = self.client.get('/api/tasks/?page_size=3').json()
+        self.assertEqual([task['title'] for task in data['results']], ['Task 4', 'Task 3', 'Task 2'])
+
+
+class StreamingListTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        contacts = [Contacts.objects.create(name=f'Kontakt {i}', email=f'k{i}@example.com') for i in range(3)]
+        for i in range(7):
+            create_task(f'Task {i}\u2028', contacts=contacts[:i % 3], subtasks=i % 2, status='done' if i % 2 else 'toDos')
+
+    def assertStreamMatchesList(self, url, separator='?'):
+        expected = self.client.get(url).content
+        response = self.client.get(f'{url}{separator}stream=1')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(b''.join(response.streaming_content), expected)
+
+    def test_stream_matches_regular_list(self):
+        with mock.patch.object(TaskView, 'stream_chunk_size', 3), mock.patch.object(ContactsView, 'stream_chunk_size', 2):
+            self.assertStreamMatchesList('/api/tasks/')
+            self.assertStreamMatchesList('/api/tasks/?status=done', separator='&')
+            self.assertStreamMatchesList('/api/contacts/')
+
+    def test_tasks_stream_through_fast_path(self):
+        expected = self.client.get('/api/tasks/').content
+        with mock.patch.object(TaskSerializer, 'to_representation', side_effect=AssertionError('TaskSerializer')):
+            response = self.client.get('/api/tasks/?stream=1')
+            self.assertEqual(b''.join(response.streaming_content), expected)
+
+    def test_empty_stream(self):
+        response = self.client.get('/api/tasks/?status=inProgress&stream=1')
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+    def test_encoders_match_drf_renderer(self):
+        data = [{'text': 'a\u2028b "ü"', 'date': datetime.date(2025, 6, 1), 'decimal': Decimal('1.50')}]
+        serializer = TaskMoveSerializer(data={'ids': ['x', 1, 'y'], 'status': 'done'})
+        self.assertFalse(serializer.is_valid())
+        for payload in (data, serializer.errors):
+            expected = JSONRenderer().render(payload)
+            for encoder in ('backend.api.renderers.stdlib_dumps', 'backend.api.renderers.orjson_dumps'):
+                if encoder.endswith('orjson_dumps') and renderers.orjson is None:
+                    continue
+                with self.settings(JOIN_JSON_ENCODER=encoder), mock.patch.object(renderers, '_dumps', None):
+                    self.assertEqual(renderers.FastJSONRenderer().render(payload), expected)
+
+    def test_list_field_errors_are_bad_requests(self):
+        response = self.client.post('/api/tasks/move/', {'ids': ['x'], 'status': 'done'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()['ids']), ['0'])
+        response = self.client.post('/api/tasks/bulk/', {'delete': ['y']}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class ImportExportTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'geheim123')
+        self.client.force_login(admin)
+
+    def export(self, kind, file_format):
+        response = self.client.get(f'/api/export/{kind}/{file_format}/')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def import_file(self, kind, file_format, content):
+        response = self.client.post(f'/api/import/{kind}/{file_format}/', content, content_type='text/plain')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_round_trip(self):
+        anna = Contacts.objects.create(name='Anna', email='anna@example.com', color='#FF7A00', phone='123')
+        create_task('Eins; "zwei"', contacts=[anna], subtasks=2, prio='urgent')
+        create_task('Ohne', description='')
+
+        for file_format in transfer.FORMATS:
+            contacts = self.export('contacts', file_format)
+            tasks = self.export('tasks', file_format)
+            Task.objects.all().delete()
+            Contacts.objects.all().delete()
+
+            self.assertEqual(self.import_file('contacts', file_format, contacts)['created'], 1)
+            self.assertEqual(self.import_file('tasks', file_format, tasks), {'created': 2, 'failed': 0, 'errors': []})
+            self.assertEqual(self.export('tasks', file_format), tasks)
+
+        task = Task.objects.get(title='Eins; "zwei"')
+        self.assertEqual(list(task.assignee_infos.values_list('email', flat=True)), ['anna@example.com'])
+        self.assertEqual(task.subtasks.count(), 2)
+
+    def test_errors_are_reported_per_line(self):
+        Contacts.objects.create(name='Anna', email='anna@example.com')
+        content = '\n'.join([
+            json.dumps({'name': 'Ben', 'email': 'BEN@example.com'}),
+            '{kaputt',
+            json.dumps({'name': 'Anna', 'email': 'anna@example.com'}),
+            '',
+            json.dumps({'name': 'Ben doppelt', 'email': 'ben@example.com'}),
+            json.dumps({'email': 'ohne-name@example.com'}),
+        ])
+        result = self.import_file('contacts', 'ndjson', content)
+        self.assertEqual(result['created'], 1)
+        self.assertEqual([error['line'] for error in result['errors']], [2, 3, 5, 6])
+        self.assertTrue(Contacts.objects.filter(email='ben@example.com').exists())
+
+    def test_mixed_case_emails_match_existing_contacts(self):
+        anna = Contacts.objects.create(name='Anna', email='Anna.Schmidt@Example.com')
+        result = self.import_file('contacts', 'ndjson', json.dumps({'name': 'Anna', 'email': 'anna.schmidt@example.com'}))
+        self.assertEqual((result['created'], len(result['errors'])), (0, 1))
+        self.assertEqual(Contacts.objects.count(), 1)
+
+        line = json.dumps({'title': 'Neu', 'category': 'User Story', 'due_date': '2025-06-01', 'assignees': ['ANNA.schmidt@example.com']})
+        self.assertEqual(self.import_file('tasks', 'ndjson', line)['created'], 1)
+        self.assertEqual(list(Task.objects.get(title='Neu').assignee_infos.all()), [anna])
+
+    def test_csv_task_errors(self):
+        content = (
+            'title,category,due_date,assignees,subtasks\n'
+            'Gut,User Story,2025-06-01,,\n'
+            'Ohne Datum,User Story,,,\n'
+            'Fremd,User Story,2025-06-01,unbekannt@example.com,\n'
+            'Kaputt,User Story,2025-06-01,,[\n'
+        )
+        result = self.import_file('tasks', 'csv', content)
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(sorted(error['line'] for error in result['errors']), [3, 4, 5])
+
+    def test_import_records_changes(self):
+        revision = changes.current_revision()
+        self.import_file('tasks', 'ndjson', json.dumps({
+            'title': 'Neu', 'category': 'User Story', 'due_date': '2025-06-01', 'subtasks': [{'subtasktext': 'a'}],
+        }))
+        delta = changes.changes_since(revision, 100)
+        self.assertEqual(len(delta['changed']['task']), 1)
+        self.assertEqual(len(delta['changed']['subtask']), 1)
+
+    def test_admin_only(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/export/tasks/csv/').status_code, 403)
+        self.assertEqual(self.client.post('/api/import/tasks/csv/', '', content_type='text/csv').status_code, 403)
+
+    def test_management_commands(self):
+        create_task('Eins', subtasks=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tasks.csv')
+            call_command('export_data', 'tasks', output=path)
+            Task.objects.all().delete()
+            call_command('import_data', 'tasks', path, stdout=io.StringIO())
+        self.assertEqual(Task.objects.get().subtasks.count(), 1)
+
+
+class BoardSummaryTests(APITestCase):
+
+    def assertCountersMatch(self):
+        self.assertEqual(counters.stored(), counters.recount())
+
+    def test_counters_follow_every_write_path(self):
+        task = create_task('Eins', prio='urgent')
+        other = create_task('Zwei', status='done')
+        self.assertCountersMatch()
+
+        self.client.patch(f'/api/tasks/{task.id}/', {'prio': 'low', 'status': 'inProgress'}, content_type='application/json')
+        self.assertCountersMatch()
+
+        self.client.post('/api/tasks/move/', {'ids': [task.id, other.id], 'status': 'awaitFeedback'}, content_type='application/json')
+        self.assertCountersMatch()
+
+        # Dringende Tasks zählen nur, solange sie offen sind
+        self.client.patch(f'/api/tasks/{other.id}/', {'prio': 'urgent'}, content_type='application/json')
+        self.assertEqual(counters.stored()['urgent'], 1)
+        self.client.post('/api/tasks/move/', {'ids': [other.id], 'status': 'done'}, content_type='application/json')
+        self.assertEqual(counters.stored()['urgent'], 0)
+        self.client.post('/api/tasks/move/', {'ids': [other.id], 'status': 'toDos'}, content_type='application/json')
+        self.assertEqual(counters.stored()['urgent'], 1)
+        self.assertCountersMatch()
+
+        line = json.dumps({'title': 'Neu', 'category': 'User Story', 'due_date': '2025-06-01', 'prio': 'urgent'})
+        transfer.import_rows([line], 'tasks', 'ndjson')
+        Task.objects.only('id').get(id=other.id).save()
+        self.assertCountersMatch()
+
+        self.client.delete(f'/api/tasks/{task.id}/')
+        self.assertCountersMatch()
+        self.assertEqual(counters.stored()['total'], 2)
+
+    def test_summary(self):
+        today = datetime.date.today()
+        create_task('Erledigt', status='done', prio='urgent', due_date=today)
+        create_task('Dringend', prio='urgent', due_date=today + datetime.timedelta(days=3))
+        create_task('Später', status='inProgress', due_date=today + datetime.timedelta(days=10))
+        create_task('Überfällig', due_date=today - datetime.timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/summary/')
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(response.json(), {
+            'total': 4,
+            'status': {'toDos': 2, 'inProgress': 1, 'awaitFeedback': 0, 'done': 1},
+            'urgent': 1,
+            'upcoming_deadline': (today + datetime.timedelta(days=3)).isoformat(),
+            'source': 'counters',
+        })
+
+        BoardCounter.objects.filter(key='urgent').delete()
+        fallback = self.client.get('/api/summary/').json()
+        self.assertEqual(fallback.pop('source'), 'aggregate')
+        self.assertEqual(fallback, {key: value for key, value in response.json().items() if key != 'source'})
+
+    def test_verify_command(self):
+        create_task(prio='urgent')
+        BoardCounter.objects.filter(key='total').update(value=7)
+        with self.assertRaises(CommandError):
+            call_command('verify_board_counters', stdout=io.StringIO())
+        call_command('verify_board_counters', fix=True, stdout=io.StringIO())
+        self.assertCountersMatch()
+
+
+class SearchTests(APITestCase):
+
+    def search(self, query, **params):
+        response = self.client.get('/api/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_ranked_prefix_search(self):
+        in_description = create_task('Einkauf', description='Angebot für die Rechnung prüfen')
+        in_title = create_task('Rechnung schreiben', description='Kunde Müller')
+        create_task('Anderes')
+
+        result = self.search('rechn', types='tasks')
+        self.assertEqual([task['id'] for task in result['tasks']], [in_title.id, in_description.id])
+        self.assertEqual(result['tasks'][0]['title'], 'Rechnung schreiben')
+        self.assertEqual([task['id'] for task in self.search('kunde MULLER')['tasks']], [in_title.id])
+
+    def test_index_follows_writes(self):
+        task = create_task('Alt', subtasks=1)
+        Task.objects.filter(id=task.id).update(title='Neu')
+        transfer.import_rows([json.dumps({'title': 'Neu importiert', 'category': 'User Story', 'due_date': '2025-06-01'})], 'tasks', 'ndjson')
+        self.assertEqual(self.search('alt')['tasks'], [])
+        self.assertEqual(len(self.search('neu')['tasks']), 2)
+
+        self.assertEqual(len(self.search('subtask')['subtasks']), 1)
+        task.delete()
+        self.assertEqual(self.search('subtask')['subtasks'], [])
+
+    def test_contacts_and_validation(self):
+        anna = Contacts.objects.create(name='Anna Schmidt', email='anna@example.com')
+        self.assertEqual([contact['id'] for contact in self.search('example.com')['contacts']], [anna.id])
+        self.assertEqual(self.client.get('/api/search/', {'q': '!!'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/search/', {'q': 'anna', 'types': 'users'}).status_code, 400)
+
+    def test_install_fts_restores_lost_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER backend_task_fts_insert')
+        create_task('Ohne Trigger')
+        self.assertEqual(self.search('trigger')['tasks'], [])
+
+        search.install_fts(connection)
+        self.assertEqual(len(self.search('trigger')['tasks']), 1)
+
+    def test_contains_backend(self):
+        create_task('Rechnung schreiben')
+        with mock.patch.object(search, '_backend', search.ContainsSearchBackend()):
+            self.assertEqual(len(self.search('rechnung schr')['tasks']), 1)
+            self.assertEqual(self.search('rechnung neu')['tasks'], [])
+
+
+class DatabaseProfileTests(TestCase):
+
+    def test_profiles(self):
+        production = sqlite_database('join.sqlite3')
+        self.assertIn('PRAGMA journal_mode=WAL', production['OPTIONS']['init_command'])
+        self.assertEqual(production['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual((production['CONN_MAX_AGE'], production['CONN_HEALTH_CHECKS']), (600, True))
+        self.assertEqual(sqlite_database('join.sqlite3', 'default'), {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': 'join.sqlite3',
+            'OPTIONS': {},
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False,
+        })
+        with self.assertRaises(ValueError):
+            sqlite_database('join.sqlite3', 'schnell')
+
+    def test_pragmas_applied_on_connect(self):
+        if settings.JOIN_DATABASE_PROFILE != 'production':
+            self.skipTest('Nur mit dem Profil "production".')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -64 * 1024)
+
+
+@contextmanager
+def replica_databases():
+    """
+    Stellt "default" auf eine SQLite-Datei um und legt daneben das Replikat "replica" an.
+    Die zurückgegebene Funktion kopiert den Stand der Primärdatei ins Replikat (anstelle
+    einer echten Replikation), bis dahin hinkt es hinterher.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        primary_path = os.path.join(directory, 'primary.sqlite3')
+        replica_path = os.path.join(directory, 'replica.sqlite3')
+        original_connection, original_settings = connections['default'], connections.settings['default']
+        connections.settings['default'] = {**original_settings, **sqlite_database(primary_path)}
+        connections.settings['replica'] = {**original_settings, **sqlite_database(replica_path, read_only=True)}
+        connections['default'] = connections.create_connection('default')
+        connections['replica'] = connections.create_connection('replica')
+
+        def sync():
+            with closing(sqlite3.connect(primary_path)) as source, closing(sqlite3.connect(replica_path)) as target:
+                source.backup(target)
+
+        try:
+            with override_settings(JOIN_REPLICA_DATABASES=['replica']):
+                call_command('migrate', verbosity=0)
+                sync()
+                yield sync
+        finally:
+            connections['default'].close()
+            connections['replica'].close()
+            connections['default'] = original_connection
+            connections.settings['default'] = original_settings
+            del connections['replica']
+            del connections.settings['replica']
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sync = staticmethod(cls.enterClassContext(replica_databases()))
+        # Den Alias gibt es erst ab hier, SimpleTestCase erlaubt nur Verbindungen aus databases
+        cls.databases = cls.databases | {'replica'}
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self):
+        return sorted(task['title'] for task in self.client.get('/api/tasks/').json())
+
+    def test_writer_is_not_served_stale_cache_entries(self):
+        task = create_task('Alt')
+        self.sync()
+        response = self.client.patch(f'/api/tasks/{task.id}/', {'title': 'Neu'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        def title(response):
+            return next(item['title'] for item in response.json() if item['id'] == task.id)
+
+        # Ein anderer Client liest noch vom Replikat, das darf nicht im Cache landen
+        other = self.client_class()
+        self.assertEqual(title(other.get('/api/tasks/')), 'Alt')
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(title(response), 'Neu')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/tasks/')['X-Cache'], 'HIT')
+        self.assertEqual(other.get('/api/tasks/')['X-Cache'], 'BYPASS')
+
+    def test_reads_follow_replica_until_own_write(self):
+        task = create_task('Repliziert')
+        self.sync()
+        create_task('Noch nicht repliziert')
+        self.assertEqual(self.titles(), ['Repliziert'])
+
+        response = self.client.patch(f'/api/tasks/{task.id}/', {'title': 'Geändert'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(self.titles(), ['Geändert', 'Noch nicht repliziert'])
+
+        self.client.cookies.pop(STICKY_COOKIE)
+        self.assertEqual(self.titles(), ['Repliziert'])
+        self.sync()
+        self.assertEqual(self.titles(), ['Geändert', 'Noch nicht repliziert'])
+
+    def test_middleware_stays_async_under_asgi(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(ReplicaRoutingMiddleware(get_response)))
+
+        task = create_task('Async')
+        self.addCleanup(task.delete)
+        self.sync()
+        response = async_to_sync(self.async_client.patch)(
+            f'/api/tasks/{task.id}/', {'title': 'Async geändert'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    def test_replica_is_read_only(self):
+        with self.assertRaises(OperationalError):
+            Task.objects.using('replica').update(title='Verboten')
+
+
+class IndexTests(APITestCase):
+
+    def test_register_links_contact_case_insensitively(self):
+        contact = Contacts.objects.create(name='Anna', email='Anna.Schmidt@Example.com')
+        response = self.client.post('/api/register/', {
+            'email': 'anna.schmidt@example.com', 'password': 'geheim123', 'name': 'Anna',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        contact.refresh_from_db()
+        self.assertEqual(contact.user.email, 'anna.schmidt@example.com')
+        self.assertEqual(Contacts.objects.count(), 1)
+
+    def test_query_plans_use_indexes(self):
+        lookup = Contacts.objects.alias(email_lower=Lower('email')).filter(email_lower='anna@example.com')
+        self.assertIn('contacts_email_lower_idx', lookup.explain())
+        self.assertIn('task_open_due_date_idx', counters.upcoming_deadlines()[:1].explain())
+
+
+class MetricsTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        metrics.registry.clear()
+
+    def test_requests_are_measured_per_route(self):
+        create_task(subtasks=2)
+        self.client.get('/api/tasks/')
+        self.client.get('/api/tasks/')
+        self.client.get('/api/tasks/999/')
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'geheim123')
+        self.client.force_login(admin)
+
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn('join_http_requests_total{route="tasks-list",method="GET",status="2xx"} 2\n', text)
+        self.assertIn('join_http_requests_total{route="tasks-detail",method="GET",status="4xx"} 1\n', text)
+        self.assertIn('join_db_queries_count{route="tasks-list",method="GET"} 2\n', text)
+        self.assertIn('join_http_response_bytes{route="tasks-list",method="GET",quantile="0.5"}', text)
+
+        queries = [line for line in text.splitlines() if line.startswith('join_db_queries{route="tasks-list"')]
+        self.assertEqual(len(queries), len(metrics.QUANTILES))
+        self.assertTrue(all(float(line.rsplit(' ', 1)[1]) > 0 for line in queries))
+
+    def test_streamed_responses_are_measured_when_finished(self):
+        create_task()
+        response = self.client.get('/api/tasks/?stream=1')
+        body = b''.join(response.streaming_content)
+        text = metrics.registry.render()
+        self.assertIn(f'join_http_response_bytes_sum{{route="tasks-list",method="GET"}} {len(body)}\n', text)
+
+    def test_async_requests_count_queries(self):
+        create_task(subtasks=2)
+        # Mit DEBUG meldet Django jede Middleware, für die es die Kette auf sync umstellen muss
+        with override_settings(DEBUG=True), self.assertNoLogs('django.request', 'DEBUG'):
+            response = async_to_sync(self.async_client.get)('/api/async/tasks/')
+        self.assertEqual(response.status_code, 200)
+        text = metrics.registry.render()
+        queries = [line for line in text.splitlines() if line.startswith('join_db_queries_sum{route="async-task-list"')]
+        self.assertEqual(len(queries), 1)
+        self.assertGreater(float(queries[0].rsplit(' ', 1)[1]), 0)
+
+    def test_admin_only(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+    def test_debug_logging(self):
+        with self.assertLogs('backend.api.serializers', 'DEBUG') as logs:
+            self.client.post('/api/register/', {
+                'email': 'neu@example.com', 'password': 'geheim123', 'name': 'Neu',
+            }, content_type='application/json')
+        self.assertIn("Neuer Benutzer und Kontakt für 'neu@example.com' erstellt und verknüpft.", logs.output[-1])
+
+
+class SeedDataTests(TestCase):
+
+    def test_seed_data_command(self):
+        with override_settings(DEBUG=True):
+            call_command('seed_data', contacts=5, tasks=20, subtasks=2, assignees=1, stdout=io.StringIO())
+
+        self.assertEqual(Contacts.objects.count(), 5)
+        self.assertEqual(Task.objects.count(), 20)
+        self.assertEqual(Subtask.objects.count(), 40)
+        self.assertEqual(counters.stored(), counters.recount())
+        self.assertEqual(
+            dict(ChangeMarker.objects.values_list('table', 'revision')), {'task': 1, 'subtask': 1, 'contacts': 1},
+        )
+
+    def test_refuses_without_debug(self):
+        with override_settings(DEBUG=False), self.assertRaises(CommandError):
+            call_command('seed_data', tasks=1, stdout=io.StringIO())
+        self.assertFalse(Task.objects.exists())
+
+    def test_scenario_names_match_modules(self):
+        from backend.management.commands.benchmark import load_scenarios
+
+        for name, run in load_scenarios().items():
+            self.assertEqual(run.__module__, f'backend.benchmarks.{name}')
+
+    def test_compare_reports(self):
+        baseline = {'results': [
+            {'endpoint': 'tasks-list', 'method': 'GET', 'throughput': 100.0, 'p50_ms': 10.0},
+            {'endpoint': 'summary', 'method': 'GET', 'throughput': 50.0, 'p50_ms': 2.0},
+        ]}
+        report = {'results': [
+            {'endpoint': 'tasks-list', 'method': 'GET', 'throughput': 200.0, 'p50_ms': 5.0},
+            {'endpoint': 'search', 'method': 'GET', 'throughput': 10.0, 'p50_ms': 1.0},
+        ]}
+        rows = benchmarks.compare(baseline, report)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['endpoint'], 'tasks-list')
+        self.assertEqual(rows[0]['throughput_ratio'], 2.0)
+        self.assertEqual(rows[0]['p50_ms_before'], 10.0)
+
+
+class PasswordHashingTests(APITestCase):
+
+    def login(self, email, password):
+        return self.client.post('/api/login/', {'email': email, 'password': password}, content_type='application/json')
+
+    def test_new_passwords_use_tuned_scrypt(self):
+        user = User.objects.create_user('neu@example.com', 'neu@example.com', 'geheim123')
+        algorithm, work_factor, _, block_size, parallelism, _ = user.password.split('$')
+        self.assertEqual((algorithm, work_factor, block_size, parallelism), ('scrypt', '32768', '8', '3'))
+
+    def test_login_rehashes_legacy_hash(self):
+        User.objects.create(
+            username='alt@example.com', email='alt@example.com', password=make_password('geheim123', hasher='pbkdf2_sha256'),
+        )
+        self.assertEqual(self.login('alt@example.com', 'geheim123').status_code, 200)
+        self.assertTrue(User.objects.get(username='alt@example.com').password.startswith('scrypt$'))
+
+    def test_hashing_runs_in_worker_pool(self):
+        self.assertTrue(hashers.pool.run(lambda: threading.current_thread().name).startswith('join-hashing'))
+
+    def test_full_pool_rejects(self):
+        pool = hashers.HashingPool(workers=1, queue=0, timeout=0.01)
+        started, release = threading.Event(), threading.Event()
+        blocker = threading.Thread(target=pool.run, args=(lambda: (started.set(), release.wait()),))
+        blocker.start()
+        try:
+            started.wait()
+            with self.assertRaises(hashers.HashingBusy):
+                pool.run(lambda: None)
+        finally:
+            release.set()
+            blocker.join()
+            pool.shutdown()
+
+    @override_settings(JOIN_LOGIN_FAILURE_LIMITS={'ip': 10, 'account': 2})
+    def test_failed_logins_are_throttled_before_hashing(self):
+        User.objects.create_user('a@example.com', 'a@example.com', 'geheim123')
+        User.objects.create_user('b@example.com', 'b@example.com', 'geheim123')
+        for _ in range(2):
+            self.assertEqual(self.login('a@example.com', 'falsch').status_code, 400)
+
+        with mock.patch.object(hashers.pool, 'run', wraps=hashers.pool.run) as run:
+            response = self.login('a@example.com', 'geheim123')
+        self.assertEqual(response.status_code, 429)
+        run.assert_not_called()
+
+        self.assertEqual(self.login('b@example.com', 'geheim123').status_code, 200)
+
+
+class TokenAuthTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        tokens.revocations.clear()
+        self.user = User.objects.create_user('token@example.com', 'token@example.com', 'geheim123', is_staff=True)
+
+    def issue(self):
+        response = self.client.post('/api/token/', {'email': 'token@example.com', 'password': 'geheim123'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get(self, path, access):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_bearer_token_needs_no_session_or_user_query(self):
+        access = self.issue()['access']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.get('/api/metrics/', access)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if 'auth_user' in q['sql'] or 'django_session' in q['sql']])
+
+    @override_settings(JOIN_AUTH_MODE='token')
+    def test_login_and_register_return_tokens_in_token_mode(self):
+        response = self.client.post('/api/login/', {'email': 'token@example.com', 'password': 'geheim123'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertEqual(self.get('/api/metrics/', response.json()['access']).status_code, 200)
+
+        response = self.client.post('/api/register/', {
+            'email': 'neu@example.com', 'password': 'geheim123', 'name': 'Neu',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('refresh', response.json())
+        self.assertNotIn('sessionid', response.cookies)
+
+    def test_refresh_rotates_tokens(self):
+        pair = self.issue()
+        response = self.client.post('/api/token/refresh/', {'token': pair['refresh']}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get('/api/metrics/', response.json()['access']).status_code, 200)
+
+        response = self.client.post('/api/token/refresh/', {'token': pair['refresh']}, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_revoked_and_expired_tokens_are_rejected(self):
+        access = self.issue()['access']
+        self.assertEqual(self.client.post('/api/token/revoke/', {'token': access}, content_type='application/json').status_code, 204)
+        self.assertEqual(self.get('/api/metrics/', access).status_code, 403)
+
+        # Ein anderer Prozess sieht den Widerruf nach dem Neuladen aus der Datenbank
+        tokens.revocations.clear()
+        self.assertEqual(self.get('/api/metrics/', access).status_code, 403)
+
+        access = self.issue()['access']
+        with override_settings(JOIN_TOKEN_ACCESS_LIFETIME=-1):
+            self.assertEqual(self.get('/api/metrics/', access).status_code, 403)
+
+    def test_logout_revokes_tokens(self):
+        pair = self.issue()
+        response = self.client.post(
+            '/api/logout/', {'refresh': pair['refresh']}, content_type='application/json', HTTP_AUTHORIZATION=f"Bearer {pair['access']}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get('/api/metrics/', pair['access']).status_code, 403)
+        response = self.client.post('/api/token/refresh/', {'token': pair['refresh']}, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+
+class SessionAndCleanupTests(APITestCase):
+
+    def test_sessions_are_read_from_cache(self):
+        User.objects.create_user('s@example.com', 's@example.com', 'geheim123')
+        response = self.client.post('/api/login/', {'email': 's@example.com', 'password': 'geheim123'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/summary/')
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if 'django_session' in q['sql']])
+
+    @override_settings(JOIN_SESSION_CACHE_TIMEOUT=1)
+    def test_session_cache_timeout_is_bounded(self):
+        store = SessionStore()
+        with mock.patch.object(store._cache.cache, 'set') as cache_set:
+            store['key'] = 'value'
+            store.save()
+        self.assertEqual(cache_set.call_args.args[2], 1)
+
+    def test_cleanup_deletes_expired_sessions_and_orphans_in_batches(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for i in range(3):
+            Session.objects.create(session_key=f'alt{i}', session_data='', expire_date=now - datetime.timedelta(days=1))
+        Session.objects.create(session_key='aktuell', session_data='', expire_date=now + datetime.timedelta(days=1))
+
+        old = now - datetime.timedelta(days=2)
+        orphan = User.objects.create_user('verwaist@example.com', date_joined=old)
+        User.objects.create_user('frisch@example.com')
+        User.objects.create_user('admin-ohne-passwort@example.com', is_staff=True, date_joined=old)
+        registered = User.objects.create_user('registriert@example.com', password='geheim123', date_joined=old)
+        contact_user = User.objects.create_user('kontakt@example.com', date_joined=old)
+        Contacts.objects.create(name='Kontakt', email='kontakt@example.com', user=contact_user)
+
+        out = io.StringIO()
+        call_command('cleanup', batch_size=2, pause=0, stdout=out)
+        self.assertIn('sessions: 3, revoked_tokens: 0, orphan_users: 1 gelöscht', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['aktuell'])
+        self.assertFalse(User.objects.filter(pk=orphan.pk).exists())
+        self.assertEqual(User.objects.count(), 4)
+        self.assertTrue(User.objects.filter(pk=registered.pk).exists())
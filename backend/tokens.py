@@ -0,0 +1,174 @@
+# backend/tokens.py
+#
+# Signierte Tokens als Alternative zur Session (JOIN_AUTH_MODE = 'token'). Ein Token ist
+# ein mit SECRET_KEY signiertes JSON-Objekt mit Zeitstempel (django.core.signing). Die
+# Prüfung braucht weder die Session-Tabelle noch die User-Tabelle: Access-Tokens tragen
+# id, Benutzername und Admin-Rechte selbst und laufen nach JOIN_TOKEN_ACCESS_LIFETIME ab.
+#
+# Refresh-Tokens leben länger (JOIN_TOKEN_REFRESH_LIFETIME) und werden bei jedem Refresh
+# gegen ein neues Paar getauscht. Erst dabei wird der Benutzer aus der Datenbank gelesen,
+# gesperrte oder gelöschte Konten verlieren ihren Zugang also spätestens mit dem Ablauf
+# des Access-Tokens.
+#
+# Widerrufene Tokens stehen in RevokedToken. Jeder Prozess hält die noch nicht
+# abgelaufenen Einträge als Menge im Speicher und lädt sie höchstens alle
+# JOIN_TOKEN_REVOCATION_REFRESH Sekunden neu. Ein Widerruf gilt im eigenen Prozess
+# sofort, in anderen Prozessen nach dieser Zeit. Refresh-Tokens prüft der Refresh
+# immer direkt gegen die Datenbank. Abgelaufene Einträge entfernt `manage.py cleanup`.
+
+import datetime
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import RevokedToken
+
+ACCESS_SALT = 'join.tokens.access'
+REFRESH_SALT = 'join.tokens.refresh'
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def lifetimes():
+    return settings.JOIN_TOKEN_ACCESS_LIFETIME, settings.JOIN_TOKEN_REFRESH_LIFETIME
+
+
+def new_jti():
+    return secrets.token_urlsafe(16)
+
+
+def issue(user):
+    """Neues Paar aus Access- und Refresh-Token für einen aktiven Benutzer."""
+    access_lifetime, _ = lifetimes()
+    access = signing.dumps({
+        'u': user.pk,
+        'n': user.get_username(),
+        's': user.is_staff,
+        'a': user.is_superuser,
+        'j': new_jti(),
+    }, salt=ACCESS_SALT, compress=True)
+    refresh = signing.dumps({'u': user.pk, 'j': new_jti()}, salt=REFRESH_SALT)
+    return {'access': access, 'refresh': refresh, 'token_type': 'Bearer', 'expires_in': access_lifetime}
+
+
+def load(token, salt, max_age):
+    try:
+        return signing.loads(token, salt=salt, max_age=max_age)
+    except signing.SignatureExpired:
+        raise InvalidToken('Token abgelaufen.')
+    except signing.BadSignature:
+        raise InvalidToken('Ungültiges Token.')
+
+
+def verify(token):
+    """Payload eines gültigen Access-Tokens, ohne Datenbankzugriff (bis auf das Nachladen der Widerrufe)."""
+    payload = load(token, ACCESS_SALT, lifetimes()[0])
+    if payload['j'] in revocations:
+        raise InvalidToken('Token widerrufen.')
+    return payload
+
+
+def refresh(token):
+    """Tauscht ein Refresh-Token gegen ein neues Paar, das alte wird dabei widerrufen."""
+    payload = load(token, REFRESH_SALT, lifetimes()[1])
+    # Der Widerruf ist zugleich die Prüfung: von zwei gleichzeitigen Refreshs gewinnt einer
+    if not revoke_payload(payload, lifetimes()[1]):
+        raise InvalidToken('Token widerrufen.')
+    user = User.objects.filter(pk=payload['u'], is_active=True).first()
+    if user is None:
+        raise InvalidToken('Benutzer nicht gefunden oder inaktiv.')
+    return issue(user)
+
+
+def revoke(token):
+    """Widerruft ein Access- oder Refresh-Token. Ungültige Tokens sind bereits wertlos."""
+    access_lifetime, refresh_lifetime = lifetimes()
+    for salt, lifetime in ((ACCESS_SALT, access_lifetime), (REFRESH_SALT, refresh_lifetime)):
+        try:
+            payload = load(token, salt, lifetime)
+        except InvalidToken:
+            continue
+        revoke_payload(payload, lifetime)
+        return True
+    return False
+
+
+def revoke_payload(payload, lifetime):
+    """Trägt den Widerruf ein. False, wenn das Token schon widerrufen war."""
+    # Der Ablaufzeitpunkt ist nach oben abgeschätzt, der Zeitstempel steckt in der Signatur
+    expires_at = timezone.now() + datetime.timedelta(seconds=lifetime)
+    _, created = RevokedToken.objects.get_or_create(jti=payload['j'], defaults={'expires_at': expires_at})
+    revocations.add(payload['j'])
+    return created
+
+
+class RevocationList:
+    """Im Prozess gehaltene jtis der widerrufenen, noch nicht abgelaufenen Tokens."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jtis = frozenset()
+        self._loaded_at = None
+
+    def __contains__(self, jti):
+        interval = settings.JOIN_TOKEN_REVOCATION_REFRESH
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > interval:
+            self.reload()
+        return jti in self._jtis
+
+    def reload(self):
+        jtis = frozenset(RevokedToken.objects.filter(expires_at__gt=timezone.now()).values_list('jti', flat=True))
+        with self._lock:
+            self._jtis = jtis
+            self._loaded_at = time.monotonic()
+
+    def add(self, jti):
+        with self._lock:
+            self._jtis = self._jtis | {jti}
+
+    def clear(self):
+        with self._lock:
+            self._jtis = frozenset()
+            self._loaded_at = None
+
+
+revocations = RevocationList()
+
+
+class TokenUser:
+    """
+    Benutzer aus einem Access-Token. id, Benutzername und Rechte kommen aus dem Token,
+    alles Weitere (z. B. delete()) lädt einmalig den echten Benutzer.
+    """
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, payload):
+        self.pk = self.id = payload['u']
+        self.username = payload['n']
+        self.is_staff = payload['s']
+        self.is_superuser = payload['a']
+
+    def __str__(self):
+        return self.username
+
+    def get_username(self):
+        return self.username
+
+    @cached_property
+    def user(self):
+        return User.objects.get(pk=self.pk)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.user, name)
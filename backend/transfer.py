@@ -0,0 +1,236 @@
+# backend/transfer.py
+#
+# Import und Export von Kontakten und Tasks als NDJSON (ein JSON-Objekt pro Zeile) oder CSV.
+# Beide Richtungen arbeiten blockweise: Beim Export werden je Block drei Queries gestellt,
+# beim Import wird jeder Block validiert und mit bulk_create in einer eigenen Transaktion
+# gespeichert. Fehlerhafte Zeilen werden mit Zeilennummer gemeldet und übersprungen.
+#
+# Zeilenformat Kontakte: name, email, color, phone
+# Zeilenformat Tasks:    title, description, category, due_date, prio, status,
+#                        assignees (E-Mail-Adressen), subtasks ([{subtasktext, done}])
+# In CSV stehen die Assignees durch ";" getrennt und die Subtasks als JSON in einer Zelle.
+
+import csv
+import io
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.db import transaction
+from django.db.models.functions import Lower
+from rest_framework.exceptions import ValidationError
+
+from .api.renderers import dumps
+from .api.serializers import ContactImportSerializer, TaskImportSerializer
+from . import counters
+from .changes import record_change
+from .models import Contacts, Subtask, Task
+
+FORMATS = ('ndjson', 'csv')
+KINDS = ('contacts', 'tasks')
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+CONTACT_COLUMNS = ('name', 'email', 'color', 'phone')
+TASK_COLUMNS = ('title', 'description', 'category', 'due_date', 'prio', 'status', 'assignees', 'subtasks')
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportResult:
+
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        errors = sorted(self.errors, key=lambda error: error['line'])
+        return {'created': self.created, 'failed': self.failed, 'errors': errors}
+
+
+# Export
+
+def export_rows(kind, batch_size=BATCH_SIZE):
+    if kind == 'contacts':
+        rows = Contacts.objects.order_by('id').values_list(*CONTACT_COLUMNS).iterator(chunk_size=batch_size)
+        for name, email, color, phone in rows:
+            yield {'name': name, 'email': email, 'color': color, 'phone': phone}
+        return
+
+    rows = Task.objects.order_by('id').values_list(
+        'id', 'title', 'description', 'category', 'due_date', 'prio', 'status'
+    ).iterator(chunk_size=batch_size)
+    while batch := list(islice(rows, batch_size)):
+        task_ids = [row[0] for row in batch]
+        subtasks = defaultdict(list)
+        for task_id, text, done in (
+            Subtask.objects.filter(task_id__in=task_ids).order_by('task_id', 'id').values_list('task_id', 'subtasktext', 'done')
+        ):
+            subtasks[task_id].append({'subtasktext': text, 'done': done})
+        assignees = defaultdict(list)
+        for task_id, email in (
+            Task.assignee_infos.through.objects.filter(task_id__in=task_ids)
+            .order_by('task_id', 'contacts_id')
+            .values_list('task_id', 'contacts__email')
+        ):
+            assignees[task_id].append(email)
+
+        for task_id, title, description, category, due_date, prio, status in batch:
+            yield {
+                'title': title,
+                'description': description,
+                'category': category,
+                'due_date': due_date.isoformat(),
+                'prio': prio,
+                'status': status,
+                'assignees': assignees.get(task_id, []),
+                'subtasks': subtasks.get(task_id, []),
+            }
+
+
+def export_stream(kind, file_format, batch_size=BATCH_SIZE):
+    """Liefert den Export als Folge von Byte-Blöcken, geeignet für StreamingHttpResponse."""
+    rows = export_rows(kind, batch_size)
+    if file_format == 'ndjson':
+        while batch := list(islice(rows, batch_size)):
+            yield b''.join(dumps(row) + b'\n' for row in batch)
+        return
+
+    columns = CONTACT_COLUMNS if kind == 'contacts' else TASK_COLUMNS
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator='\n')
+    writer.writeheader()
+    while batch := list(islice(rows, batch_size)):
+        for row in batch:
+            if kind == 'tasks':
+                row = dict(row, assignees=';'.join(row['assignees']), subtasks=json.dumps(row['subtasks'], ensure_ascii=False))
+            writer.writerow(row)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+# Import
+
+def decode_lines(lines):
+    for line in lines:
+        yield line.decode('utf-8-sig') if isinstance(line, bytes) else line
+
+
+def parse_rows(lines, kind, file_format):
+    """Liefert (Zeilennummer, Daten oder None, Fehler oder None) pro Datensatz."""
+    lines = decode_lines(lines)
+    if file_format == 'ndjson':
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as exc:
+                yield number, None, {'non_field_errors': [f'Ungültiges JSON: {exc}']}
+                continue
+            if not isinstance(data, dict):
+                yield number, None, {'non_field_errors': ['Erwartet wird ein JSON-Objekt pro Zeile.']}
+                continue
+            yield number, data, None
+        return
+
+    reader = csv.DictReader(lines)
+    for row in reader:
+        data = {key: value for key, value in row.items() if key is not None and value not in (None, '')}
+        if kind == 'tasks':
+            if 'assignees' in data:
+                data['assignees'] = [email.strip() for email in data['assignees'].split(';') if email.strip()]
+            if 'subtasks' in data:
+                try:
+                    data['subtasks'] = json.loads(data['subtasks'])
+                except ValueError:
+                    yield reader.line_num, None, {'subtasks': ['Erwartet wird eine JSON-Liste.']}
+                    continue
+        yield reader.line_num, data, None
+
+
+def import_rows(lines, kind, file_format, batch_size=BATCH_SIZE):
+    result = ImportResult()
+    importer = import_contacts_batch if kind == 'contacts' else import_tasks_batch
+    # Ein Serializer für alle Zeilen: DRF kopiert die Felder nur beim ersten Zugriff,
+    # pro Zeile läuft danach nur noch die eigentliche Validierung (wie bei many=True).
+    validator = ContactImportSerializer() if kind == 'contacts' else TaskImportSerializer()
+    rows = parse_rows(lines, kind, file_format)
+    while batch := list(islice(rows, batch_size)):
+        valid = []
+        for number, data, errors in batch:
+            if errors:
+                result.add_error(number, errors)
+                continue
+            try:
+                valid.append((number, validator.run_validation(data)))
+            except ValidationError as exc:
+                result.add_error(number, exc.detail)
+        if valid:
+            importer(valid, result)
+    return result
+
+
+def contacts_by_email(emails):
+    # Die Import-Serializer liefern kleingeschriebene Adressen, gespeicherte können
+    # gemischt geschrieben sein; verglichen wird über den Index contacts_email_lower_idx
+    return Contacts.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=emails)
+
+
+def import_contacts_batch(rows, result):
+    emails = [data['email'] for _, data in rows]
+    taken = set(contacts_by_email(emails).values_list('email_lower', flat=True))
+
+    contacts = []
+    for number, data in rows:
+        if data['email'] in taken:
+            result.add_error(number, {'email': ['Ein Kontakt mit dieser E-Mail-Adresse existiert bereits.']})
+            continue
+        taken.add(data['email'])
+        contacts.append(Contacts(**data))
+
+    with transaction.atomic():
+        contacts = Contacts.objects.bulk_create(contacts)
+        if contacts:
+            record_change('contacts', [contact.id for contact in contacts])
+    result.created += len(contacts)
+
+
+def import_tasks_batch(rows, result):
+    emails = {email for _, data in rows for email in data['assignees']}
+    contact_ids = dict(contacts_by_email(emails).values_list('email_lower', 'id'))
+
+    tasks, subtasks_data, assignee_ids = [], [], []
+    for number, data in rows:
+        unknown = [email for email in data['assignees'] if email not in contact_ids]
+        if unknown:
+            result.add_error(number, {'assignees': [f"Unbekannte Kontakte: {', '.join(unknown)}."]})
+            continue
+        subtasks_data.append(data.pop('subtasks'))
+        assignee_ids.append({contact_ids[email] for email in data.pop('assignees')})
+        tasks.append(Task(**data))
+
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create(tasks)
+        subtasks = Subtask.objects.bulk_create([
+            Subtask(task=task, **subtask) for task, items in zip(tasks, subtasks_data) for subtask in items
+        ])
+        Assignee = Task.assignee_infos.through
+        Assignee.objects.bulk_create([
+            Assignee(task_id=task.id, contacts_id=contact_id) for task, ids in zip(tasks, assignee_ids) for contact_id in ids
+        ])
+        if tasks:
+            record_change('task', [task.id for task in tasks])
+            counters.apply(counters.added((task.status, task.prio) for task in tasks))
+        if subtasks:
+            record_change('subtask', [subtask.id for subtask in subtasks])
+    result.created += len(tasks)
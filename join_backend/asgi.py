@@ -2,6 +2,8 @@
 ASGI config for join_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django, WebSocket connections to the board channel in
+``backend.realtime``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'join_backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from backend.realtime import board_websocket  # noqa: E402  (braucht geladene Apps)
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        await board_websocket(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,65 @@
+# join_backend/database.py
+#
+# Datenbankprofile für SQLite. Die Pragmas laufen über `init_command` einmal je neuer
+# Verbindung, mit CONN_MAX_AGE bleibt diese über mehrere Requests bestehen.
+#
+# "production" (Standard):
+#   - WAL: Leser blockieren Schreiber nicht mehr und umgekehrt.
+#   - synchronous=NORMAL: im WAL-Modus ohne Risiko für die Konsistenz, nur die letzten
+#     Transaktionen vor einem Stromausfall können fehlen.
+#   - busy timeout: wartet auf die Schreibsperre, statt sofort "database is locked" zu melden.
+#   - transaction_mode IMMEDIATE: Transaktionen holen die Schreibsperre gleich beim BEGIN.
+#     Sonst schlägt der Wechsel von Lesen auf Schreiben unter Last ohne Warten fehl.
+#   - mmap_size/cache_size: weniger Systemaufrufe und mehr Seiten im Speicher.
+#   - persistente Verbindungen mit Health-Check vor der Wiederverwendung.
+# "default" entspricht Djangos Voreinstellung (Rollback-Journal, neue Verbindung je Request).
+
+PROFILES = {
+    'default': {},
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'temp_store': 'MEMORY',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,  # negativ: in KiB, also 64 MiB je Verbindung
+        },
+        'timeout': 20,
+        'transaction_mode': 'IMMEDIATE',
+        'conn_max_age': 600,
+        'conn_health_checks': True,
+    },
+}
+
+
+def sqlite_database(name, profile='production', read_only=False, **overrides):
+    """
+    Eintrag für settings.DATABASES mit den Einstellungen des Profils. Lesereplikate
+    (read_only) lehnen Schreibzugriffe per query_only ab und werden in Tests nicht
+    angelegt, sondern spiegeln "default".
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unbekanntes Datenbankprofil '{profile}'. Verfügbar: {', '.join(PROFILES)}")
+    config = {**PROFILES[profile], **overrides}
+    pragmas = dict(config.get('pragmas', {}))
+    if read_only:
+        pragmas['query_only'] = 'ON'
+
+    options = {}
+    if pragmas:
+        options['init_command'] = ';'.join(f'PRAGMA {key}={value}' for key, value in pragmas.items())
+    if 'timeout' in config:
+        options['timeout'] = config['timeout']
+    if 'transaction_mode' in config:
+        options['transaction_mode'] = config['transaction_mode']
+
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'OPTIONS': options,
+        'CONN_MAX_AGE': config.get('conn_max_age', 0),
+        'CONN_HEALTH_CHECKS': config.get('conn_health_checks', False),
+    }
+    if read_only:
+        database['TEST'] = {'MIRROR': 'default'}
+    return database
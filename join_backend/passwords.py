@@ -0,0 +1,42 @@
+# join_backend/passwords.py
+#
+# Profile für das Passwort-Hashing (settings.PASSWORD_HASHERS). Der erste Hasher legt
+# neue Hashes an, die übrigen prüfen nur noch bestehende. Django rechnet Hashes eines
+# anderen Verfahrens oder mit veralteten Parametern beim nächsten erfolgreichen Login
+# automatisch mit dem ersten Hasher neu.
+#
+# "scrypt" (Standard): speicherhart mit 32 MiB je Hash (n = 2**15, r = 8, p = 3 nach OWASP),
+#   nur Standardbibliothek. Etwa drei Viertel der Rechenzeit von PBKDF2 mit 1 Mio. Iterationen.
+# "argon2": Argon2id mit 19 MiB und zwei Durchläufen, braucht das Paket argon2-cffi.
+# "pbkdf2": Djangos Voreinstellung.
+#
+# Alle Hasher rechnen im begrenzten Worker-Pool aus backend/hashers.py.
+
+import importlib.util
+
+from django.core.exceptions import ImproperlyConfigured
+
+HASHERS = {
+    'scrypt': 'backend.hashers.ScryptPasswordHasher',
+    'argon2': 'backend.hashers.Argon2PasswordHasher',
+    'pbkdf2': 'backend.hashers.PBKDF2PasswordHasher',
+    'pbkdf2_sha1': 'backend.hashers.PBKDF2SHA1PasswordHasher',
+}
+
+PROFILES = ('scrypt', 'argon2', 'pbkdf2')
+
+
+def argon2_available():
+    return importlib.util.find_spec('argon2') is not None
+
+
+def password_hashers(profile='scrypt'):
+    """Eintrag für settings.PASSWORD_HASHERS: der Hasher des Profils zuerst."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unbekanntes Hashing-Profil '{profile}'. Verfügbar: {', '.join(PROFILES)}")
+    if profile == 'argon2' and not argon2_available():
+        raise ImproperlyConfigured("Das Hashing-Profil 'argon2' braucht das Paket argon2-cffi.")
+
+    # Argon2-Hashes lassen sich ohne argon2-cffi nicht prüfen, der Hasher entfällt dann
+    names = [profile] + [name for name in HASHERS if name != profile and (name != 'argon2' or argon2_available())]
+    return [HASHERS[name] for name in names]
@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import sqlite_database
+from .passwords import password_hashers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,8 +46,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'backend.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -88,18 +94,151 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'join_backend.wsgi.application'
+ASGI_APPLICATION = 'join_backend.asgi.application'
+
+# Verteilung der Board-Änderungen an die WebSocket-Clients (/ws/board/).
+# Für mehrere Worker-Prozesse einen Broker mit externem Backend eintragen.
+JOIN_REALTIME_BROKER = 'backend.realtime.InMemoryBroker'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Profil siehe join_backend/database.py; "default" schaltet alle Anpassungen ab
+JOIN_DATABASE_PROFILE = os.environ.get('JOIN_DATABASE_PROFILE', 'production')
+
 DATABASES = {
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3', JOIN_DATABASE_PROFILE),
+}
+
+# Lesereplikate als kommagetrennte Pfade (z. B. per Litestream/LiteFS aktuell gehalten).
+# Lesende Requests verteilen sich darauf, siehe backend/routers.py.
+JOIN_REPLICA_DATABASES = []
+for number, path in enumerate(filter(None, os.environ.get('JOIN_READ_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{number}'] = sqlite_database(path, JOIN_DATABASE_PROFILE, read_only=True)
+    JOIN_REPLICA_DATABASES.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['backend.routers.ReplicaRouter']
+
+# Sekunden, die ein Client nach einem Schreibzugriff von "default" liest
+JOIN_REPLICA_STICKY_SECONDS = 10
+
+
+# Request-Metriken (backend/metrics.py): an/aus und Anzahl der Werte je Route für Perzentile
+JOIN_METRICS_ENABLED = True
+JOIN_METRICS_WINDOW = 1024
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# Meldungen der App als key=value-Zeilen; Debug-Ausgaben mit JOIN_LOG_LEVEL=DEBUG
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'keyvalue': {
+            'format': 'time=%(asctime)s level=%(levelname)s logger=%(name)s message="%(message)s"',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'keyvalue',
+        },
+    },
+    'loggers': {
+        'backend': {
+            'handlers': ['console'],
+            'level': os.environ.get('JOIN_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+
+REST_FRAMEWORK = {
+    # Session zuerst: Ohne Anmeldung bleibt die Antwort 403 (ohne WWW-Authenticate) wie bisher
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'backend.api.authentication.SignedTokenAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'backend.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# JSON-Encoder für API-Antworten und Streams: Pfad zu einer Funktion Objekt -> Bytes.
+# None nimmt orjson, falls installiert, sonst das json-Modul der Standardbibliothek.
+JOIN_JSON_ENCODER = None
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'join-backend',
+    },
+    # Sessions je Prozess vor der Datenbank, siehe backend/sessions.py
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'join-sessions',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
 }
 
+SESSION_ENGINE = 'backend.sessions'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Höchstdauer einer Session im Cache eines Prozesses (Logout in anderen Workern)
+JOIN_SESSION_CACHE_TIMEOUT = 60
+
+# Gültigkeit der gecachten Task- und Kontakt-Antworten in Sekunden
+JOIN_RESPONSE_CACHE_TIMEOUT = 300
+
+# Board-Übersicht aus mitgeführten Zählern statt per Aggregat-Query über alle Tasks
+JOIN_BOARD_COUNTERS = True
+
+# Suchbackend (Dotted Path); ohne Angabe FTS5 unter SQLite, sonst icontains
+JOIN_SEARCH_BACKEND = None
+
+
+# Anmeldung über Login und Registrierung: 'session' (Cookie) oder 'token' (signierte
+# Tokens im Antwort-Body, siehe backend/tokens.py). Bearer-Tokens von /api/token/
+# werden in beiden Fällen akzeptiert.
+JOIN_AUTH_MODE = os.environ.get('JOIN_AUTH_MODE', 'session')
+
+# Gültigkeit von Access- und Refresh-Tokens in Sekunden
+JOIN_TOKEN_ACCESS_LIFETIME = 5 * 60
+JOIN_TOKEN_REFRESH_LIFETIME = 14 * 24 * 60 * 60
+
+# Sekunden, nach denen jeder Prozess die Widerrufsliste neu aus der Datenbank lädt
+JOIN_TOKEN_REVOCATION_REFRESH = 5
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+
+# Profile siehe join_backend/passwords.py: scrypt (Standard), argon2, pbkdf2
+JOIN_PASSWORD_PROFILE = os.environ.get('JOIN_PASSWORD_PROFILE', 'scrypt')
+
+PASSWORD_HASHERS = password_hashers(JOIN_PASSWORD_PROFILE)
+
+# Worker-Pool für das Hashing: gleichzeitige Hashes (ohne Angabe einer je CPU-Kern),
+# wartende Hashes und Sekunden bis zur Ablehnung mit 503
+JOIN_HASHING_WORKERS = None
+JOIN_HASHING_QUEUE = 64
+JOIN_HASHING_TIMEOUT = 10
+
+# Fehlversuche beim Login je Zeitfenster (Sekunden), danach 429 ohne Passwortprüfung.
+# "ip" zählt je IP-Adresse, "account" je IP-Adresse und E-Mail
+JOIN_LOGIN_FAILURE_LIMITS = {'ip': 50, 'account': 5}
+JOIN_LOGIN_FAILURE_WINDOW = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators